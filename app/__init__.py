@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 from app.common.exception.error_handler import register_error_handlers
 from app.blueprints.standard import standard_blueprint
 from app.blueprints.agreement import agreement_blueprint
-from app.blueprints.common import healthcheck_blueprint
+from app.blueprints.common import healthcheck_blueprint, job_blueprint
 
 load_dotenv()
 
@@ -50,5 +50,6 @@ def create_app():
     app.register_blueprint(healthcheck_blueprint.health)
     app.register_blueprint(standard_blueprint.standards)
     app.register_blueprint(agreement_blueprint.agreements)
+    app.register_blueprint(job_blueprint.jobs)
 
     return app
@@ -1,17 +1,25 @@
+import logging
 from http import HTTPStatus
+from typing import Callable, Optional
 
-from flask import Blueprint
+from flask import Blueprint, Response, stream_with_context
 
 from app.blueprints.agreement.agreement_exception import AgreementException
 from app.common.decorators import parse_request
+from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
 from app.common.file_type import FileType
+from app.containers.service_container import job_manager
 from app.schemas.analysis_response import AnalysisResponse
 from app.schemas.document_request import DocumentRequest
+from app.schemas.job_response import JobResponse
+from app.schemas.stream_frame import StreamFrame, FrameType, StreamSummary
 from app.schemas.success_code import SuccessCode
 from app.schemas.success_response import SuccessResponse
 from app.services.common.ingestion_pipeline import extract_file_type, \
-  pdf_agreement_service, ocr_service
+  pdf_agreement_service, ocr_service, pdf_agreement_stream_service, \
+  ocr_stream_service
+from app.services.common.job_manager import JobProgress
 
 agreements = Blueprint('agreements', __name__, url_prefix="/flask/agreements")
 
@@ -19,17 +27,83 @@ agreements = Blueprint('agreements', __name__, url_prefix="/flask/agreements")
 @agreements.route('/analysis', methods=['POST'])
 @parse_request(DocumentRequest)
 def process_agreements_pdf_from_s3(document_request: DocumentRequest):
+  return SuccessResponse(SuccessCode.REVIEW_SUCCESS,
+                         analyze_agreement(document_request)
+                         ).of(), HTTPStatus.OK
+
+
+@agreements.route('/analysis/jobs', methods=['POST'])
+@parse_request(DocumentRequest)
+def submit_agreement_analysis_job(document_request: DocumentRequest):
+  resolve_agreement_service(document_request.url)
+
+  job = job_manager.submit("agreement", analyze_agreement, document_request)
+  return SuccessResponse(SuccessCode.JOB_ACCEPTED,
+                         JobResponse.of(job)).of(), HTTPStatus.ACCEPTED
+
+
+@agreements.route('/analysis/stream', methods=['POST'])
+@parse_request(DocumentRequest)
+def stream_agreement_analysis(document_request: DocumentRequest):
+  """
+  조항 분석이 끝나는 순서대로 결과를 NDJSON 한 줄씩 내보내고 마지막에 summary 프레임을 보낸다.
+  전처리 단계의 에러는 일반 에러 응답으로, 분석 도중의 에러는 error 프레임으로 전달한다.
+  CommonException 이 아닌 예외도 스트림을 끊지 않고 AGREEMENT_REVIEW_FAIL error 프레임으로 닫는다.
+  """
+  stream_service = resolve_agreement_stream_service(document_request.url)
+  chunks, total_chunks, total_page = stream_service(document_request)
+
+  def generate():
+    try:
+      for chunk in chunks:
+        yield StreamFrame(FrameType.CHUNK, chunk).of()
+    except CommonException as e:
+      logging.error(f"[stream_agreement_analysis]: 스트리밍 분석 실패 {e}")
+      yield StreamFrame(FrameType.ERROR, code=e.code, message=str(e)).of()
+      return
+    except Exception as e:
+      logging.exception(f"[stream_agreement_analysis]: 스트리밍 분석 중 예기치 못한 에러 {e}")
+      error_code = ErrorCode.AGREEMENT_REVIEW_FAIL
+      yield StreamFrame(FrameType.ERROR, code=error_code.code,
+                        message=error_code.message).of()
+      return
+    finally:
+      chunks.close()
+
+    yield StreamFrame(FrameType.SUMMARY,
+                      StreamSummary(total_chunks=total_chunks,
+                                    total_page=total_page),
+                      code=SuccessCode.REVIEW_SUCCESS.code,
+                      message=SuccessCode.REVIEW_SUCCESS.message).of()
 
-  file_type = extract_file_type(document_request.url)
+  return Response(stream_with_context(generate()),
+                  mimetype="application/x-ndjson")
+
+
+def analyze_agreement(document_request: DocumentRequest,
+    progress: Optional[JobProgress] = None) -> AnalysisResponse:
+  agreement_service = resolve_agreement_service(document_request.url)
+  chunks, total_chunks, total_page = agreement_service(document_request,
+                                                       progress)
+
+  return AnalysisResponse(total_page=total_page,
+                          chunks=chunks,
+                          total_chunks=total_chunks)
+
+
+def resolve_agreement_service(url: str) -> Callable:
+  file_type = extract_file_type(url)
   if file_type in (FileType.PNG, FileType.JPG, FileType.JPEG):
-    chunks, total_chunks, total_page = ocr_service(document_request)
+    return ocr_service
   elif file_type == FileType.PDF:
-    chunks, total_chunks, total_page = pdf_agreement_service(document_request)
-  else:
-    raise AgreementException(ErrorCode.UNSUPPORTED_FILE_TYPE)
+    return pdf_agreement_service
+  raise AgreementException(ErrorCode.UNSUPPORTED_FILE_TYPE)
 
-  return SuccessResponse(SuccessCode.REVIEW_SUCCESS,
-                         AnalysisResponse(total_page=total_page,
-                                          chunks=chunks,
-                                          total_chunks=total_chunks)
-                         ).of(), HTTPStatus.OK
+
+def resolve_agreement_stream_service(url: str) -> Callable:
+  file_type = extract_file_type(url)
+  if file_type in (FileType.PNG, FileType.JPG, FileType.JPEG):
+    return ocr_stream_service
+  elif file_type == FileType.PDF:
+    return pdf_agreement_stream_service
+  raise AgreementException(ErrorCode.UNSUPPORTED_FILE_TYPE)
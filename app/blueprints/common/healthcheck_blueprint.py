@@ -1,7 +1,23 @@
 from flask import Blueprint, jsonify
 
+from app.containers.service_container import prompt_rate_limiter, \
+  embedding_rate_limiter, similarity_gate
+
 health = Blueprint('health', __name__)
 
 @health.route('/health-check', methods=['GET'])
 def health_check():
-  return jsonify({"status": "healthy"}), 200
\ No newline at end of file
+  return jsonify({"status": "healthy"}), 200
+
+
+@health.route('/health-check/rate-limits', methods=['GET'])
+def rate_limit_usage():
+  return jsonify({
+    "prompt": prompt_rate_limiter.usage(),
+    "embedding": embedding_rate_limiter.usage()
+  }), 200
+
+
+@health.route('/health-check/similarity-gate', methods=['GET'])
+def similarity_gate_stats():
+  return jsonify(similarity_gate.stats() if similarity_gate else {}), 200
@@ -0,0 +1,17 @@
+from http import HTTPStatus
+
+from flask import Blueprint
+
+from app.containers.service_container import job_manager
+from app.schemas.job_response import JobResponse
+from app.schemas.success_code import SuccessCode
+from app.schemas.success_response import SuccessResponse
+
+jobs = Blueprint('jobs', __name__, url_prefix="/flask/jobs")
+
+
+@jobs.route('/<jobId>', methods=['GET'])
+def get_job(jobId: str):
+  job = job_manager.get(jobId)
+  return SuccessResponse(SuccessCode.JOB_FOUND,
+                         JobResponse.of(job)).of(), HTTPStatus.OK
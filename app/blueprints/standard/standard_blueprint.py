@@ -1,18 +1,22 @@
-import asyncio
 from http import HTTPStatus
+from typing import Optional
 
 from flask import Blueprint
 
 from app.blueprints.agreement.agreement_exception import AgreementException
+from app.common.async_runner import run_async
 from app.common.constants import SUCCESS
 from app.common.decorators import parse_request
 from app.common.exception.error_code import ErrorCode
+from app.containers.service_container import job_manager
 from app.schemas.analysis_response import StandardResponse
 from app.schemas.document_request import DocumentRequest
+from app.schemas.job_response import JobResponse
 from app.schemas.success_code import SuccessCode
 from app.schemas.success_response import SuccessResponse
 from app.services.common.ingestion_pipeline import preprocess_pdf, \
   chunk_standard_texts, normalize_spacing
+from app.services.common.job_manager import JobProgress
 from app.services.standard.vector_delete import delete_by_standard_id
 from app.services.standard.vector_store.vector_processor import \
   vectorize_and_save
@@ -23,15 +27,28 @@ standards = Blueprint('standards', __name__, url_prefix="/flask/standards")
 @standards.route('/analysis', methods=['POST'])
 @parse_request(DocumentRequest)
 def process_standards_pdf_from_s3(document_request: DocumentRequest):
+  return SuccessResponse(SuccessCode.ANALYSIS_COMPLETE,
+                         analyze_standard(document_request)).of(), HTTPStatus.OK
+
+
+@standards.route('/analysis/jobs', methods=['POST'])
+@parse_request(DocumentRequest)
+def submit_standard_analysis_job(document_request: DocumentRequest):
+  job = job_manager.submit("standard", analyze_standard, document_request)
+  return SuccessResponse(SuccessCode.JOB_ACCEPTED,
+                         JobResponse.of(job)).of(), HTTPStatus.ACCEPTED
+
 
+def analyze_standard(document_request: DocumentRequest,
+    progress: Optional[JobProgress] = None) -> StandardResponse:
   documents, _ = preprocess_pdf(document_request)
-  chunks = chunk_standard_texts(documents, document_request.categoryName)
+  chunks = run_async(
+      chunk_standard_texts(documents, document_request.categoryName))
 
-  asyncio.run(vectorize_and_save(chunks, document_request))
+  run_async(vectorize_and_save(chunks, document_request, progress))
 
   contents = [normalize_spacing(doc.page_content) for doc in documents]
-  return SuccessResponse(SuccessCode.ANALYSIS_COMPLETE,
-                         StandardResponse(result=SUCCESS, contents=contents)).of(), HTTPStatus.OK
+  return StandardResponse(result=SUCCESS, contents=contents)
 
 
 @standards.route('<categoryName>/<standardId>', methods=["DELETE"])
@@ -43,5 +60,5 @@ def delete_standard(categoryName: str, standardId: str):
     raise AgreementException(ErrorCode.CANNOT_CONVERT_TO_NUM)
 
   success_code = (
-    asyncio.run(delete_by_standard_id(int(standardId), categoryName)))
+    run_async(delete_by_standard_id(int(standardId), categoryName)))
   return SuccessResponse(success_code, SUCCESS).of(), HTTPStatus.OK
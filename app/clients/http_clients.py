@@ -0,0 +1,43 @@
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.app_config import AppConfig
+
+_download_session: Optional[requests.Session] = None
+_download_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _create_download_session() -> requests.Session:
+  retry = Retry(
+      total=2,
+      backoff_factor=0.5,
+      status_forcelist=(500, 502, 503, 504),
+      allowed_methods=frozenset({"GET"})
+  )
+  adapter = HTTPAdapter(
+      pool_connections=AppConfig.DOWNLOAD_POOL_SIZE,
+      pool_maxsize=AppConfig.DOWNLOAD_POOL_SIZE,
+      max_retries=retry
+  )
+
+  session = requests.Session()
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+  return session
+
+
+def get_download_session() -> requests.Session:
+  """워커 프로세스마다 keep-alive 커넥션 풀을 가진 세션 하나를 재사용"""
+  global _download_session, _download_session_pid
+
+  with _lock:
+    if _download_session is None or _download_session_pid != os.getpid():
+      _download_session = _create_download_session()
+      _download_session_pid = os.getpid()
+    return _download_session
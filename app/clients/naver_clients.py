@@ -1,10 +1,13 @@
 import os
 from typing import Tuple
 
+import httpx
 from dotenv import load_dotenv
 
 from app.blueprints.agreement.agreement_exception import AgreementException
 from app.common.exception.error_code import ErrorCode
+from app.common.loop_local import LoopLocal
+from config.app_config import AppConfig
 
 load_dotenv()
 
@@ -19,4 +22,28 @@ def get_naver_ocr_client() -> Tuple[str, dict]:
   headers = {
     "X-OCR-SECRET": api_key
   }
-  return api_url, headers
\ No newline at end of file
+  return api_url, headers
+
+
+def _create_naver_ocr_http_client() -> httpx.AsyncClient:
+  return httpx.AsyncClient(
+      timeout=httpx.Timeout(timeout=AppConfig.OCR_TIMEOUT, connect=10.0),
+      limits=httpx.Limits(
+          max_connections=AppConfig.OCR_MAX_CONCURRENCY,
+          max_keepalive_connections=AppConfig.OCR_MAX_CONCURRENCY
+      )
+  )
+
+
+# 워커마다 keep-alive 커넥션을 가진 OCR 요청용 클라이언트 하나를 재사용
+_naver_ocr_http_client = LoopLocal(_create_naver_ocr_http_client)
+
+
+def get_naver_ocr_http_client() -> httpx.AsyncClient:
+  return _naver_ocr_http_client.get()
+
+
+async def close_naver_ocr_http_client() -> None:
+  client = _naver_ocr_http_client.pop()
+  if client is not None:
+    await client.aclose()
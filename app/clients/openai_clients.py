@@ -1,12 +1,12 @@
-import logging
 import os
-from contextlib import asynccontextmanager, contextmanager
 
 import httpx
 from dotenv import load_dotenv
-from openai import AsyncAzureOpenAI, AzureOpenAI
+from openai import AsyncAzureOpenAI
 
-from app.common.constants import EMBEDDING_MODEL, PROMPT_MODEL
+from app.common.constants import EMBEDDING_MODEL, PROMPT_MODEL, LLM_TIMEOUT
+from app.common.loop_local import LoopLocal
+from config.app_config import AppConfig
 
 load_dotenv() # 루트로 고정
 
@@ -14,46 +14,56 @@ load_dotenv() # 루트로 고정
 # sync_openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-@asynccontextmanager
-async def get_embedding_async_client():
-  async with AsyncAzureOpenAI(
+def _create_pooled_http_client() -> httpx.AsyncClient:
+  return httpx.AsyncClient(
+      timeout=httpx.Timeout(timeout=LLM_TIMEOUT, connect=30.0),
+      limits=httpx.Limits(
+          max_connections=AppConfig.OPENAI_MAX_CONNECTIONS,
+          max_keepalive_connections=AppConfig.OPENAI_MAX_CONNECTIONS,
+          keepalive_expiry=60.0
+      ),
+      http2=False
+  )
+
+
+def _create_embedding_async_client() -> AsyncAzureOpenAI:
+  return AsyncAzureOpenAI(
       api_key=os.getenv("AZURE_EMBEDDING_API_KEY"),
       api_version="2023-05-15",
       azure_endpoint=os.getenv("AZURE_EMBEDDING_OPENAI_ENDPOINT"),
-  ) as client:
-    yield client
+      http_client=_create_pooled_http_client()
+  )
 
 
-@contextmanager
-def get_embedding_sync_client():
-  client = AzureOpenAI(
-      api_key=os.getenv("AZURE_EMBEDDING_API_KEY"),
-      api_version="2023-05-15",
-      azure_endpoint=os.getenv("AZURE_EMBEDDING_OPENAI_ENDPOINT")
+def _create_prompt_async_client() -> AsyncAzureOpenAI:
+  return AsyncAzureOpenAI(
+      api_key=os.getenv("AZURE_PROMPT_API_KEY"),
+      api_version="2025-01-01-preview",
+      azure_endpoint=os.getenv("AZURE_PROMPT_OPENAI_ENDPOINT"),
+      http_client=_create_pooled_http_client()
   )
-  try:
-    yield client
-  finally:
-    client.close()
+
+
+# 워커마다 keep-alive 커넥션 풀을 가진 클라이언트 하나씩 재사용
+_embedding_async_client = LoopLocal(_create_embedding_async_client)
+_prompt_async_client = LoopLocal(_create_prompt_async_client)
+
+
+def get_embedding_async_client() -> AsyncAzureOpenAI:
+  return _embedding_async_client.get()
+
 
 embedding_deployment_name = EMBEDDING_MODEL
 
 
-@asynccontextmanager
-async def get_prompt_async_client():
-  httpx_client = httpx.AsyncClient(
-      timeout=httpx.Timeout(timeout=30.0, connect=30.0),
-      http2=False
-  )
-  async with httpx_client:
-    async with AsyncAzureOpenAI(
-        api_key=os.getenv("AZURE_PROMPT_API_KEY"),
-        api_version="2025-01-01-preview",
-        azure_endpoint=os.getenv("AZURE_PROMPT_OPENAI_ENDPOINT"),
-        http_client=httpx_client
-    ) as client:
-      ad = os.getenv("AZURE_PROMPT_OPENAI_ENDPOINT")
-      logging.info(f"endpoint: {ad}")
-      yield client
+def get_prompt_async_client() -> AsyncAzureOpenAI:
+  return _prompt_async_client.get()
 
 prompt_deployment_name = PROMPT_MODEL
+
+
+async def close_openai_clients() -> None:
+  for loop_local in (_embedding_async_client, _prompt_async_client):
+    client = loop_local.pop()
+    if client is not None:
+      await client.close()
@@ -1,9 +1,31 @@
+import httpx
 from qdrant_client import AsyncQdrantClient
+
+from app.common.loop_local import LoopLocal
 from config.app_config import AppConfig
 
-def get_qdrant_client() -> AsyncQdrantClient:
+
+def _create_qdrant_client() -> AsyncQdrantClient:
   return AsyncQdrantClient(
       host=AppConfig.QDRANT_HOST,
       port=AppConfig.QDRANT_PORT,
-      timeout=60
-  )
\ No newline at end of file
+      timeout=60,
+      limits=httpx.Limits(
+          max_connections=AppConfig.QDRANT_MAX_CONNECTIONS,
+          max_keepalive_connections=AppConfig.QDRANT_MAX_CONNECTIONS
+      )
+  )
+
+
+# 워커마다 하나의 커넥션 풀 클라이언트를 재사용 (httpx 커넥션은 루프에 묶임)
+_qdrant_client = LoopLocal(_create_qdrant_client)
+
+
+def get_qdrant_client() -> AsyncQdrantClient:
+  return _qdrant_client.get()
+
+
+async def close_qdrant_client() -> None:
+  client = _qdrant_client.pop()
+  if client is not None:
+    await client.close()
@@ -0,0 +1,134 @@
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional, TypeVar
+
+from app.clients.naver_clients import close_naver_ocr_http_client
+from app.clients.openai_clients import close_openai_clients
+from app.clients.qdrant_client import close_qdrant_client
+
+T = TypeVar("T")
+
+SHUTDOWN_TIMEOUT = 10.0
+# iterate_async 가 소비자보다 앞서 쌓아 둘 수 있는 최대 항목 수 / 가득 찼을 때 다시 확인하는 간격(초)
+STREAM_BUFFER_SIZE = 16
+STREAM_PUT_INTERVAL = 0.01
+
+_DONE = object()
+
+
+class AsyncRunner:
+  """
+  워커 프로세스마다 하나의 이벤트 루프를 전용 스레드에서 계속 돌린다.
+  요청 스레드는 코루틴을 이 루프에 넘기고 결과를 기다리므로,
+  루프에 묶인 커넥션 풀/세마포어/캐시가 요청이 끝나도 유지된다.
+  """
+
+  def __init__(self):
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._thread: Optional[threading.Thread] = None
+    self._pid: Optional[int] = None
+    self._lock = threading.Lock()
+
+  def submit(self, coro: Coroutine[Any, Any, T]) -> Future:
+    with self._lock:
+      if self._loop is None or self._pid != os.getpid():
+        self._start()
+      loop, thread = self._loop, self._thread
+
+    if threading.current_thread() is thread:
+      coro.close()
+      raise RuntimeError("이벤트 루프 스레드 안에서는 run_async 를 호출할 수 없음")
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+  def shutdown(self) -> None:
+    with self._lock:
+      loop, thread = self._loop, self._thread
+      if loop is None or self._pid != os.getpid():
+        return
+      self._loop, self._thread, self._pid = None, None, None
+
+    try:
+      asyncio.run_coroutine_threadsafe(_close_clients(), loop).result(
+          SHUTDOWN_TIMEOUT)
+    except Exception as e:
+      logging.warning(f"[AsyncRunner]: 클라이언트 정리 실패 {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(SHUTDOWN_TIMEOUT)
+
+  def _start(self) -> None:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=self._run_forever, args=(loop,),
+                              name="async-runner", daemon=True)
+    thread.start()
+    self._loop, self._thread, self._pid = loop, thread, os.getpid()
+
+  @staticmethod
+  def _run_forever(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+      loop.run_forever()
+    finally:
+      loop.close()
+
+
+async def _close_clients() -> None:
+  await close_qdrant_client()
+  await close_openai_clients()
+  await close_naver_ocr_http_client()
+
+
+_runner = AsyncRunner()
+atexit.register(_runner.shutdown)
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+  """워커 공용 이벤트 루프에서 코루틴을 실행하고 끝날 때까지 기다린다."""
+  return _runner.submit(coro).result()
+
+
+def iterate_async(agen: AsyncIterator[T],
+    buffer_size: int = STREAM_BUFFER_SIZE) -> Iterator[T]:
+  """
+  비동기 제너레이터를 워커 공용 루프에서 돌리며 동기 이터레이터로 꺼내준다.
+  대기열이 buffer_size 만큼 차면 생산자가 기다리므로 느린 소비자(클라이언트) 속도를 따라간다.
+  소비자가 중간에 멈추면(클라이언트 연결 종료 등) 남은 작업을 취소한다.
+  """
+  items: "queue.Queue[Any]" = queue.Queue(maxsize=buffer_size)
+
+  async def put(item: Any) -> None:
+    # 루프 스레드를 막지 않도록 블로킹 put 대신 자리가 날 때까지 짧게 쉬며 다시 넣는다
+    while True:
+      try:
+        items.put_nowait(item)
+        return
+      except queue.Full:
+        await asyncio.sleep(STREAM_PUT_INTERVAL)
+
+  async def produce() -> None:
+    try:
+      async for item in agen:
+        await put(item)
+    except asyncio.CancelledError:
+      raise
+    except BaseException as e:
+      await put(e)
+      return
+    await put(_DONE)
+
+  future = _runner.submit(produce())
+
+  try:
+    while True:
+      item = items.get()
+      if item is _DONE:
+        break
+      if isinstance(item, BaseException):
+        raise item
+      yield item
+  finally:
+    future.cancel()
@@ -34,6 +34,11 @@ class ErrorCode(Enum):
   NO_TEXTS_EXTRACTED = (HTTPStatus.INTERNAL_SERVER_ERROR, "C016", "해당 파일에서 추출된 텍스트 없음")
   PDF_LOAD_FAILED = (HTTPStatus.INTERNAL_SERVER_ERROR, "C017", "PDF 로딩 실패")
   LLM_RESPONSE_TIMEOUT = (HTTPStatus.INTERNAL_SERVER_ERROR, "C018", "LLM 응답 시간 초과")
+  JOB_NOT_FOUND = (HTTPStatus.NOT_FOUND, "C019", "존재하지 않거나 만료된 분석 작업")
+  JOB_QUEUE_FULL = (HTTPStatus.SERVICE_UNAVAILABLE, "C020", "대기 중인 분석 작업이 가득 참")
+  FILE_TOO_LARGE = (HTTPStatus.BAD_REQUEST, "C021", "허용된 크기를 넘는 파일")
+  INVALID_CONTENT_TYPE = (HTTPStatus.BAD_REQUEST, "C022", "요청 파일 형식과 다른 Content-Type")
+  QDRANT_UPSERT_FAILED = (HTTPStatus.INTERNAL_SERVER_ERROR, "C023", "Qdrant 포인트 저장 실패")
 
   # agreement 관련 에러
   AGREEMENT_REVIEW_FAIL = (HTTPStatus.INTERNAL_SERVER_ERROR, "A001", "AI 검토 보고서 생성 작업 중 에러 발생")
@@ -0,0 +1,35 @@
+import asyncio
+import os
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+  """
+  이벤트 루프(및 프로세스)마다 하나씩 만들어 재사용하는 객체 보관소.
+  httpx 커넥션, asyncio.Semaphore 처럼 루프에 묶이는 자원을 워커 단위로 공유할 때 사용한다.
+  """
+
+  def __init__(self, factory: Callable[[], T]):
+    self.factory = factory
+    self._value: Optional[T] = None
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._pid: Optional[int] = None
+
+  def get(self) -> T:
+    loop = asyncio.get_running_loop()
+    if self._value is None or self._loop is not loop or self._pid != os.getpid():
+      self._value = self.factory()
+      self._loop = loop
+      self._pid = os.getpid()
+    return self._value
+
+  def pop(self) -> Optional[T]:
+    """현재 루프에 묶인 객체를 꺼내고 비운다. 다른 루프의 객체면 None."""
+    if self._value is None or self._loop is not asyncio.get_running_loop():
+      return None
+
+    value = self._value
+    self._value, self._loop, self._pid = None, None, None
+    return value
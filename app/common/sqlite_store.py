@@ -0,0 +1,173 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+SQLITE_BUSY_TIMEOUT = 5.0
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+EVICTION_RATIO = 0.9
+
+
+class SharedSqliteStore:
+  """
+  gunicorn 워커들이 함께 쓰는 로컬 sqlite 파일 저장소.
+  WAL + mmap 으로 여러 프로세스가 동시에 읽고, 커넥션은 프로세스/스레드마다 따로 연다.
+  """
+
+  def __init__(self, path: str, schema: str):
+    self.path = path
+    self.schema = schema
+    self._local = threading.local()
+
+  def connection(self) -> sqlite3.Connection:
+    pid = os.getpid()
+    conn = getattr(self._local, "conn", None)
+    if conn is not None and getattr(self._local, "pid", None) == pid:
+      return conn
+
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT,
+                           isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    conn.executescript(self.schema)
+
+    self._local.conn = conn
+    self._local.pid = pid
+    return conn
+
+  def evict_least_recent(self, table: str, max_entries: int) -> int:
+    """last_access 가 오래된 행부터 지워 max_entries 의 EVICTION_RATIO 까지 줄인다."""
+    conn = self.connection()
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    if count <= max_entries:
+      return 0
+
+    remove_count = count - int(max_entries * EVICTION_RATIO)
+    conn.execute(
+        f"DELETE FROM {table} WHERE key IN ("
+        f"SELECT key FROM {table} ORDER BY last_access ASC LIMIT ?)",
+        (remove_count,))
+    return remove_count
+
+
+class SqliteCache:
+  """
+  SharedSqliteStore 위의 키-값 캐시 공통 부분.
+  조회 시 TTL 검사와 last_access 갱신, 일정 횟수 저장마다 TTL/LRU 정리, 적중률 집계를 맡고
+  하위 클래스는 키 생성과 값 컬럼 직렬화만 정한다.
+  테이블에는 key, value_columns, last_access 컬럼이 있어야 하고 ttl_seconds 를 쓰면 created_at 도 있어야 한다.
+  """
+
+  table = ""
+  value_columns: Tuple[str, ...] = ()
+  eviction_check_interval = 64
+  lookup_batch_size = 500
+
+  def __init__(self, path: str, schema: str, max_entries: int,
+      ttl_seconds: Optional[int] = None):
+    self.store = SharedSqliteStore(path, schema)
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.hits = 0
+    self.misses = 0
+    self._writes = 0
+    self._lock = threading.Lock()
+
+  def _lookup(self, keys: List[str]) -> List[Optional[tuple]]:
+    """keys 순서대로 값 컬럼 튜플(없거나 만료되면 None)을 돌려준다."""
+    found: Dict[str, tuple] = {}
+    columns = ", ".join(self.value_columns)
+    if self.ttl_seconds is not None:
+      columns += ", created_at"
+
+    try:
+      conn = self.store.connection()
+      now = time.time()
+      expired = []
+      unique_keys = list(dict.fromkeys(keys))
+      for i in range(0, len(unique_keys), self.lookup_batch_size):
+        batch = unique_keys[i:i + self.lookup_batch_size]
+        placeholders = ",".join("?" * len(batch))
+        rows = conn.execute(
+            f"SELECT key, {columns} FROM {self.table} "
+            f"WHERE key IN ({placeholders})", batch).fetchall()
+        for key, *values in rows:
+          if self.ttl_seconds is not None:
+            if now - values.pop() > self.ttl_seconds:
+              expired.append((key,))
+              continue
+          found[key] = tuple(values)
+
+      if found:
+        conn.executemany(
+            f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+            [(now, key) for key in found])
+      if expired:
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", expired)
+    except sqlite3.Error as e:
+      logging.warning(f"[{type(self).__name__}]: 캐시 조회 실패 {e}")
+
+    results = [found.get(key) for key in keys]
+    hit_count = sum(result is not None for result in results)
+    with self._lock:
+      self.hits += hit_count
+      self.misses += len(results) - hit_count
+    return results
+
+  def _store(self, rows: List[tuple]) -> None:
+    """(key, *value_columns) 행들을 저장하고 정리 주기가 되면 evict 한다."""
+    if not rows:
+      return
+
+    now = time.time()
+    columns = ["key", *self.value_columns, "last_access"]
+    timestamps = (now,)
+    if self.ttl_seconds is not None:
+      columns.append("created_at")
+      timestamps = (now, now)
+
+    try:
+      self.store.connection().executemany(
+          f"INSERT OR REPLACE INTO {self.table} ({', '.join(columns)}) "
+          f"VALUES ({', '.join('?' * len(columns))})",
+          [(*row, *timestamps) for row in rows])
+    except sqlite3.Error as e:
+      logging.warning(f"[{type(self).__name__}]: 캐시 저장 실패 {e}")
+      return
+
+    with self._lock:
+      self._writes += len(rows)
+      should_evict = self._writes >= self.eviction_check_interval
+      if should_evict:
+        self._writes = 0
+    if should_evict:
+      self.evict()
+
+  def evict(self) -> None:
+    try:
+      if self.ttl_seconds is not None:
+        self.store.connection().execute(
+            f"DELETE FROM {self.table} WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,))
+      removed = self.store.evict_least_recent(self.table, self.max_entries)
+      if removed:
+        logging.info(f"[{type(self).__name__}]: 오래된 항목 {removed}건 정리")
+    except sqlite3.Error as e:
+      logging.warning(f"[{type(self).__name__}]: 캐시 정리 실패 {e}")
+
+  def stats(self) -> dict:
+    with self._lock:
+      hits, misses = self.hits, self.misses
+    total = hits + misses
+    return {
+      "hits": hits,
+      "misses": misses,
+      "hit_rate": round(hits / total, 4) if total else 0.0
+    }
@@ -1,7 +1,67 @@
 from app.clients.openai_clients import embedding_deployment_name, prompt_deployment_name
+from app.services.common.embedding_cache import EmbeddingCache
 from app.services.common.embedding_service import EmbeddingService
+from app.services.common.job_manager import JobManager, FileJobStore, \
+  InMemoryJobStore
+from app.services.common.ocr_cache import OcrCache
 from app.services.common.prompt_service import PromptService
+from app.services.common.rate_limiter import RateLimiter
+from app.services.common.similarity_gate import SimilarityGate
+from app.services.common.verdict_cache import VerdictCache
+from config.app_config import AppConfig
 
 
-embedding_service = EmbeddingService(embedding_deployment_name)
-prompt_service = PromptService(prompt_deployment_name)
+embedding_cache = EmbeddingCache(
+    AppConfig.EMBEDDING_CACHE_PATH,
+    AppConfig.EMBEDDING_CACHE_MAX_ENTRIES,
+    AppConfig.EMBEDDING_CACHE_DTYPE
+) if AppConfig.EMBEDDING_CACHE_PATH else None
+
+verdict_cache = VerdictCache(
+    AppConfig.VERDICT_CACHE_PATH,
+    AppConfig.VERDICT_CACHE_MAX_ENTRIES,
+    AppConfig.VERDICT_CACHE_TTL_SECONDS
+) if AppConfig.VERDICT_CACHE_PATH else None
+
+ocr_cache = OcrCache(
+    AppConfig.OCR_CACHE_PATH,
+    AppConfig.OCR_CACHE_MAX_ENTRIES,
+    AppConfig.OCR_CACHE_TTL_SECONDS
+) if AppConfig.OCR_CACHE_PATH else None
+
+similarity_gate = SimilarityGate(
+    AppConfig.SIMILARITY_GATE_PATH,
+    AppConfig.SIMILARITY_GATE_TARGET_RECALL,
+    AppConfig.SIMILARITY_GATE_MIN_SAMPLES,
+    AppConfig.SIMILARITY_GATE_AUDIT_RATE
+) if AppConfig.SIMILARITY_GATE_PATH else None
+
+prompt_rate_limiter = RateLimiter(
+    prompt_deployment_name,
+    AppConfig.AZURE_PROMPT_RPM,
+    AppConfig.AZURE_PROMPT_TPM,
+    AppConfig.RATE_LIMIT_DIR
+)
+embedding_rate_limiter = RateLimiter(
+    embedding_deployment_name,
+    AppConfig.AZURE_EMBEDDING_RPM,
+    AppConfig.AZURE_EMBEDDING_TPM,
+    AppConfig.RATE_LIMIT_DIR
+)
+
+embedding_service = EmbeddingService(
+    embedding_deployment_name,
+    embedding_cache,
+    max_batch_tokens=AppConfig.EMBEDDING_MAX_BATCH_TOKENS,
+    max_concurrency=AppConfig.EMBEDDING_MAX_CONCURRENCY,
+    rate_limiter=embedding_rate_limiter
+)
+prompt_service = PromptService(prompt_deployment_name, prompt_rate_limiter)
+
+job_manager = JobManager(
+    FileJobStore(AppConfig.JOB_STORE_DIR)
+    if AppConfig.JOB_STORE == "file" else InMemoryJobStore(),
+    max_workers=AppConfig.JOB_MAX_WORKERS,
+    max_pending=AppConfig.JOB_MAX_PENDING,
+    result_ttl_seconds=AppConfig.JOB_RESULT_TTL_SECONDS
+)
@@ -9,6 +9,7 @@ class VectorPayload:
   corrected_text: str | None
   term_explanation: str | None
   created_at: str
+  content_hash: str = ""
 
   def to_dict(self) -> dict:
     return {
@@ -17,7 +18,8 @@ class VectorPayload:
       "proof_text": self.proof_text or "",
       "corrected_text": self.corrected_text or "",
       "term_explanation": self.term_explanation or "",
-      "created_at": self.created_at or ""
+      "created_at": self.created_at or "",
+      "content_hash": self.content_hash or ""
     }
 
   def embedding_input(self) -> str:
@@ -15,6 +15,8 @@ class SearchResult:
   incorrect_text: str
   corrected_text: str
   term_explanation: str
+  point_id: str = ''
+  score: float = 0.0
 
 @dataclass
 class RagResult:
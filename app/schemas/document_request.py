@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel
 
 
@@ -5,3 +7,8 @@ class DocumentRequest(BaseModel):
   url: str
   categoryName: str
   id: int
+  # 여러 장으로 나뉜 이미지 계약서의 페이지 순서대로의 url (없으면 url 한 장)
+  urls: List[str] = []
+
+  def page_urls(self) -> List[str]:
+    return self.urls or [self.url]
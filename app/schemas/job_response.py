@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.services.common.job_manager import Job
+
+
+@dataclass
+class JobResponse:
+  job_id: str
+  job_type: str
+  status: str
+  done: int = 0
+  total: int = 0
+  result: Optional[Any] = None
+  error_code: Optional[str] = None
+  error_message: Optional[str] = None
+
+  @classmethod
+  def of(cls, job: Job) -> "JobResponse":
+    return cls(
+        job_id=job.job_id,
+        job_type=job.job_type,
+        status=job.status.value,
+        done=job.done,
+        total=job.total,
+        result=job.result,
+        error_code=job.error_code,
+        error_message=job.error_message
+    )
@@ -0,0 +1,35 @@
+import json
+from dataclasses import asdict, dataclass, is_dataclass
+from enum import Enum
+from typing import Any, Optional
+
+from app.schemas.success_response import SuccessResponse
+
+
+class FrameType(Enum):
+  CHUNK = "chunk"
+  SUMMARY = "summary"
+  ERROR = "error"
+
+
+@dataclass
+class StreamSummary:
+  total_chunks: int = 0
+  total_page: int = 0
+
+
+@dataclass
+class StreamFrame:
+  type: FrameType
+  data: Optional[Any] = None
+  code: Optional[str] = None
+  message: Optional[str] = None
+
+  def of(self) -> str:
+    data = asdict(self.data) if is_dataclass(self.data) else self.data
+    frame = {"type": self.type.value}
+    if data is not None:
+      frame["data"] = SuccessResponse.convert_keys_to_camel_case(data)
+    if self.code:
+      frame["code"], frame["message"] = self.code, self.message
+    return json.dumps(frame, ensure_ascii=False) + "\n"
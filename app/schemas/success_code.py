@@ -9,6 +9,9 @@ class SuccessCode(Enum):
 
   REVIEW_SUCCESS = (HTTPStatus.OK, "A001", "계약서 검토 완료")
 
+  JOB_ACCEPTED = (HTTPStatus.ACCEPTED, "J001", "분석 작업 접수 완료")
+  JOB_FOUND = (HTTPStatus.OK, "J002", "분석 작업 조회 완료")
+
 
   def __init__(self, status: HTTPStatus, code: str, message: str):
     self.status = status
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from app.common.exception.custom_exception import CommonException
+from app.common.exception.error_code import ErrorCode
+
+# 전처리 방식이 바뀌면 OCR 결과도 달라지므로 캐시 키에 함께 넣는다
+PREPROCESS_VERSION = "v2"
+
+# 긴 변 목표 픽셀: 글자가 빽빽한 이미지는 작은 글자가 뭉개지지 않도록 해상도를 더 남긴다
+DENSE_TEXT_LONG_SIDE = 3000
+SPARSE_TEXT_LONG_SIDE = 2000
+# 축소 썸네일에서 잉크(어두운 픽셀) 비율이 이 값 이상이면 글자가 빽빽한 것으로 본다
+DENSE_INK_RATIO = 0.08
+DENSITY_THUMBNAIL_SIDE = 256
+
+JPEG_QUALITY = 90
+PNG_COMPRESSION = 6
+
+
+@dataclass
+class PreprocessedImage:
+  data: bytes
+  format: str
+  height: int
+  width: int
+
+  @property
+  def content_type(self) -> str:
+    return "image/png" if self.format == "png" else "image/jpeg"
+
+
+def preprocess_image(image_data: bytes) -> PreprocessedImage:
+  """
+  그레이스케일로 바로 디코딩 -> (필요할 때만) 축소 -> OTSU 이진화 -> PNG/JPEG 중 작은 쪽으로 인코딩.
+  """
+  image = cv2.imdecode(np.frombuffer(image_data, np.uint8),
+                       cv2.IMREAD_GRAYSCALE)
+  if image is None:
+    raise CommonException(ErrorCode.FILE_FORMAT_INVALID)
+
+  scale = downscale_ratio(image)
+  if scale < 1:
+    image = cv2.resize(image, None, fx=scale, fy=scale,
+                       interpolation=cv2.INTER_AREA)
+
+  # OTSU : 자동으로 최적의 Thresholding
+  _, binarized_img = cv2.threshold(image, 0, 255,
+                                   cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+  data, image_format = encode_smallest(binarized_img)
+  height, width = binarized_img.shape[:2]
+  return PreprocessedImage(data=data, format=image_format, height=height,
+                           width=width)
+
+
+def downscale_ratio(gray_image: np.ndarray) -> float:
+  """원본 해상도와 글자 밀도로 축소 비율을 정한다. 1 이면 축소하지 않는다."""
+  long_side = max(gray_image.shape[:2])
+  if long_side <= SPARSE_TEXT_LONG_SIDE:
+    return 1.0
+
+  target = DENSE_TEXT_LONG_SIDE if ink_ratio(
+      gray_image) >= DENSE_INK_RATIO else SPARSE_TEXT_LONG_SIDE
+  return min(1.0, target / long_side)
+
+
+def ink_ratio(gray_image: np.ndarray) -> float:
+  height, width = gray_image.shape[:2]
+  thumbnail_scale = DENSITY_THUMBNAIL_SIDE / max(height, width)
+  thumbnail = cv2.resize(gray_image, (max(1, int(width * thumbnail_scale)),
+                                      max(1, int(height * thumbnail_scale))),
+                         interpolation=cv2.INTER_AREA)
+  _, ink_mask = cv2.threshold(thumbnail, 0, 255,
+                              cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+  return cv2.countNonZero(ink_mask) / ink_mask.size
+
+
+def encode_smallest(binarized_img: np.ndarray) -> Tuple[bytes, str]:
+  # 이진 이미지는 1비트 PNG 가 대부분 더 작지만, 노이즈가 많은 사진은 JPEG 가 작을 수 있다
+  _, png = cv2.imencode(".png", binarized_img,
+                        [cv2.IMWRITE_PNG_BILEVEL, 1,
+                         cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION])
+  _, jpg = cv2.imencode(".jpg", binarized_img,
+                        [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+  if len(png) <= len(jpg):
+    return png.tobytes(), "png"
+  return jpg.tobytes(), "jpg"
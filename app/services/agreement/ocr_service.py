@@ -3,60 +3,82 @@ import json
 import logging
 import time
 import uuid
-from typing import List, Tuple
+from typing import List, Tuple, Optional, AsyncIterator
 
-import cv2
-import numpy as np
-import requests
-from qdrant_client import AsyncQdrantClient
+import httpx
 
 from app.blueprints.agreement.agreement_exception import AgreementException
-from app.clients.naver_clients import get_naver_ocr_client
-from app.clients.openai_clients import get_embedding_async_client, \
-  get_prompt_async_client
-from app.clients.qdrant_client import get_qdrant_client
+from app.clients.naver_clients import get_naver_ocr_client, \
+  get_naver_ocr_http_client
 from app.common.chunk_status import ChunkProcessStatus, ChunkProcessResult
-from app.common.decorators import async_measure_time, measure_time
+from app.common.constants import MAX_RETRIES
+from app.common.decorators import async_measure_time
+from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
-from app.containers.service_container import embedding_service, prompt_service
-from app.schemas.analysis_response import RagResult
+from app.containers.service_container import ocr_cache
+from app.schemas.analysis_response import RagResult, SearchResult, \
+  ClauseData
+from app.schemas.chunk_schema import Document, DocumentMetadata
 from app.schemas.document_request import DocumentRequest
+from app.services.agreement.image_preprocessor import PreprocessedImage, \
+  PREPROCESS_VERSION, preprocess_image
+from app.services.agreement.ocr_token_index import OcrTokenIndex
 from app.services.agreement.vectorize_similarity import \
-  prepare_embedding_inputs, search_qdrant, parse_incorrect_text, \
-  LLM_REQUIRED_KEYS, VIOLATION_THRESHOLD
-from app.services.common.llm_retry import retry_llm_call
-from app.services.common.qdrant_utils import ensure_qdrant_collection
+  retrieve_search_results, parse_incorrect_text, correct_clause, \
+  build_clause_tasks, collect_success_results, stream_success_results, \
+  VIOLATION_THRESHOLD
+from app.services.common.job_manager import JobProgress, track_progress
+from app.services.common.s3_service import s3_get_object
+from config.app_config import AppConfig
 
 
-@measure_time
-def extract_ocr(image_url: str) -> Tuple[str, List[dict]]:
-  image_response = requests.get(image_url)
-  image_data = image_response.content
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+OCR_RETRY_BACKOFF = 0.5
 
-  # 이미지 열기 (바이너리로 읽은 데이터를 사용)
-
-  image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
-
-  # 1. 해상도 가로 세로 1/2 => 총 1/4 조정
-  height, width = image.shape[:2]
-  resize_ratio = 1
-  resized_image = cv2.resize(image, (
-    int(width * resize_ratio), int(height * resize_ratio)),
-                             interpolation=cv2.INTER_LINEAR)
-
-  # 2. 그레이스케일 변환
-  gray = cv2.cvtColor(resized_image, cv2.COLOR_BGR2GRAY)
-
-  # 3. 이진화 (OTSU : 자동으로 최적의 Thresholding)
-  _, binarized_img = cv2.threshold(gray, 0, 255,
-                                   cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
+@async_measure_time
+async def extract_ocr(image_urls: List[str]) -> Tuple[
+  List[Document], OcrTokenIndex]:
+  """
+  이미지(페이지)마다 다운로드/전처리/OCR 요청을 동시에 진행하고 결과는 페이지 순서대로 합친다.
+  """
+  semaphore = asyncio.Semaphore(AppConfig.OCR_MAX_CONCURRENCY)
+
+  async def run_page(image_url: str) -> Tuple[dict, int, int]:
+    image_data = await asyncio.to_thread(s3_get_object, image_url)
+
+    cache_key = None
+    if ocr_cache:
+      cache_key = await asyncio.to_thread(ocr_cache.make_key, image_data,
+                                          PREPROCESS_VERSION)
+      cached = await asyncio.to_thread(ocr_cache.get, cache_key)
+      if cached:
+        return cached["result"], cached["height"], cached["width"]
+
+    image = await asyncio.to_thread(preprocess_image, image_data)
+    async with semaphore:
+      ocr_result = await request_ocr(image)
+
+    # 인식에 실패한 이미지는 다시 시도할 수 있도록 캐시하지 않는다
+    if cache_key and all(image_result.get('inferResult') == 'SUCCESS'
+                         for image_result in ocr_result.get('images', [])):
+      await asyncio.to_thread(ocr_cache.put, cache_key,
+                              {"result": ocr_result, "height": image.height,
+                               "width": image.width})
+    return ocr_result, image.height, image.width
+
+  page_results = await asyncio.gather(
+      *[run_page(image_url) for image_url in image_urls])
+  return merge_ocr_results(page_results)
+
+
+async def request_ocr(image: PreprocessedImage) -> dict:
   # OCR 요청 JSON 생성
 
   request_json = {
     'images': [
       {
-        'format': 'jpg',
+        'format': image.format,
         'name': 'demo',  # 요청 이름
         # 'rotate': True
       }
@@ -67,109 +89,117 @@ def extract_ocr(image_url: str) -> Tuple[str, List[dict]]:
   }
 
   api_url, headers = get_naver_ocr_client()
-  payload = {'message': json.dumps(request_json).encode('UTF-8')}
-
-  # 전송을 위한 인코딩
-  files = [
-    ('file', (
-      'photo1_binary_low.jpg', cv2.imencode('.jpg', binarized_img)[1].tobytes(),
-      'image/jpeg'))  # 이진화된 이미지를 바이너리로 전송
-  ]
-
-  try:
-    response = requests.request("POST", api_url, headers=headers, data=payload,
-                                files=files)
-  except Exception:
-    raise AgreementException(ErrorCode.NAVER_OCR_REQUEST_FAIL)
-
-  ocr_results = json.loads(response.text)
-
-  image_height, image_width = binarized_img.shape[:2]
-
-  all_texts_with_bounding_boxes = []
-  full_text = ""
-  current_idx = 0
-
-  # OCR 결과에서 텍스트와 바운딩 박스를 묶어서 리스트로 저장
-  for image_result in ocr_results['images']:
-    for field in image_result['fields']:
-      text = field['inferText']
-      bounding_box = field['boundingPoly']['vertices']
-
-      # 상대 좌표 변환
-      relative_bounding_box = [
-        {
-          'x': vertex['x'] / image_width,
-          'y': vertex['y'] / image_height
-        }
-        for vertex in bounding_box
-      ]
-
-      start_idx = current_idx
-      end_idx = start_idx + len(text)
-
-      # 텍스트 인덱스와 바운딩 박스를 함께 저장
-      all_texts_with_bounding_boxes.append({
-        'text': text,
-        'bounding_box': relative_bounding_box,
-        'start_idx': start_idx,
-        'end_idx': end_idx
-      })
-
-      # full_text와 current_idx 갱신
-      full_text += text + " "
-      current_idx = len(full_text)
-
-  return full_text, all_texts_with_bounding_boxes
+  payload = {'message': json.dumps(request_json)}
+
+  # 이진화된 이미지를 바이너리로 전송
+  files = {'file': (f'photo1_binary_low.{image.format}', image.data,
+                    image.content_type)}
+
+  for attempt in range(1, MAX_RETRIES + 1):
+    try:
+      response = await get_naver_ocr_http_client().post(
+          api_url, headers=headers, data=payload, files=files)
+      if response.status_code not in RETRYABLE_STATUS_CODES:
+        response.raise_for_status()
+        return response.json()
+      logging.warning(
+          f"[request_ocr]: OCR 재요청 발생 {attempt}/{MAX_RETRIES} status={response.status_code}")
+
+    except httpx.HTTPStatusError as e:
+      logging.error(f"[request_ocr]: OCR 요청 거절 {e}")
+      raise AgreementException(ErrorCode.NAVER_OCR_REQUEST_FAIL)
+    except (httpx.TransportError, ValueError) as e:
+      logging.warning(
+          f"[request_ocr]: OCR 재요청 발생 {attempt}/{MAX_RETRIES} {e}")
+
+    if attempt < MAX_RETRIES:
+      await asyncio.sleep(OCR_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+  raise AgreementException(ErrorCode.NAVER_OCR_REQUEST_FAIL)
+
+
+def merge_ocr_results(page_results: List[Tuple[dict, int, int]]) -> Tuple[
+  List[Document], OcrTokenIndex]:
+  """페이지별 OCR 결과를 이어 붙인다. 토큰의 문자 위치는 페이지를 넘어 이어진다."""
+  documents: List[Document] = []
+  tokens = []
+
+  for page, (ocr_results, image_height, image_width) in enumerate(
+      page_results, start=1):
+    page_texts = []
+
+    # OCR 결과에서 텍스트와 바운딩 박스를 묶어서 리스트로 저장
+    for image_result in ocr_results['images']:
+      for field in image_result.get('fields', []):
+        text = field['inferText']
+        bounding_box = field['boundingPoly']['vertices']
+
+        # 상대 좌표 변환
+        relative_bounding_box = [
+          {
+            'x': vertex.get('x', 0) / image_width,
+            'y': vertex.get('y', 0) / image_height
+          }
+          for vertex in bounding_box
+        ]
+
+        tokens.append((text, page, relative_bounding_box))
+        page_texts.append(text)
+
+    if page_texts:
+      documents.append(Document(page_content=" ".join(page_texts) + " ",
+                                metadata=DocumentMetadata(page=page)))
+
+  if not documents:
+    raise CommonException(ErrorCode.NO_TEXTS_EXTRACTED)
+  return documents, OcrTokenIndex.from_tokens(tokens)
 
 
 @async_measure_time
 async def vectorize_and_calculate_similarity_ocr(
     combined_chunks: List[RagResult], document_request: DocumentRequest,
-    all_texts_with_bounding_boxes: List[dict]) -> List[RagResult]:
-  qd_client = get_qdrant_client()
-  await ensure_qdrant_collection(qd_client, document_request.categoryName)
-
-  embedding_inputs = await prepare_embedding_inputs(combined_chunks)
-
-  async with get_embedding_async_client() as embedding_client:
-    embeddings = await embedding_service.batch_embed_texts(
-        embedding_client, embedding_inputs)
-
-  tasks = [
-    process_clause_ocr(qd_client, chunk, embedding,
-                       document_request.categoryName,
-                       all_texts_with_bounding_boxes)
-    for chunk, embedding in zip(combined_chunks, embeddings)
-  ]
-  results = await asyncio.gather(*tasks)
+    token_index: OcrTokenIndex,
+    progress: Optional[JobProgress] = None) -> List[RagResult]:
+  if progress:
+    progress.set_total(len(combined_chunks))
 
-  success_results: List[RagResult] = [r.result for r in results if
-                                      r.status == ChunkProcessStatus.SUCCESS and r.result is not None]
-  failure_score = sum(r.status == ChunkProcessStatus.FAILURE for r in results)
+  search_results = await retrieve_search_results(
+      combined_chunks, document_request.categoryName)
 
-  if not success_results and failure_score == len(combined_chunks):
-    raise AgreementException(ErrorCode.CHUNK_ANALYSIS_FAILED)
+  tasks = build_clause_tasks(
+      combined_chunks, search_results, document_request.categoryName,
+      lambda chunk, clause_search_results, sample_weight: process_clause_ocr(
+          chunk, clause_search_results, document_request.categoryName,
+          token_index, sample_weight))
+  results = await asyncio.gather(
+      *[track_progress(task, progress) for task in tasks])
+  return collect_success_results(results)
 
-  return success_results
-
-
-async def process_clause_ocr(qd_client: AsyncQdrantClient,
-    rag_result: RagResult, embedding: List[float], collection_name: str,
-    all_texts_with_bounding_boxes: List[dict]) -> ChunkProcessResult:
-  semaphore = asyncio.Semaphore(5)
-  search_results = await search_qdrant(semaphore, collection_name, embedding,
-                                       qd_client)
 
+async def stream_similarity_results_ocr(
+    combined_chunks: List[RagResult], document_request: DocumentRequest,
+    token_index: OcrTokenIndex) -> AsyncIterator[RagResult]:
+  search_results = await retrieve_search_results(
+      combined_chunks, document_request.categoryName)
+
+  tasks = build_clause_tasks(
+      combined_chunks, search_results, document_request.categoryName,
+      lambda chunk, clause_search_results, sample_weight: process_clause_ocr(
+          chunk, clause_search_results, document_request.categoryName,
+          token_index, sample_weight))
+  async for rag_result in stream_success_results(tasks):
+    yield rag_result
+
+
+async def process_clause_ocr(rag_result: RagResult,
+    search_results: List[SearchResult], collection_name: str,
+    token_index: OcrTokenIndex,
+    sample_weight: float = 1.0) -> ChunkProcessResult:
   parse_incorrect_text(rag_result)
 
-  async with get_prompt_async_client() as prompt_client:
-    corrected_result = await retry_llm_call(
-        prompt_service.correct_contract,
-        prompt_client, rag_result.incorrect_text.replace("\n", " "),
-        search_results,
-        required_keys=LLM_REQUIRED_KEYS
-    )
+  corrected_result = await correct_clause(
+      rag_result.incorrect_text.replace("\n", " "), search_results,
+      collection_name, sample_weight)
   if not corrected_result:
     return ChunkProcessResult(status=ChunkProcessStatus.FAILURE)
 
@@ -186,14 +216,17 @@ async def process_clause_ocr(qd_client: AsyncQdrantClient,
 
   all_positions, part_position = \
     await find_text_positions_ocr(rag_result, incorrect_part,
-                                  all_texts_with_bounding_boxes)
+                                  token_index)
 
   rag_result.accuracy = score
   rag_result.corrected_text = corrected_result["correctedText"]
   rag_result.proof_text = corrected_result["proofText"]
 
-  rag_result.clause_data[0].position.extend(all_positions)
-  rag_result.clause_data[0].position_part.extend(part_position)
+  # 여러 이미지에 걸친 조항은 박스를 해당 페이지의 clause_data 에 나눠 담는다
+  for page, position in all_positions:
+    find_clause_on_page(rag_result, page).position.append(position)
+  for page, position in part_position:
+    find_clause_on_page(rag_result, page).position_part.append(position)
 
   if any(not clause.position for clause in rag_result.clause_data):
     logging.warning(f"원문 일치 position값 불러오지 못함")
@@ -203,9 +236,14 @@ async def process_clause_ocr(qd_client: AsyncQdrantClient,
                             result=rag_result)
 
 
+def find_clause_on_page(rag_result: RagResult, page: int) -> ClauseData:
+  return next((clause for clause in rag_result.clause_data if
+               clause.page == page), rag_result.clause_data[0])
+
+
 async def find_text_positions_ocr(rag_result: RagResult, incorrect_part: str,
-    all_texts_with_bounding_boxes: List[dict]) -> tuple[
-  List[tuple], List[tuple]]:
+    token_index: OcrTokenIndex) -> tuple[
+  List[Tuple[int, tuple]], List[Tuple[int, tuple]]]:
   # +를 기준으로 문장을 나누고 뒤에 있는 부분만 사용
   clause_content = rag_result.incorrect_text.split('+', 1)
   if len(clause_content) > 1:
@@ -219,7 +257,7 @@ async def find_text_positions_ocr(rag_result: RagResult, incorrect_part: str,
   all_positions, part_positions = extract_bbox_positions(
       rag_result.incorrect_text,
       incorrect_part,
-      all_texts_with_bounding_boxes)
+      token_index)
 
   return all_positions, part_positions
 
@@ -227,80 +265,15 @@ async def find_text_positions_ocr(rag_result: RagResult, incorrect_part: str,
 def extract_bbox_positions(
     clause_content: str,
     incorrect_part: str,
-    all_texts_with_bounding_boxes: List[dict]
-) -> tuple[List[tuple], List[tuple]]:
-  full_text = " ".join(item['text'] for item in all_texts_with_bounding_boxes)
-
-  def get_position_range(target_text: str, base_start: int = 0) -> tuple[
-    int, int]:
-    start_idx = full_text.find(target_text, base_start)
-    end_idx = start_idx + len(target_text) if start_idx != -1 else -1
-    return start_idx, end_idx
-
-  def extract_bboxes(start_idx: int, end_idx: int) -> List[tuple]:
-    epsilon = None
-
-    matched_items = [
-      item for item in all_texts_with_bounding_boxes
-      if start_idx <= item['start_idx'] < end_idx
-    ]
-
-    grouped_texts = {}
-    for item in matched_items:
-      bounding_box = item['bounding_box']
-      center_y = sum(vertex['y'] for vertex in bounding_box) / len(bounding_box)
-
-      if epsilon is None:
-        y_values = [vertex['y'] for vertex in bounding_box]
-        group_height = max(y_values) - min(y_values)
-        epsilon = group_height * 0.5
-
-      abs_center_y = center_y
-      group_found = False
-      for y_group in grouped_texts:
-        if y_group - epsilon < abs_center_y < y_group + epsilon:
-          grouped_texts[y_group].append(item)
-          group_found = True
-          break
-      if not group_found:
-        grouped_texts[abs_center_y] = [item]
-
-    points_list = []
-    unique_relative_points = set()
-    for y_group in grouped_texts:
-      min_x_group = float('inf')
-      min_y_group = float('inf')
-      max_x_group = float('-inf')
-      max_y_group = float('-inf')
-
-      for item in grouped_texts[y_group]:
-        for vertex in item['bounding_box']:
-          abs_x = vertex['x']
-          abs_y = vertex['y']
-          min_x_group = min(min_x_group, abs_x)
-          min_y_group = min(min_y_group, abs_y)
-          max_x_group = max(max_x_group, abs_x)
-          max_y_group = max(max_y_group, abs_y)
-
-      min_x = min_x_group * 100
-      min_y = min_y_group * 100
-      width = (max_x_group - min_x_group) * 100
-      height = (max_y_group - min_y_group) * 100
-
-      points_tuple = (min_x, min_y, width, height)
-      if points_tuple not in unique_relative_points:
-        unique_relative_points.add(points_tuple)
-        points_list.append(points_tuple)
-
-    return points_list
-
+    token_index: OcrTokenIndex
+) -> tuple[List[Tuple[int, tuple]], List[Tuple[int, tuple]]]:
   # 전체 문장 기준
-  clause_start_idx, clause_end_idx = get_position_range(clause_content)
+  clause_start_idx, clause_end_idx = token_index.locate(clause_content)
   # 부분 문장은 전체 문장 안에서만 찾기
-  part_start_idx, part_end_idx = get_position_range(incorrect_part,
+  part_start_idx, part_end_idx = token_index.locate(incorrect_part,
                                                     clause_start_idx)
 
-  all_positions = extract_bboxes(clause_start_idx, clause_end_idx)
-  part_positions = extract_bboxes(part_start_idx, part_end_idx)
+  all_positions = token_index.line_boxes(clause_start_idx, clause_end_idx)
+  part_positions = token_index.line_boxes(part_start_idx, part_end_idx)
 
   return all_positions, part_positions
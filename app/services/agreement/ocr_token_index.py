@@ -0,0 +1,107 @@
+from typing import List, Tuple
+
+import numpy as np
+
+Box = Tuple[float, float, float, float]
+
+# 같은 줄로 묶는 세로 허용 오차 (첫 토큰 높이 대비)
+LINE_TOLERANCE_RATIO = 0.5
+# 페이지가 다른 토큰이 같은 줄로 묶이지 않도록 정렬 키에서 페이지 간격을 벌린다 (좌표는 0~1 상대값)
+PAGE_KEY_STRIDE = 10.0
+
+
+class OcrTokenIndex:
+  """
+  문서마다 한 번 만드는 OCR 토큰 색인.
+  토큰의 문자 구간(start/end)과 바운딩 박스를 NumPy 열 배열로 들고 있어
+  구간 조회는 이분 탐색으로, 줄 묶기는 정렬된 세로 중심값 위에서 한 번에 처리한다.
+  """
+
+  def __init__(self, texts: List[str], starts: np.ndarray, ends: np.ndarray,
+      pages: np.ndarray, boxes: np.ndarray, center_ys: np.ndarray):
+    self.full_text = " ".join(texts)
+    self.starts = starts
+    self.ends = ends
+    self.pages = pages
+    # (x0, y0, x1, y1)
+    self.boxes = boxes
+    self.center_ys = center_ys
+
+  @classmethod
+  def from_tokens(cls,
+      tokens: List[Tuple[str, int, List[dict]]]) -> "OcrTokenIndex":
+    """(텍스트, 페이지, 상대 좌표 꼭짓점) 목록을 읽기 순서대로 받아 색인을 만든다."""
+    count = len(tokens)
+    starts = np.empty(count, dtype=np.int64)
+    ends = np.empty(count, dtype=np.int64)
+    pages = np.empty(count, dtype=np.int64)
+    boxes = np.empty((count, 4), dtype=np.float64)
+    center_ys = np.empty(count, dtype=np.float64)
+
+    offset = 0
+    for i, (text, page, vertices) in enumerate(tokens):
+      xs = [vertex['x'] for vertex in vertices]
+      ys = [vertex['y'] for vertex in vertices]
+
+      # 토큰 사이에는 공백 하나가 들어가므로 다음 토큰은 end + 1 에서 시작한다
+      starts[i], ends[i] = offset, offset + len(text)
+      offset = ends[i] + 1
+      pages[i] = page
+      boxes[i] = (min(xs), min(ys), max(xs), max(ys))
+      center_ys[i] = sum(ys) / len(ys)
+
+    return cls([text for text, _, _ in tokens], starts, ends, pages, boxes,
+               center_ys)
+
+  def __len__(self) -> int:
+    return len(self.starts)
+
+  def locate(self, target_text: str, base_start: int = 0) -> Tuple[int, int]:
+    start_idx = self.full_text.find(target_text, base_start)
+    end_idx = start_idx + len(target_text) if start_idx != -1 else -1
+    return start_idx, end_idx
+
+  def line_boxes(self, start_idx: int, end_idx: int) -> List[
+    Tuple[int, Box]]:
+    """
+    시작 위치가 [start_idx, end_idx) 에 드는 토큰들을 줄 단위로 묶어
+    (페이지, (x, y, 너비, 높이)) 백분율 박스로 돌려준다.
+    """
+    if start_idx < 0:
+      return []
+    lo = int(np.searchsorted(self.starts, start_idx, side="left"))
+    hi = int(np.searchsorted(self.starts, end_idx, side="left"))
+    if lo >= hi:
+      return []
+
+    boxes = self.boxes[lo:hi]
+    first_box = boxes[0]
+    tolerance = (first_box[3] - first_box[1]) * LINE_TOLERANCE_RATIO
+
+    keys = self.pages[lo:hi] * PAGE_KEY_STRIDE + self.center_ys[lo:hi]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    # 줄의 첫 토큰(가장 위) 중심에서 허용 오차 안에 드는 토큰까지를 한 줄로 본다
+    line_starts = []
+    i = 0
+    while i < len(sorted_keys):
+      line_starts.append(i)
+      i = max(i + 1, int(np.searchsorted(sorted_keys, sorted_keys[i] + tolerance,
+                                         side="left")))
+
+    sorted_boxes = boxes[order]
+    mins = np.minimum.reduceat(sorted_boxes[:, :2], line_starts, axis=0)
+    maxs = np.maximum.reduceat(sorted_boxes[:, 2:], line_starts, axis=0)
+    line_pages = self.pages[lo:hi][order][line_starts]
+
+    rects = np.hstack([mins, maxs - mins]) * 100
+
+    positions = []
+    seen = set()
+    for page, rect in zip(line_pages.tolist(), rects.tolist()):
+      position = (page, tuple(rect))
+      if position not in seen:
+        seen.add(position)
+        positions.append(position)
+    return positions
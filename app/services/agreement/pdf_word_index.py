@@ -0,0 +1,106 @@
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import fitz
+
+Rect = Tuple[float, float, float, float]
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_search_text(text: str) -> str:
+  return _WHITESPACE_PATTERN.sub("", text).lower()
+
+
+@dataclass
+class PageWords:
+  width: float
+  height: float
+  # (x0, y0, x1, y1, 정규화된 단어, block_no, line_no)
+  words: List[Tuple[float, float, float, float, str, int, int]]
+  # 공백 없이 이어 붙인 페이지 문자열과, 각 문자가 속한 단어 인덱스 / 단어 안 위치
+  text: str
+  char_word: array
+  char_offset: array
+
+
+class PdfWordIndex:
+  """
+  문서마다 한 번 get_text("words") 로 만든 페이지별 단어 색인.
+  공백을 무시하고 문자열을 찾으므로 줄바꿈으로 나뉜 문장도 찾으며,
+  찾은 구간은 page.search_for 처럼 줄마다 하나의 사각형으로 돌려준다.
+  """
+
+  def __init__(self, pages: Dict[int, PageWords]):
+    self.pages = pages
+
+  @classmethod
+  def from_document(cls, doc: fitz.Document) -> "PdfWordIndex":
+    return cls({page.number + 1: cls._index_page(page) for page in doc})
+
+  @staticmethod
+  def _index_page(page: fitz.Page) -> PageWords:
+    words = []
+    chars: List[str] = []
+    char_word = array("i")
+    char_offset = array("i")
+
+    for x0, y0, x1, y1, word, block_no, line_no, _ in page.get_text("words"):
+      word = normalize_search_text(word)
+      if not word:
+        continue
+      index = len(words)
+      words.append((x0, y0, x1, y1, word, block_no, line_no))
+      chars.append(word)
+      char_word.extend([index] * len(word))
+      char_offset.extend(range(len(word)))
+
+    return PageWords(width=float(page.rect.width),
+                     height=float(page.rect.height), words=words,
+                     text="".join(chars), char_word=char_word,
+                     char_offset=char_offset)
+
+  def page_size(self, page_num: int) -> Tuple[float, float]:
+    page = self.pages[page_num]
+    return page.width, page.height
+
+  def search(self, page_num: int, text: str) -> List[Rect]:
+    page = self.pages.get(page_num)
+    needle = normalize_search_text(text)
+    if page is None or not needle:
+      return []
+
+    rects: List[Rect] = []
+    start = page.text.find(needle)
+    while start != -1:
+      end = start + len(needle) - 1
+      rects.extend(self._line_rects(page, start, end))
+      start = page.text.find(needle, end + 1)
+    return rects
+
+  @staticmethod
+  def _line_rects(page: PageWords, start: int, end: int) -> List[Rect]:
+    first_word, last_word = page.char_word[start], page.char_word[end]
+    lines: Dict[Tuple[int, int], List[float]] = {}
+
+    for index in range(first_word, last_word + 1):
+      x0, y0, x1, y1, word, block_no, line_no = page.words[index]
+
+      # 단어 일부만 걸리면 글자 수 비율로 가로 범위를 줄인다
+      char_width = (x1 - x0) / len(word)
+      left, right = x0, x1
+      if index == first_word:
+        left = x0 + char_width * page.char_offset[start]
+      if index == last_word:
+        right = x0 + char_width * (page.char_offset[end] + 1)
+
+      line = lines.get((block_no, line_no))
+      if line is None:
+        lines[(block_no, line_no)] = [left, y0, right, y1]
+      else:
+        line[0], line[1] = min(line[0], left), min(line[1], y0)
+        line[2], line[3] = max(line[2], right), max(line[3], y1)
+
+    return [tuple(line) for line in lines.values()]
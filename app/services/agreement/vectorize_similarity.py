@@ -1,7 +1,7 @@
 import asyncio
 import logging
-from asyncio import Semaphore
-from typing import List, Optional, Any
+from typing import List, Optional, Any, AsyncIterator, Awaitable, Callable, \
+  Tuple
 import fitz
 
 from qdrant_client import models, AsyncQdrantClient
@@ -15,50 +15,167 @@ from app.common.chunk_status import ChunkProcessResult, ChunkProcessStatus
 from app.common.constants import ARTICLE_CLAUSE_SEPARATOR, \
   CLAUSE_TEXT_SEPARATOR, MAX_RETRIES
 from app.common.decorators import async_measure_time
+from app.common.loop_local import LoopLocal
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
-from app.containers.service_container import embedding_service, prompt_service
+from app.containers.service_container import embedding_service, \
+  prompt_service, verdict_cache, similarity_gate
 from app.schemas.analysis_response import RagResult, SearchResult
 from app.schemas.document_request import DocumentRequest
+from app.services.agreement.pdf_word_index import PdfWordIndex
+from app.services.common.contract_batcher import CorrectContractBatcher
+from app.services.common.job_manager import JobProgress, track_progress
 from app.services.common.llm_retry import retry_llm_call
-from app.services.common.qdrant_utils import ensure_qdrant_collection
+from app.services.common.prompt_service import \
+  CORRECT_CONTRACT_PROMPT_VERSION
+from app.services.common.qdrant_utils import ensure_qdrant_collection, \
+  forget_collection
+from config.app_config import AppConfig
 
 SEARCH_COUNT = 3
 VIOLATION_THRESHOLD = 0.84
 LLM_REQUIRED_KEYS = {"clause_content", "correctedText", "proofText",
                      "violation_score"}
+# correct_contract 응답이 실제로 돌려주는 키, 판정 캐시/배치 판정의 완전성 기준
+VERDICT_KEYS = {"correctedText", "proofText", "violation_score",
+                "incorrectPart"}
+
+_contract_batcher = LoopLocal(lambda: CorrectContractBatcher(
+    prompt_service,
+    max_batch_size=AppConfig.CORRECT_CONTRACT_BATCH_SIZE,
+    max_batch_tokens=AppConfig.CORRECT_CONTRACT_BATCH_TOKENS,
+    flush_delay=AppConfig.CORRECT_CONTRACT_BATCH_DELAY,
+    required_keys=VERDICT_KEYS
+))
 
 
 @async_measure_time
 async def vectorize_and_calculate_similarity(
     combined_chunks: List[RagResult], document_request: DocumentRequest,
-    byte_type_pdf: fitz.Document) -> List[RagResult]:
+    byte_type_pdf: fitz.Document,
+    progress: Optional[JobProgress] = None) -> List[RagResult]:
+  if progress:
+    progress.set_total(len(combined_chunks))
+
+  search_results, word_index = await retrieve_with_word_index(
+      combined_chunks, document_request.categoryName, byte_type_pdf)
+
+  tasks = build_clause_tasks(
+      combined_chunks, search_results, document_request.categoryName,
+      lambda chunk, clause_search_results, sample_weight: process_clause(
+          chunk, clause_search_results, document_request.categoryName,
+          word_index, sample_weight))
+  results = await asyncio.gather(
+      *[track_progress(task, progress) for task in tasks])
+  return collect_success_results(results)
+
+
+async def stream_similarity_results(
+    combined_chunks: List[RagResult], document_request: DocumentRequest,
+    byte_type_pdf: fitz.Document) -> AsyncIterator[RagResult]:
+  search_results, word_index = await retrieve_with_word_index(
+      combined_chunks, document_request.categoryName, byte_type_pdf)
+
+  tasks = build_clause_tasks(
+      combined_chunks, search_results, document_request.categoryName,
+      lambda chunk, clause_search_results, sample_weight: process_clause(
+          chunk, clause_search_results, document_request.categoryName,
+          word_index, sample_weight))
+  async for rag_result in stream_success_results(tasks):
+    yield rag_result
+
+
+async def retrieve_with_word_index(combined_chunks: List[RagResult],
+    collection_name: str, byte_type_pdf: fitz.Document) -> Tuple[
+  List[List[SearchResult]], PdfWordIndex]:
+  """검색과 함께 좌표 조회용 단어 색인을 이벤트 루프 밖 스레드에서 만든다."""
+  return await asyncio.gather(
+      retrieve_search_results(combined_chunks, collection_name),
+      asyncio.to_thread(PdfWordIndex.from_document, byte_type_pdf))
+
+
+async def retrieve_search_results(combined_chunks: List[RagResult],
+    collection_name: str) -> List[List[SearchResult]]:
   qd_client = get_qdrant_client()
-  await ensure_qdrant_collection(qd_client, document_request.categoryName)
+  await ensure_qdrant_collection(qd_client, collection_name)
 
   embedding_inputs = await prepare_embedding_inputs(combined_chunks)
 
-  async with get_embedding_async_client() as embedding_client:
-    embeddings = await embedding_service.batch_embed_texts(
-        embedding_client, embedding_inputs)
+  embeddings = await embedding_service.batch_embed_texts(
+      get_embedding_async_client(), embedding_inputs)
+  return await search_qdrant_batch(qd_client, collection_name, embeddings)
+
+
+def build_clause_tasks(combined_chunks: List[RagResult],
+    search_results: List[List[SearchResult]], collection_name: str,
+    process: Callable[[RagResult, List[SearchResult], float], Awaitable[
+      ChunkProcessResult]]) -> List[Awaitable[ChunkProcessResult]]:
+  """
+  유사도 게이트를 통과한 조항만 process 로 LLM 분석하고, 나머지는 위반 없음으로 처리한다.
+  process 에는 판정 이력에 남길 가중치(감사 표본이면 1 / audit_rate)를 함께 넘긴다.
+  """
+  sample_weights = [
+    similarity_gate.sample_weight(
+        collection_name, top_similarity(clause_search_results))
+    if similarity_gate else 1.0
+    for clause_search_results in search_results
+  ]
+  if similarity_gate:
+    skip_count = sum(weight is None for weight in sample_weights)
+    logging.info(
+        f"[SimilarityGate]: {collection_name} LLM 생략 {skip_count}/{len(sample_weights)}")
 
-  tasks = [
-    process_clause(qd_client, chunk, embedding,
-                   document_request.categoryName, byte_type_pdf)
-    for chunk, embedding in zip(combined_chunks, embeddings)
+  return [
+    skip_clause() if sample_weight is None
+    else process(chunk, clause_search_results, sample_weight)
+    for chunk, clause_search_results, sample_weight in
+    zip(combined_chunks, search_results, sample_weights)
   ]
-  results = await asyncio.gather(*tasks)
 
+
+async def skip_clause() -> ChunkProcessResult:
+  return ChunkProcessResult(status=ChunkProcessStatus.SUCCESS)
+
+
+def top_similarity(search_results: List[SearchResult]) -> float:
+  return max((result.score for result in search_results), default=0.0)
+
+
+def collect_success_results(results: List[ChunkProcessResult]) -> List[
+  RagResult]:
   success_results: List[RagResult] = [r.result for r in results if
                                       r.status == ChunkProcessStatus.SUCCESS and r.result is not None]
   failure_score = sum(r.status == ChunkProcessStatus.FAILURE for r in results)
 
-  if not success_results and failure_score == len(combined_chunks):
+  if not success_results and failure_score == len(results):
     raise AgreementException(ErrorCode.CHUNK_ANALYSIS_FAILED)
 
   return success_results
 
 
+async def stream_success_results(
+    tasks: List[Awaitable[ChunkProcessResult]]) -> AsyncIterator[RagResult]:
+  """조항 분석이 끝나는 순서대로 결과를 내보낸다. 실패 판정 기준은 collect_success_results 와 같다."""
+  futures = [asyncio.ensure_future(task) for task in tasks]
+  has_success = False
+  failure_score = 0
+
+  try:
+    for future in asyncio.as_completed(futures):
+      result = await future
+      if result.status == ChunkProcessStatus.FAILURE:
+        failure_score += 1
+      elif result.result is not None:
+        has_success = True
+        yield result.result
+  finally:
+    for future in futures:
+      future.cancel()
+
+  if not has_success and failure_score == len(futures):
+    raise AgreementException(ErrorCode.CHUNK_ANALYSIS_FAILED)
+
+
 async def prepare_embedding_inputs(chunks: List[RagResult]) -> List[str]:
   inputs = []
   for chunk in chunks:
@@ -69,21 +186,14 @@ async def prepare_embedding_inputs(chunks: List[RagResult]) -> List[str]:
   return inputs
 
 
-async def process_clause(qd_client: AsyncQdrantClient, rag_result: RagResult,
-    embedding: List[float], collection_name: str,
-    byte_type_pdf: fitz.Document) -> ChunkProcessResult:
-  semaphore = asyncio.Semaphore(5)
-  search_results = await search_qdrant(semaphore, collection_name, embedding,
-                                       qd_client)
+async def process_clause(rag_result: RagResult,
+    search_results: List[SearchResult], collection_name: str,
+    word_index: PdfWordIndex, sample_weight: float = 1.0) -> ChunkProcessResult:
   parse_incorrect_text(rag_result)
 
-  async with get_prompt_async_client() as prompt_client:
-    corrected_result = await retry_llm_call(
-        prompt_service.correct_contract,
-        prompt_client, rag_result.incorrect_text.replace("\n", " "),
-        search_results,
-        required_keys=LLM_REQUIRED_KEYS
-    )
+  corrected_result = await correct_clause(
+      rag_result.incorrect_text.replace("\n", " "), search_results,
+      collection_name, sample_weight)
   if not corrected_result:
     return ChunkProcessResult(status=ChunkProcessStatus.FAILURE)
 
@@ -99,7 +209,7 @@ async def process_clause(qd_client: AsyncQdrantClient, rag_result: RagResult,
   incorrect_part = corrected_result["incorrectPart"]
 
   all_positions, part_position = \
-    await find_text_positions(rag_result, incorrect_part, byte_type_pdf)
+    await find_text_positions(rag_result, incorrect_part, word_index)
 
   rag_result.accuracy = score
   positions = await extract_positions_by_page(all_positions)
@@ -114,6 +224,54 @@ async def process_clause(qd_client: AsyncQdrantClient, rag_result: RagResult,
                             result=rag_result)
 
 
+async def correct_clause(clause_content: str,
+    search_results: List[SearchResult], collection_name: str,
+    sample_weight: float = 1.0) -> Optional[dict[str, Any]]:
+  batched = AppConfig.CORRECT_CONTRACT_BATCH_SIZE > 1
+  cache_key = None
+  if verdict_cache:
+    prompt_version = CorrectContractBatcher.prompt_version if batched \
+      else CORRECT_CONTRACT_PROMPT_VERSION
+    cache_key = verdict_cache.make_key(clause_content, search_results,
+                                       prompt_version,
+                                       prompt_service.deployment_name)
+    cached_result = await asyncio.to_thread(verdict_cache.get, cache_key)
+    if cached_result is not None:
+      return cached_result
+
+  if batched:
+    corrected_result = await _contract_batcher.get().correct(
+        get_prompt_async_client(), clause_content, search_results)
+  else:
+    corrected_result = await retry_llm_call(
+        prompt_service.correct_contract,
+        get_prompt_async_client(), clause_content,
+        search_results,
+        required_keys=LLM_REQUIRED_KEYS
+    )
+
+  if isinstance(corrected_result, dict) and \
+      VERDICT_KEYS.issubset(corrected_result.keys()):
+    if cache_key:
+      await asyncio.to_thread(verdict_cache.put, cache_key, collection_name,
+                              corrected_result)
+    await asyncio.to_thread(record_verdict, collection_name, search_results,
+                            corrected_result, sample_weight)
+  return corrected_result
+
+
+def record_verdict(collection_name: str, search_results: List[SearchResult],
+    corrected_result: dict[str, Any], sample_weight: float = 1.0) -> None:
+  if not similarity_gate:
+    return
+  try:
+    score = float(corrected_result["violation_score"])
+  except (ValueError, TypeError):
+    return
+  similarity_gate.record(collection_name, top_similarity(search_results),
+                         score >= VIOLATION_THRESHOLD, sample_weight)
+
+
 async def extract_incorrect_text(rag_result: RagResult) -> str:
   clause_content_parts = rag_result.incorrect_text.split(
     ARTICLE_CLAUSE_SEPARATOR, 1)
@@ -132,36 +290,55 @@ def parse_incorrect_text(rag_result: RagResult) -> None:
   rag_result.incorrect_text = rag_result.incorrect_text.replace("\n", " ")
 
 
-async def search_qdrant(semaphore: Semaphore, collection_name: str,
-    embedding: List[float],
-    qd_client: AsyncQdrantClient) -> List[SearchResult]:
-  search_results = await search_collection(qd_client, semaphore,
-                                           collection_name, embedding)
-  return gather_search_results(search_results)
+async def search_qdrant_batch(qd_client: AsyncQdrantClient,
+    collection_name: str, embeddings: List[List[float]]) -> List[
+  List[SearchResult]]:
+  responses = await search_collection_batch(qd_client, collection_name,
+                                            embeddings)
+  return [gather_search_results(response) for response in responses]
+
+
+async def search_collection_batch(qd_client: AsyncQdrantClient,
+    collection_name: str, embeddings: List[List[float]]) -> List[
+  QueryResponse]:
+  batch_size = AppConfig.QDRANT_SEARCH_BATCH_SIZE
+  batch_responses = await asyncio.gather(*[
+    search_collection(qd_client, collection_name, embeddings[i:i + batch_size])
+    for i in range(0, len(embeddings), batch_size)
+  ])
+  return [response for responses in batch_responses for response in responses]
 
 
 async def search_collection(qd_client: AsyncQdrantClient,
-    semaphore: Semaphore, collection_name: str,
-    embedding: List[float]) -> QueryResponse:
+    collection_name: str, embeddings: List[List[float]]) -> List[
+  QueryResponse]:
+  requests = [
+    models.QueryRequest(
+        query=embedding,
+        params=models.SearchParams(hnsw_ef=128, exact=False),
+        limit=SEARCH_COUNT,
+        with_payload=True
+    )
+    for embedding in embeddings
+  ]
+
   for attempt in range(1, MAX_RETRIES + 1):
     try:
-      async with semaphore:
-        search_results = await qd_client.query_points(
-            collection_name=collection_name,
-            query=embedding,
-            search_params=models.SearchParams(hnsw_ef=128, exact=False),
-            limit=SEARCH_COUNT,
-            with_payload=True
-        )
+      search_results = await qd_client.query_batch_points(
+          collection_name=collection_name,
+          requests=requests
+      )
       break
     except Exception as e:
       if attempt == MAX_RETRIES:
+        forget_collection(collection_name)
         raise CommonException(ErrorCode.QDRANT_SEARCH_FAILED)
       logging.warning(
           f"[search_collection]: Qdrant Search 재요청 발생 {attempt}/{MAX_RETRIES} {e}")
       await asyncio.sleep(1)
 
-  if search_results is None or not search_results.points:
+  if len(search_results) != len(requests) or any(
+      not response.points for response in search_results):
     raise AgreementException(ErrorCode.NO_POINTS_FOUND)
 
   return search_results
@@ -173,7 +350,9 @@ def gather_search_results(search_results: QueryResponse) -> List[SearchResult]:
         proof_text=point.payload.get("proof_text", ""),
         incorrect_text=point.payload.get("incorrect_text", ""),
         corrected_text=point.payload.get("corrected_text", ""),
-        term_explanation=point.payload.get("term_explanation", "")
+        term_explanation=point.payload.get("term_explanation", ""),
+        point_id=str(point.id),
+        score=point.score
     )
     for point in search_results.points[:SEARCH_COUNT]
   ]
@@ -212,21 +391,18 @@ def set_result_data(corrected_result: Optional[
     rag_result.clause_data[1].position_part = part_positions[1]
 
 
-def search_text_in_pdf(text: str, pdf_doc: fitz.Document, clause_data,
+def search_text_in_pdf(text: str, word_index: PdfWordIndex, clause_data,
     is_relative=True) -> dict[int, List[dict]]:
   positions_by_page = {}
   # 페이지별 검색
   for clause_part in clause_data:
     page_num = clause_part.page
-    page = pdf_doc.load_page(page_num - 1)
-
-    page_width = float(page.rect.width)
-    page_height = float(page.rect.height)
+    page_width, page_height = word_index.page_size(page_num)
 
     page_positions = []
 
-    # 바로 검색
-    text_instances = page.search_for(text.strip())
+    # 단어 색인에서 바로 검색
+    text_instances = word_index.search(page_num, text)
     grouped_positions = {}
 
     for inst in text_instances:
@@ -275,7 +451,7 @@ def search_text_in_pdf(text: str, pdf_doc: fitz.Document, clause_data,
 
 
 async def find_text_positions(rag_result: RagResult, incorrect_part: str,
-    pdf_document: fitz.Document) -> dict[str, dict[int, List[dict]]]:
+    word_index: PdfWordIndex) -> dict[str, dict[int, List[dict]]]:
   # incorrect_text 처리 (all_positions 용)
   clause_content_parts = rag_result.incorrect_text.split('+', 1)
   if len(clause_content_parts) > 1:
@@ -290,7 +466,7 @@ async def find_text_positions(rag_result: RagResult, incorrect_part: str,
     part = part.strip()
     if part == "":
       continue
-    partial_result = search_text_in_pdf(part, pdf_document,
+    partial_result = search_text_in_pdf(part, word_index,
                                         rag_result.clause_data)
     for page, boxes in partial_result.items():
       if page not in all_positions:
@@ -298,7 +474,7 @@ async def find_text_positions(rag_result: RagResult, incorrect_part: str,
       all_positions[page].extend(boxes)
 
   # incorrect_part는 그대로 검색
-  part_position = search_text_in_pdf(incorrect_part, pdf_document,
+  part_position = search_text_in_pdf(incorrect_part, word_index,
                                      rag_result.clause_data)
   for page, boxes in part_position.items():
     if page not in part_positions:
@@ -1,59 +1,59 @@
+import asyncio
 import re
+from enum import Enum
 from typing import List
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
-import nltk
 import numpy as np
-import tiktoken
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from nltk import find
 from sklearn.manifold import TSNE
 
 from app.blueprints.agreement.agreement_exception import AgreementException
 from app.blueprints.standard.standard_exception import StandardException
-from app.clients.openai_clients import get_embedding_sync_client
+from app.clients.openai_clients import get_embedding_async_client
 from app.common.constants import ARTICLE_CHUNK_PATTERN, \
   ARTICLE_CLAUSE_SEPARATOR, CLAUSE_HEADER_PATTERN, NUMBER_HEADER_PATTERN
 from app.common.exception.error_code import ErrorCode
 from app.containers.service_container import embedding_service
 from app.schemas.chunk_schema import ClauseChunk, DocumentChunk
 from app.schemas.chunk_schema import Document
+from app.services.common.clause_parser import get_section_scanner
+from app.services.common.sentence_splitter import split_into_sentences
+from app.services.common.tokenizer import count_tokens_batch, \
+  count_tokens as count_model_tokens
 
 MIN_CLAUSE_BODY_LENGTH = 10
+CHUNK_TOKEN_MODEL = "gpt-4o-mini"
 
 
-def semantic_chunk_with_overlap(extracted_text: str,
+class BoundaryMode(str, Enum):
+  # 인접 문장 유사도가 similarity_threshold 미만이면 끊는다
+  FIXED = "fixed"
+  # 앞뒤 window 문장 이동 평균으로 튀는 값을 누른 뒤 similarity_threshold 와 비교한다
+  WINDOW = "window"
+  # 문서 안 유사도 분포의 하위 percentile 을 기준으로 삼는다 (similarity_threshold 무시)
+  PERCENTILE = "percentile"
+
+
+async def semantic_chunk_with_overlap(extracted_text: str,
     similarity_threshold: float = 0.88, max_tokens: int = 250,
-    overlap: int = 1, visualize: bool = False) -> List[ClauseChunk]:
-  sentences = split_into_sentences(extracted_text)
+    overlap: int = 1, visualize: bool = False,
+    boundary_mode: BoundaryMode = BoundaryMode.FIXED,
+    window: int = 3, percentile: float = 10.0) -> List[ClauseChunk]:
+  # 문장 분리/토큰 계산은 CPU 작업이라 공용 이벤트 루프를 막지 않도록 스레드에서 돌린다
+  sentences = await asyncio.to_thread(split_into_sentences, extracted_text)
   sentences = [s for s in sentences if len(s.strip()) > MIN_CLAUSE_BODY_LENGTH]
   if not sentences:
     raise StandardException(ErrorCode.CHUNKING_FAIL)
 
-  with get_embedding_sync_client() as embedding_client:
-    embeddings = embedding_service.batch_sync_embed_texts(embedding_client,
-                                                          sentences)
-
-  chunks = []
-  current_chunk = [sentences[0]]
-  prev_embedding = embeddings[0]
-
-  for i in range(1, len(sentences)):
-    similarity = cosine(prev_embedding, embeddings[i])
-    tentative_chunk = current_chunk + [sentences[i]]
-    token_len = count_tokens(" ".join(tentative_chunk))
-
-    if similarity < similarity_threshold or token_len > max_tokens:
-      chunks.append(ClauseChunk(clause_content=" ".join(current_chunk)))
-      current_chunk = current_chunk[-overlap:] + [sentences[i]]
-    else:
-      current_chunk.append(sentences[i])
-
-    prev_embedding = embeddings[i]
+  embeddings = await embed_sentences(sentences)
 
-  if current_chunk:
-    chunks.append(ClauseChunk(clause_content=" ".join(current_chunk)))
+  similarities = adjacent_similarities(embeddings)
+  boundaries = detect_boundaries(similarities, similarity_threshold,
+                                 boundary_mode, window, percentile)
+  chunks = await asyncio.to_thread(group_sentences, sentences, boundaries,
+                                   max_tokens, overlap)
 
   if visualize:
     try:
@@ -67,10 +67,86 @@ def semantic_chunk_with_overlap(extracted_text: str,
   return chunks
 
 
-def cosine(a: List[float], b: List[float]) -> float:
-  a = np.array(a).flatten()
-  b = np.array(b).flatten()
-  return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+async def embed_sentences(sentences: List[str]) -> np.ndarray:
+  """
+  전체 문장을 임베딩 서비스 하나로 보내 토큰 예산 단위 배치를 동시에(max_concurrency) 처리하고,
+  끝나는 대로 float32 행렬의 해당 행에 채운다.
+  """
+  matrix: Optional[np.ndarray] = None
+  async for indices, embeddings in embedding_service.stream_embed_texts(
+      get_embedding_async_client(), sentences):
+    if matrix is None:
+      matrix = np.empty((len(sentences), len(embeddings[0])),
+                        dtype=np.float32)
+    matrix[indices] = embeddings
+  return matrix
+
+
+def adjacent_similarities(embeddings: Union[np.ndarray, List[List[float]]]) -> \
+    np.ndarray:
+  """문장 임베딩을 정규화된 float32 행렬 하나로 두고 i, i+1 번째 문장 코사인 유사도를 한 번에 구한다."""
+  matrix = np.asarray(embeddings, dtype=np.float32)
+  norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+  matrix = matrix / np.maximum(norms, np.finfo(np.float32).tiny)
+  return np.einsum("ij,ij->i", matrix[:-1], matrix[1:])
+
+
+def detect_boundaries(similarities: np.ndarray, similarity_threshold: float,
+    boundary_mode: BoundaryMode = BoundaryMode.FIXED, window: int = 3,
+    percentile: float = 10.0) -> np.ndarray:
+  """i 번째 값이 True 면 i 와 i+1 번째 문장 사이에서 청크를 끊는다."""
+  if len(similarities) == 0:
+    return np.zeros(0, dtype=bool)
+
+  if boundary_mode == BoundaryMode.WINDOW and window > 1:
+    # 양끝은 가장자리 값으로 채워 길이를 유지한다
+    padded = np.pad(similarities, (window // 2, (window - 1) // 2),
+                    mode="edge")
+    smoothed = np.convolve(padded, np.ones(window) / window, mode="valid")
+    return smoothed < similarity_threshold
+
+  if boundary_mode == BoundaryMode.PERCENTILE:
+    return similarities < np.percentile(similarities, percentile)
+
+  return similarities < similarity_threshold
+
+
+def group_sentences(sentences: List[str], boundaries: np.ndarray,
+    max_tokens: int, overlap: int) -> List[ClauseChunk]:
+  """
+  boundaries 에서 끊기로 한 자리거나 토큰 수가 max_tokens 를 넘으면 청크를 끊는다.
+  문장별 토큰 수는 한 번에 세어 두고 청크 길이는 누적합으로 따라간다.
+  """
+  # 청크 첫 문장은 그대로, 이어 붙는 문장은 앞 공백까지 포함해 센다 (" ".join 과 같은 토큰 경계)
+  first_tokens = count_tokens_batch(sentences, CHUNK_TOKEN_MODEL)
+  joined_tokens = count_tokens_batch([" " + sentence for sentence in sentences],
+                                     CHUNK_TOKEN_MODEL)
+
+  def chunk_token_len(indices: List[int]) -> int:
+    return first_tokens[indices[0]] + sum(
+        joined_tokens[index] for index in indices[1:])
+
+  chunks = []
+  current_chunk = [0]
+  current_tokens = first_tokens[0]
+  is_boundary = boundaries.tolist()
+
+  for i in range(1, len(sentences)):
+    token_len = current_tokens + joined_tokens[i]
+
+    if is_boundary[i - 1] or token_len > max_tokens:
+      chunks.append(ClauseChunk(
+          clause_content=" ".join(sentences[index] for index in current_chunk)))
+      current_chunk = (current_chunk[-overlap:] if overlap else []) + [i]
+      current_tokens = chunk_token_len(current_chunk)
+    else:
+      current_chunk.append(i)
+      current_tokens = token_len
+
+  if current_chunk:
+    chunks.append(ClauseChunk(
+        clause_content=" ".join(sentences[index] for index in current_chunk)))
+  return chunks
 
 
 def append_chunk_if_valid(chunks: List[ClauseChunk], current_chunk: List[str]):
@@ -103,21 +179,8 @@ def visualize_embeddings_3d(embeddings: List[List[float]], sentences: List[str],
   plt.savefig("semantic_embedding_result")
 
 
-def ensure_punkt():
-  try:
-    find('tokenizers/punkt')
-  except LookupError:
-    nltk.download('punkt')
-
-
-def split_into_sentences(extracted_text: str):
-  ensure_punkt()
-  return nltk.sent_tokenize(extracted_text)
-
-
 def count_tokens(text: str) -> int:
-  encoding = tiktoken.encoding_for_model("gpt-4o-mini")
-  return len(encoding.encode(text))
+  return count_model_tokens(text, CHUNK_TOKEN_MODEL)
 
 
 def split_text_by_pattern(text: str, pattern: str) -> List[str]:
@@ -140,7 +203,7 @@ def chunk_by_article_and_clause_with_page(documents: List[Document],
       order_index, chunks = (
         chunk_preamble_content(pattern, page_text, chunks, page, order_index))
 
-    matches = re.findall(pattern, page_text, flags=re.DOTALL)
+    matches = get_section_scanner(pattern).findall(page_text)
     for header, body in matches:
       header_match = None
 
@@ -230,17 +293,17 @@ def is_page_text_starting_with_article_heading(heading: str,
     page_text: str) -> bool:
   lines = page_text.strip().splitlines()
   content_lines = [line for line in lines if not line.strip().startswith("페이지")]
-  return bool(re.match(heading, content_lines[0])) if content_lines else False
+  return get_section_scanner(heading).matches_start(
+      content_lines[0]) if content_lines else False
 
 
 def chunk_preamble_content(pattern: str, page_text: str,
     chunks: List[DocumentChunk], page: int, order_index: int) -> \
     Tuple[int, List[DocumentChunk]]:
-  first_article_match = (
-    re.search(pattern, page_text, flags=re.MULTILINE))
+  first_article_start = get_section_scanner(pattern).first_start(page_text)
 
   preamble = page_text[
-             :first_article_match.start()] if first_article_match else page_text
+             :first_article_start] if first_article_start is not None else page_text
   return append_preamble(chunks, preamble, page, order_index)
 
 
@@ -0,0 +1,94 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.common.constants import ARTICLE_CHUNK_PATTERN, NUMBER_HEADER_PATTERN
+
+# ARTICLE_CHUNK_PATTERN / NUMBER_HEADER_PATTERN 을 머리(header)와 본문 끝 조건으로 나눈 것.
+# 본문을 .*? + lookahead 로 한 글자씩 늘려가지 않고, 다음 종결 위치를 한 번 찾아 잘라낸다.
+ARTICLE_HEADER = r'제\s*\d+\s*조\s*(?:【[^】\n]*】?|[^】\n]*】|\([^)\\n]*\)?|\[[^\]\n]*\]?)'
+ARTICLE_TERMINATOR = r'제\s*\d+\s*조'
+NUMBER_HEADER = r'(?<!\d)\d{1,2}\.'
+NUMBER_TERMINATOR = r'\s\d{1,2}\.'
+
+
+class SectionScanner:
+  """
+  조문/번호 머리 패턴 하나에 대한 선형 시간 스캐너.
+  findall 은 re.findall(pattern, text, re.DOTALL) 과 같은 (머리, 본문) 목록을,
+  first_start 는 re.search(pattern, text, re.MULTILINE).start() 와 같은 위치를 돌려준다.
+  """
+
+  def __init__(self, header: str, gap: str, terminator: str,
+      body_ends_before_final_newline: bool, line_end_terminates: bool):
+    self.header = re.compile(header)
+    self.gap = re.compile(gap)
+    self.terminator = re.compile(terminator)
+    # 본문 끝 조건이 $ 이면 마지막 줄바꿈 앞에서, \Z 이면 문자열 끝에서 끝난다
+    self.body_ends_before_final_newline = body_ends_before_final_newline
+    # MULTILINE 에서 $ 는 줄 끝마다 맞으므로 본문이 줄을 넘지 못해도 항상 끝날 수 있다
+    self.line_end_terminates = line_end_terminates
+
+  def findall(self, text: str) -> List[Tuple[str, str]]:
+    sections = []
+    text_end = len(text) - 1 if self.body_ends_before_final_newline and \
+                                text.endswith("\n") else len(text)
+
+    position = 0
+    while True:
+      header_match = self.header.search(text, position)
+      if header_match is None:
+        return sections
+
+      body_start = self.gap.match(text, header_match.end()).end()
+      terminator_match = self.terminator.search(text, body_start)
+      body_end = terminator_match.start() if terminator_match else max(
+          body_start, text_end)
+
+      sections.append((header_match.group(0), text[body_start:body_end]))
+      position = body_end
+
+  def first_start(self, text: str) -> Optional[int]:
+    """줄바꿈을 넘지 못하는 본문으로도 끝 조건에 닿는 첫 머리의 시작 위치"""
+    for header_match in self.header.finditer(text):
+      if self.line_end_terminates:
+        return header_match.start()
+
+      newline = text.find("\n", header_match.end())
+      if newline == -1:
+        return header_match.start()
+      terminator_match = self.terminator.search(text, header_match.end())
+      if terminator_match and terminator_match.start() <= newline:
+        return header_match.start()
+    return None
+
+  def matches_start(self, line: str) -> bool:
+    """한 줄짜리 문자열이 머리로 시작하는지 (re.match 와 같음)"""
+    return self.header.match(line) is not None
+
+  def contains(self, text: str) -> bool:
+    return self.header.search(text) is not None
+
+
+ARTICLE_SCANNER = SectionScanner(ARTICLE_HEADER, r'\s*', ARTICLE_TERMINATOR,
+                                 body_ends_before_final_newline=True,
+                                 line_end_terminates=True)
+NUMBER_SCANNER = SectionScanner(NUMBER_HEADER, r'[ \t]*', NUMBER_TERMINATOR,
+                                body_ends_before_final_newline=False,
+                                line_end_terminates=False)
+
+_SCANNERS: Dict[str, SectionScanner] = {
+  ARTICLE_CHUNK_PATTERN: ARTICLE_SCANNER,
+  NUMBER_HEADER_PATTERN: NUMBER_SCANNER
+}
+
+
+def get_section_scanner(pattern: str) -> SectionScanner:
+  return _SCANNERS[pattern]
+
+
+def detect_header_pattern(text: str) -> Optional[str]:
+  """첫 페이지에서 조문(제N조) -> 번호(1.) 순으로 머리 형식을 찾는다."""
+  for pattern, scanner in _SCANNERS.items():
+    if scanner.contains(text):
+      return pattern
+  return None
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+from typing import Any, List, Optional, Set, Tuple
+
+from openai import AsyncAzureOpenAI
+
+from app.schemas.analysis_response import SearchResult
+from app.services.common.llm_retry import call_llm, retry_llm_call
+from app.services.common.prompt_service import \
+  CORRECT_CONTRACT_PROMPT_VERSION, CORRECT_CONTRACTS_BATCH_PROMPT_VERSION, \
+  PromptService, build_contract_input
+from app.services.common.tokenizer import count_tokens
+
+PendingClause = Tuple[str, List[SearchResult], asyncio.Future]
+
+
+class CorrectContractBatcher:
+  """
+  flush_delay 동안 들어온 correct_contract 요청을 모아 입력 토큰 예산(max_batch_tokens)과
+  조항 수(max_batch_size) 안에서 한 번의 요청으로 판정한다.
+  배치 요청은 재시도 없이 한 번만 보내고, 실패했거나 응답에서 빠졌거나 필수 키가 없는 조항은
+  단건 호출(retry_llm_call)로 다시 판정한다.
+  이벤트 루프에 묶이므로 LoopLocal 로 루프마다 하나씩 만든다.
+  배치 판정은 단건 판정과 프롬프트가 달라 판정 캐시에서는 prompt_version 으로 구분한다.
+  """
+
+  # 단건 폴백이 섞여도 배치 모드에서 얻은 판정은 모두 이 버전으로 캐시한다
+  prompt_version = (f"{CORRECT_CONTRACT_PROMPT_VERSION}:"
+                    f"batch{CORRECT_CONTRACTS_BATCH_PROMPT_VERSION}")
+
+  def __init__(self, prompt_service: PromptService, max_batch_size: int,
+      max_batch_tokens: int, flush_delay: float, required_keys: Set[str]):
+    self.prompt_service = prompt_service
+    self.max_batch_size = max_batch_size
+    self.max_batch_tokens = max_batch_tokens
+    self.flush_delay = flush_delay
+    self.required_keys = required_keys
+    self._pending: List[PendingClause] = []
+    self._pending_tokens = 0
+    self._prompt_client: Optional[AsyncAzureOpenAI] = None
+    self._flush_handle: Optional[asyncio.TimerHandle] = None
+    self._running: Set[asyncio.Task] = set()
+
+  async def correct(self, prompt_client: AsyncAzureOpenAI,
+      clause_content: str, search_results: List[SearchResult]) -> Optional[
+    dict[str, Any]]:
+    tokens = await asyncio.to_thread(
+        count_tokens,
+        json.dumps(build_contract_input(clause_content, search_results),
+                   ensure_ascii=False), self.prompt_service.deployment_name)
+    if self._pending and self._pending_tokens + tokens > self.max_batch_tokens:
+      self._flush()
+
+    future = asyncio.get_running_loop().create_future()
+    self._pending.append((clause_content, search_results, future))
+    self._pending_tokens += tokens
+    self._prompt_client = prompt_client
+
+    if len(self._pending) >= self.max_batch_size:
+      self._flush()
+    elif self._flush_handle is None:
+      self._flush_handle = asyncio.get_running_loop().call_later(
+          self.flush_delay, self._flush)
+
+    return await future
+
+  def _flush(self) -> None:
+    if self._flush_handle is not None:
+      self._flush_handle.cancel()
+      self._flush_handle = None
+
+    batch, self._pending, self._pending_tokens = self._pending, [], 0
+    if not batch:
+      return
+
+    task = asyncio.ensure_future(self._run(self._prompt_client, batch))
+    self._running.add(task)
+    task.add_done_callback(self._running.discard)
+
+  async def _run(self, prompt_client: AsyncAzureOpenAI,
+      batch: List[PendingClause]) -> None:
+    verdicts: dict[str, dict[str, Any]] = {}
+    if len(batch) > 1:
+      try:
+        verdicts = await call_llm(
+            self.prompt_service.correct_contracts_batch, prompt_client,
+            [(clause_content, search_results) for
+             clause_content, search_results, _ in batch])
+      except asyncio.TimeoutError:
+        logging.warning(f"[CorrectContractBatcher]: 배치 판정 시간 초과, 단건 호출로 전환")
+      except Exception as e:
+        logging.warning(f"[CorrectContractBatcher]: 배치 판정 실패, 단건 호출로 전환 {e}")
+
+      fallback_count = sum(
+          not self._is_complete(verdicts.get(str(index))) for index in
+          range(len(batch)))
+      logging.info(
+          f"[CorrectContractBatcher]: 배치 {len(batch)}건 중 단건 재판정 {fallback_count}건")
+
+    await asyncio.gather(*[
+      self._resolve(prompt_client, clause_content, search_results, future,
+                    verdicts.get(str(index)))
+      for index, (clause_content, search_results, future) in enumerate(batch)
+    ])
+
+  async def _resolve(self, prompt_client: AsyncAzureOpenAI,
+      clause_content: str, search_results: List[SearchResult],
+      future: asyncio.Future, verdict: Optional[dict[str, Any]]) -> None:
+    if future.done():
+      return
+
+    if not self._is_complete(verdict):
+      try:
+        verdict = await retry_llm_call(
+            self.prompt_service.correct_contract, prompt_client,
+            clause_content, search_results,
+            required_keys=self.required_keys
+        )
+      except Exception as e:
+        if not future.done():
+          future.set_exception(e)
+        return
+
+    if not future.done():
+      future.set_result(verdict)
+
+  def _is_complete(self, verdict: Optional[dict[str, Any]]) -> bool:
+    return isinstance(verdict, dict) and self.required_keys.issubset(
+        verdict.keys())
@@ -0,0 +1,64 @@
+import hashlib
+import re
+import unicodedata
+from typing import List, Optional
+
+import numpy as np
+
+from app.common.sqlite_store import SqliteCache
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+  key TEXT PRIMARY KEY,
+  dtype TEXT NOT NULL,
+  vector BLOB NOT NULL,
+  last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access);
+"""
+
+
+def normalize_text(text: str) -> str:
+  text = unicodedata.normalize("NFC", text)
+  return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class EmbeddingCache(SqliteCache):
+  """
+  (deployment 이름, 정규화된 문장 해시) 기준 임베딩 캐시.
+  워커 간 공유되는 mmap sqlite 파일에 저장하고, 최근 접근 순으로 max_entries 를 넘으면 정리한다.
+  """
+
+  table = "embeddings"
+  value_columns = ("dtype", "vector")
+  eviction_check_interval = 256
+
+  def __init__(self, path: str, max_entries: int, dtype: str = "float32"):
+    super().__init__(path, _SCHEMA, max_entries)
+    self.dtype = np.dtype(dtype)
+
+  @staticmethod
+  def make_key(deployment_name: str, text: str) -> str:
+    digest = hashlib.sha256(
+        f"{deployment_name}\x00{normalize_text(text)}".encode("utf-8"))
+    return digest.hexdigest()
+
+  def get_many(self, deployment_name: str, texts: List[str]) -> List[
+    Optional[List[float]]]:
+    rows = self._lookup(
+        [self.make_key(deployment_name, text) for text in texts])
+    return [
+      np.frombuffer(row[1], dtype=row[0]).astype(np.float32).tolist()
+      if row else None
+      for row in rows
+    ]
+
+  def put_many(self, deployment_name: str, texts: List[str],
+      embeddings: List[List[float]]) -> None:
+    self._store([
+      (self.make_key(deployment_name, text), self.dtype.name,
+       np.asarray(embedding, dtype=self.dtype).tobytes())
+      for text, embedding in zip(texts, embeddings)
+    ])
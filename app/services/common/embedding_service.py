@@ -1,37 +1,91 @@
-from typing import List
+import asyncio
+import logging
+from typing import List, Optional, Tuple, AsyncIterator
 
 import numpy as np
-from openai import AsyncAzureOpenAI, AzureOpenAI
+from openai import AsyncAzureOpenAI
 
 from app.common.decorators import async_measure_time
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
+from app.services.common.embedding_cache import EmbeddingCache
+from app.services.common.rate_limiter import RateLimiter
+from app.services.common.tokenizer import count_tokens_batch
 
 MAX_BATCH_SIZE = 32
 
 
 class EmbeddingService:
-  def __init__(self, deployment_name):
+  def __init__(self, deployment_name,
+      embedding_cache: Optional[EmbeddingCache] = None,
+      max_batch_tokens: int = 16000, max_concurrency: int = 4,
+      rate_limiter: Optional[RateLimiter] = None):
     self.deployment_name = deployment_name
+    self.embedding_cache = embedding_cache
+    self.max_batch_tokens = max_batch_tokens
+    self.max_concurrency = max_concurrency
+    self.rate_limiter = rate_limiter
 
 
   @async_measure_time
   async def batch_embed_texts(self, embedding_client: AsyncAzureOpenAI,
       inputs: List[str]) -> List[List[float]]:
-
-    all_embeddings = []
-    for i in range(0, len(inputs), MAX_BATCH_SIZE):
-      batch = inputs[i:i + MAX_BATCH_SIZE]
-      try:
-        embeddings = await self.embed_texts(embedding_client, batch)
-        all_embeddings.extend(embeddings)
-      except Exception:
-        raise CommonException(ErrorCode.EMBEDDING_FAILED)
+    all_embeddings: List[Optional[List[float]]] = [None] * len(inputs)
+    async for indices, embeddings in self.stream_embed_texts(embedding_client,
+                                                             inputs):
+      for index, embedding in zip(indices, embeddings):
+        all_embeddings[index] = embedding
     return all_embeddings
 
 
+  async def stream_embed_texts(self, embedding_client: AsyncAzureOpenAI,
+      inputs: List[str]) -> AsyncIterator[Tuple[List[int], List[List[float]]]]:
+    """
+    배치가 끝나는 순서대로 (입력 인덱스 목록, 임베딩 목록)을 내보낸다.
+    캐시에 있던 항목은 가장 먼저 한 번에 내보낸다.
+    캐시 조회/저장과 토큰 계산은 공용 이벤트 루프를 막지 않도록 스레드에서 돌린다.
+    """
+    cached, missing_indices = await asyncio.to_thread(self._load_cached,
+                                                      inputs)
+    cached_indices = [i for i, embedding in enumerate(cached) if
+                      embedding is not None]
+    if cached_indices:
+      yield cached_indices, [cached[i] for i in cached_indices]
+
+    semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def run_batch(batch_indices: List[int]) -> Tuple[
+      List[int], List[List[float]]]:
+      batch = [inputs[i] for i in batch_indices]
+      async with semaphore:
+        try:
+          embeddings = await self.embed_texts(embedding_client, batch)
+        except CommonException:
+          raise
+        except Exception:
+          raise CommonException(ErrorCode.EMBEDDING_FAILED)
+      await asyncio.to_thread(self._store, batch, embeddings)
+      return batch_indices, embeddings
+
+    batches = await asyncio.to_thread(self.pack_batches, inputs,
+                                      missing_indices)
+    tasks = [asyncio.ensure_future(run_batch(batch_indices)) for batch_indices
+             in batches]
+    try:
+      for future in asyncio.as_completed(tasks):
+        yield await future
+    finally:
+      for task in tasks:
+        task.cancel()
+
+
   async def embed_texts(self, embedding_client: AsyncAzureOpenAI,
       sentences: List[str]) -> List[List[float]]:
+    if self.rate_limiter and self.rate_limiter.enabled:
+      token_counts = await asyncio.to_thread(count_tokens_batch, sentences,
+                                             self.deployment_name)
+      await self.rate_limiter.acquire(sum(token_counts))
+
     response = await embedding_client.embeddings.create(
         input=sentences,
         model=self.deployment_name,
@@ -45,29 +99,44 @@ class EmbeddingService:
             response.data]
 
 
-  def batch_sync_embed_texts(self, embedding_client: AzureOpenAI,
-      inputs: List[str]) -> List[List[float]]:
-    all_embeddings = []
-    for i in range(0, len(inputs), MAX_BATCH_SIZE):
-      batch = inputs[i:i + MAX_BATCH_SIZE]
-      try:
-        embeddings = self.get_embeddings(embedding_client, batch)
-        all_embeddings.extend(embeddings)
-      except Exception:
-        raise CommonException(ErrorCode.EMBEDDING_FAILED)
-    return all_embeddings
-
-
-  def get_embeddings(self, embedding_client: AzureOpenAI,
-      sentences: List[str]) -> List[List[float]]:
-    response = embedding_client.embeddings.create(
-        input=sentences,
-        model=self.deployment_name,
-        encoding_format="float"
-    )
-
-    if not response or not response.data or not response.data[0].embedding:
-      raise CommonException(ErrorCode.EMBEDDING_FAILED)
-
-    return [np.array(d.embedding, dtype=np.float32).tolist() for d in
-            response.data]
+  def pack_batches(self, inputs: List[str], indices: List[int]) -> List[
+    List[int]]:
+    """
+    요청 1회당 토큰 수(max_batch_tokens)와 입력 개수(MAX_BATCH_SIZE)를 넘지 않도록
+    입력 순서를 유지한 채 배치를 나눈다.
+    """
+    token_counts = count_tokens_batch([inputs[i] for i in indices],
+                                      self.deployment_name)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, tokens in zip(indices, token_counts):
+      if current and (len(current) >= MAX_BATCH_SIZE
+                      or current_tokens + tokens > self.max_batch_tokens):
+        batches.append(current)
+        current, current_tokens = [], 0
+      current.append(index)
+      current_tokens += tokens
+
+    if current:
+      batches.append(current)
+    return batches
+
+
+  def _load_cached(self, inputs: List[str]) -> Tuple[
+    List[Optional[List[float]]], List[int]]:
+    if not self.embedding_cache:
+      return [None] * len(inputs), list(range(len(inputs)))
+
+    cached = self.embedding_cache.get_many(self.deployment_name, inputs)
+    missing_indices = [i for i, embedding in enumerate(cached) if
+                       embedding is None]
+    logging.info(
+        f"[EmbeddingService]: 캐시 적중 {len(inputs) - len(missing_indices)}/{len(inputs)}")
+    return cached, missing_indices
+
+
+  def _store(self, texts: List[str], embeddings: List[List[float]]) -> None:
+    if self.embedding_cache:
+      self.embedding_cache.put_many(self.deployment_name, texts, embeddings)
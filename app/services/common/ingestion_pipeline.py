@@ -1,52 +1,82 @@
-import asyncio
 import re
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Iterator
 
-from app.common.constants import CLAUSE_TEXT_SEPARATOR, ARTICLE_CHUNK_PATTERN, \
-  NUMBER_HEADER_PATTERN
+from app.common.async_runner import run_async, iterate_async
+from app.common.constants import CLAUSE_TEXT_SEPARATOR
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
 from app.common.file_type import FileType
 from app.schemas.analysis_response import RagResult, ClauseData
 from app.schemas.chunk_schema import ClauseChunk
 from app.schemas.chunk_schema import Document
-from app.schemas.chunk_schema import DocumentChunk, DocumentMetadata
+from app.schemas.chunk_schema import DocumentChunk
 from app.schemas.document_request import DocumentRequest
 from app.services.agreement.ocr_service import extract_ocr, \
-  vectorize_and_calculate_similarity_ocr
+  vectorize_and_calculate_similarity_ocr, stream_similarity_results_ocr
 from app.services.agreement.vectorize_similarity import \
-  vectorize_and_calculate_similarity
+  vectorize_and_calculate_similarity, stream_similarity_results
 from app.services.common.chunking_service import \
   chunk_by_article_and_clause_with_page, semantic_chunk_with_overlap, \
-  chunk_by_paragraph
+  chunk_by_paragraph, BoundaryMode
+from app.services.common.clause_parser import detect_header_pattern
+from app.services.common.job_manager import JobProgress
 from app.services.common.pdf_service import preprocess_pdf
+from config.app_config import AppConfig
 
 
-def ocr_service(document_request: DocumentRequest):
-  full_text, all_texts_with_bounding_boxes = extract_ocr(document_request.url)
-
-  documents: List[Document] = [
-    Document(page_content=full_text, metadata=DocumentMetadata(page=1))]
+def ocr_service(document_request: DocumentRequest,
+    progress: Optional[JobProgress] = None):
+  documents, token_index = run_async(
+      extract_ocr(document_request.page_urls()))
 
   document_chunks = chunk_agreement_documents(documents)
   combined_chunks = combine_chunks_by_clause_number(document_chunks)
 
   # 입력값이 다르기에 함수가 분리되어야 함
-  chunks = asyncio.run(
+  chunks = run_async(
       vectorize_and_calculate_similarity_ocr(combined_chunks, document_request,
-                                             all_texts_with_bounding_boxes))
+                                             token_index,
+                                             progress))
 
   return chunks, len(combined_chunks), len(documents)
 
 
-def pdf_agreement_service(document_request: DocumentRequest) -> Tuple[
+def pdf_agreement_service(document_request: DocumentRequest,
+    progress: Optional[JobProgress] = None) -> Tuple[
   List[RagResult], int, int]:
   documents, fitz_document = preprocess_pdf(document_request)
   document_chunks = chunk_agreement_documents(documents)
   combined_chunks = combine_chunks_by_clause_number(document_chunks)
-  chunks = asyncio.run(
+  chunks = run_async(
       vectorize_and_calculate_similarity(combined_chunks, document_request,
-                                         fitz_document))
+                                         fitz_document, progress))
+
+  return chunks, len(combined_chunks), len(documents)
+
+
+def ocr_stream_service(document_request: DocumentRequest) -> Tuple[
+  Iterator[RagResult], int, int]:
+  documents, token_index = run_async(
+      extract_ocr(document_request.page_urls()))
+
+  document_chunks = chunk_agreement_documents(documents)
+  combined_chunks = combine_chunks_by_clause_number(document_chunks)
+
+  chunks = iterate_async(
+      stream_similarity_results_ocr(combined_chunks, document_request,
+                                    token_index))
+
+  return chunks, len(combined_chunks), len(documents)
+
+
+def pdf_agreement_stream_service(document_request: DocumentRequest) -> Tuple[
+  Iterator[RagResult], int, int]:
+  documents, fitz_document = preprocess_pdf(document_request)
+  document_chunks = chunk_agreement_documents(documents)
+  combined_chunks = combine_chunks_by_clause_number(document_chunks)
+  chunks = iterate_async(
+      stream_similarity_results(combined_chunks, document_request,
+                                fitz_document))
 
   return chunks, len(combined_chunks), len(documents)
 
@@ -59,29 +89,25 @@ def extract_file_type(url: str) -> FileType:
     raise CommonException(ErrorCode.UNSUPPORTED_FILE_TYPE)
 
 
-def chunk_standard_texts(documents: List[Document], category: str,
-    page_batch_size: int = 50) -> List[ClauseChunk]:
-  all_clauses = []
-
-  for start in range(0, len(documents), page_batch_size):
-    batch_docs = documents[start:start + page_batch_size]
-    extracted_text = "\n".join(doc.page_content for doc in batch_docs)
-
-    article_chunks = semantic_chunk_with_overlap(extracted_text, similarity_threshold=0.3)
-    all_clauses.extend(article_chunks)
+async def chunk_standard_texts(documents: List[Document],
+    category: str) -> List[ClauseChunk]:
+  """
+  문서 전체를 한 번에 문장 분리/임베딩/경계 계산한다.
+  페이지 묶음 사이에서 청크가 잘리지 않고, 임베딩 배치는 서비스의 동시 실행 한도 안에서 함께 돈다.
+  """
+  extracted_text = "\n".join(doc.page_content for doc in documents)
 
-  return all_clauses
+  return await semantic_chunk_with_overlap(
+      extracted_text, similarity_threshold=0.3,
+      boundary_mode=BoundaryMode(AppConfig.CHUNK_BOUNDARY_MODE),
+      window=AppConfig.CHUNK_BOUNDARY_WINDOW,
+      percentile=AppConfig.CHUNK_BOUNDARY_PERCENTILE)
 
 
 def chunk_agreement_documents(documents: List[Document]) -> List[DocumentChunk]:
-  if re.findall(ARTICLE_CHUNK_PATTERN, documents[0].page_content,
-                flags=re.DOTALL):
-    chunks = chunk_by_article_and_clause_with_page(documents,
-                                                   ARTICLE_CHUNK_PATTERN)
-  elif re.findall(NUMBER_HEADER_PATTERN, documents[0].page_content,
-                  flags=re.DOTALL):
-    chunks = chunk_by_article_and_clause_with_page(documents,
-                                                   NUMBER_HEADER_PATTERN)
+  header_pattern = detect_header_pattern(documents[0].page_content)
+  if header_pattern:
+    chunks = chunk_by_article_and_clause_with_page(documents, header_pattern)
   else:
     chunks = chunk_by_paragraph(documents)
 
@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, is_dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.common.exception.custom_exception import CommonException
+from app.common.exception.error_code import ErrorCode
+
+T = TypeVar("T")
+
+PROGRESS_SAVE_INTERVAL = 0.5
+
+
+class JobStatus(Enum):
+  PENDING = "pending"
+  RUNNING = "running"
+  SUCCESS = "success"
+  FAILURE = "failure"
+
+
+@dataclass
+class Job:
+  job_id: str
+  job_type: str
+  status: JobStatus = JobStatus.PENDING
+  done: int = 0
+  total: int = 0
+  result: Optional[Any] = None
+  error_code: Optional[str] = None
+  error_message: Optional[str] = None
+  created_at: float = field(default_factory=time.time)
+  updated_at: float = field(default_factory=time.time)
+
+  def to_dict(self) -> dict:
+    data = asdict(self)
+    data["status"] = self.status.value
+    return data
+
+  @classmethod
+  def from_dict(cls, data: dict) -> "Job":
+    return cls(**{**data, "status": JobStatus(data["status"])})
+
+
+class JobStore(ABC):
+  @abstractmethod
+  def save(self, job: Job) -> None:
+    pass
+
+  @abstractmethod
+  def get(self, job_id: str) -> Optional[Job]:
+    pass
+
+  def purge_expired(self, ttl_seconds: int) -> None:
+    pass
+
+
+class InMemoryJobStore(JobStore):
+  """요청을 받은 워커 안에서만 조회 가능한 저장소"""
+
+  def __init__(self):
+    self._jobs: Dict[str, dict] = {}
+    self._lock = threading.Lock()
+
+  def save(self, job: Job) -> None:
+    with self._lock:
+      self._jobs[job.job_id] = job.to_dict()
+
+  def get(self, job_id: str) -> Optional[Job]:
+    with self._lock:
+      data = self._jobs.get(job_id)
+    return Job.from_dict(data) if data else None
+
+  def purge_expired(self, ttl_seconds: int) -> None:
+    expired_at = time.time() - ttl_seconds
+    with self._lock:
+      for job_id in [job_id for job_id, data in self._jobs.items() if
+                     data["updated_at"] < expired_at]:
+        del self._jobs[job_id]
+
+
+class FileJobStore(JobStore):
+  """로컬 디스크에 작업별 JSON 파일로 저장해 같은 노드의 모든 워커가 조회할 수 있게 한다."""
+
+  def __init__(self, directory: str):
+    self.directory = directory
+    os.makedirs(directory, exist_ok=True)
+
+  def _path(self, job_id: str) -> str:
+    return os.path.join(self.directory, f"{job_id}.json")
+
+  def save(self, job: Job) -> None:
+    path = self._path(job.job_id)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      json.dump(job.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+  def get(self, job_id: str) -> Optional[Job]:
+    try:
+      uuid.UUID(job_id)
+      with open(self._path(job_id), encoding="utf-8") as f:
+        return Job.from_dict(json.load(f))
+    except (ValueError, FileNotFoundError):
+      return None
+
+  def purge_expired(self, ttl_seconds: int) -> None:
+    expired_at = time.time() - ttl_seconds
+    for entry in os.scandir(self.directory):
+      try:
+        if entry.stat().st_mtime < expired_at:
+          os.remove(entry.path)
+      except FileNotFoundError:
+        continue
+
+
+class JobProgress:
+  """파이프라인이 처리한 조항 수를 작업 상태에 반영한다 (저장은 일정 간격으로만)."""
+
+  def __init__(self, job: Job, store: JobStore):
+    self.job = job
+    self.store = store
+    self._lock = threading.Lock()
+    self._saved_at = 0.0
+
+  def set_total(self, total: int) -> None:
+    with self._lock:
+      self.job.total = total
+      self._save(force=True)
+
+  def advance(self, count: int = 1) -> None:
+    with self._lock:
+      self.job.done += count
+      self._save(force=self.job.done >= self.job.total)
+
+  def _save(self, force: bool) -> None:
+    now = time.time()
+    if force or now - self._saved_at >= PROGRESS_SAVE_INTERVAL:
+      self.job.updated_at = now
+      self.store.save(self.job)
+      self._saved_at = now
+
+
+async def track_progress(awaitable: Awaitable[T],
+    progress: Optional[JobProgress]) -> T:
+  result = await awaitable
+  if progress:
+    progress.advance()
+  return result
+
+
+class JobManager:
+  """
+  분석 파이프라인을 요청 스레드 밖의 제한된 스레드 풀에서 실행하고 상태/결과를 JobStore 에 남긴다.
+  """
+
+  def __init__(self, store: JobStore, max_workers: int, max_pending: int,
+      result_ttl_seconds: int):
+    self.store = store
+    self.max_workers = max_workers
+    self.max_pending = max_pending
+    self.result_ttl_seconds = result_ttl_seconds
+    self._executor: Optional[ThreadPoolExecutor] = None
+    self._executor_pid: Optional[int] = None
+    self._pending = 0
+    self._lock = threading.Lock()
+
+  def submit(self, job_type: str,
+      func: Callable[..., Any], *args) -> Job:
+    with self._lock:
+      if self._pending >= self.max_pending:
+        raise CommonException(ErrorCode.JOB_QUEUE_FULL)
+      self._pending += 1
+
+    # 자리를 먼저 잡아 두고, 실행기에 넘기기 전에 실패하면 돌려놓는다
+    try:
+      self.store.purge_expired(self.result_ttl_seconds)
+
+      job = Job(job_id=str(uuid.uuid4()), job_type=job_type)
+      self.store.save(job)
+      self._get_executor().submit(self._run, job, func, *args)
+    except Exception:
+      with self._lock:
+        self._pending -= 1
+      raise
+    return job
+
+  def get(self, job_id: str) -> Job:
+    job = self.store.get(job_id)
+    if job is None:
+      raise CommonException(ErrorCode.JOB_NOT_FOUND)
+    return job
+
+  def _run(self, job: Job, func: Callable[..., Any], *args) -> None:
+    job.status = JobStatus.RUNNING
+    progress = JobProgress(job, self.store)
+    progress.set_total(job.total)
+
+    try:
+      result = func(*args, progress=progress)
+      job.result = asdict(result) if is_dataclass(result) else result
+      job.status = JobStatus.SUCCESS
+    except CommonException as e:
+      logging.error(f"[JobManager]: {job.job_id} 실패 {e}")
+      job.status = JobStatus.FAILURE
+      job.error_code, job.error_message = e.code, str(e)
+    except Exception as e:
+      logging.exception(f"[JobManager]: {job.job_id} 실패 {e}")
+      job.status = JobStatus.FAILURE
+      job.error_message = str(e)
+    finally:
+      job.updated_at = time.time()
+      self.store.save(job)
+      with self._lock:
+        self._pending -= 1
+
+  def _get_executor(self) -> ThreadPoolExecutor:
+    with self._lock:
+      if self._executor is None or self._executor_pid != os.getpid():
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="analysis-job")
+        self._executor_pid = os.getpid()
+      return self._executor
@@ -2,9 +2,22 @@ import asyncio
 import logging
 from typing import Callable, Coroutine, Any
 
-from app.common.constants import MAX_RETRIES, LLM_TIMEOUT
+from app.common.constants import MAX_RETRIES
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
+from app.common.loop_local import LoopLocal
+from config.app_config import AppConfig
+
+# 워커 전체 LLM 호출(계약서 분석, OCR 분석, 기준문서 데이터 생성) 동시 실행 수 제한
+_llm_semaphore = LoopLocal(
+    lambda: asyncio.Semaphore(AppConfig.LLM_MAX_CONCURRENCY))
+
+
+async def call_llm(func: Callable[..., Coroutine[Any, Any, Any]],
+    *args) -> Any:
+  """재시도 없이 한 번만 호출한다. 워커 전체 LLM 동시 실행 수 제한은 그대로 따른다."""
+  async with _llm_semaphore.get():
+    return await func(*args)
 
 
 async def retry_llm_call(
@@ -13,7 +26,7 @@ async def retry_llm_call(
     required_keys: set | None = None) -> dict | None:
   for attempt in range(1, MAX_RETRIES + 1):
     try:
-      result = await asyncio.wait_for(func(*args), timeout=LLM_TIMEOUT)
+      result = await call_llm(func, *args)
       if isinstance(result, dict) or required_keys.issubset(result.keys()):
         return result
       logging.warning(
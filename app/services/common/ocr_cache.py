@@ -0,0 +1,40 @@
+import hashlib
+import json
+from typing import Optional
+
+from app.common.sqlite_store import SqliteCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_results (
+  key TEXT PRIMARY KEY,
+  result TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ocr_results_last_access ON ocr_results(last_access);
+"""
+
+
+class OcrCache(SqliteCache):
+  """
+  CLOVA OCR 응답 캐시. 키는 (원본 이미지 sha256, 전처리 버전) 이라
+  같은 사진을 다시 올리면 전처리와 OCR 요청을 모두 건너뛴다.
+  """
+
+  table = "ocr_results"
+  value_columns = ("result",)
+
+  def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+    super().__init__(path, _SCHEMA, max_entries, ttl_seconds)
+
+  @staticmethod
+  def make_key(image_data: bytes, preprocess_version: str) -> str:
+    digest = hashlib.sha256(image_data).hexdigest()
+    return f"{preprocess_version}:{digest}"
+
+  def get(self, key: str) -> Optional[dict]:
+    row = self._lookup([key])[0]
+    return json.loads(row[0]) if row else None
+
+  def put(self, key: str, result: dict) -> None:
+    self._store([(key, json.dumps(result, ensure_ascii=False))])
@@ -1,5 +1,9 @@
-import io
-from typing import List, Tuple
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
 import fitz
 
@@ -7,50 +11,86 @@ from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
 from app.schemas.chunk_schema import Document, DocumentMetadata
 from app.schemas.document_request import DocumentRequest
-from app.services.common.s3_service import s3_get_object
+from app.services.common.s3_service import s3_download_to_file
+from config.app_config import AppConfig
+from workers.pdf_text_extractor import extract_page_texts
 
+# 워커 하나에 돌아가는 페이지 구간 수 (구간별 페이지 수 편차를 줄이기 위함)
+RANGES_PER_WORKER = 2
 
-def convert_to_bytes_io(s3_stream: bytes) -> io.BytesIO:
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def open_pdf_document(pdf_path: str) -> fitz.Document:
   try:
-    return io.BytesIO(s3_stream)
+    return fitz.open(pdf_path, filetype="pdf")
   except Exception:
-    raise CommonException(ErrorCode.CONVERT_TO_IO_FAILED)
+    raise CommonException(ErrorCode.FILE_FORMAT_INVALID)
 
 
-def extract_fitz_document_from_pdf_io(
-    pdf_bytes_io: io.BytesIO) -> fitz.Document:
+def parse_pdf_to_documents(doc: fitz.Document,
+    pdf_path: Optional[str] = None) -> List[Document]:
+  """
+  페이지 텍스트를 Document 로 바꾼다. 파일 경로가 있고 페이지 수가 PDF_PARALLEL_MIN_PAGES 이상이면
+  같은 파일을 페이지 구간별로 프로세스 풀에서 나눠 읽고 페이지 순서대로 합친다.
+  """
   try:
-    return fitz.open(stream=pdf_bytes_io, filetype="pdf")
+    if pdf_path and AppConfig.PDF_PARSE_WORKERS > 1 and \
+        doc.page_count >= AppConfig.PDF_PARALLEL_MIN_PAGES:
+      page_texts = extract_page_texts_parallel(pdf_path, doc.page_count)
+    else:
+      page_texts = [(page.number + 1, page.get_text("text").strip()) for page
+                    in doc]
   except Exception:
-    raise CommonException(ErrorCode.FILE_FORMAT_INVALID)
+    raise CommonException(ErrorCode.PDF_LOAD_FAILED)
 
+  return [
+    Document(page_content=text, metadata=DocumentMetadata(page=page))
+    for page, text in page_texts if text
+  ]
 
-def parse_pdf_to_documents(doc: fitz.Document) -> List[Document]:
-  documents: List[Document] = []
 
-  try:
-    for page in doc:
-      text = page.get_text("text").strip()
+def extract_page_texts_parallel(pdf_path: str, page_count: int) -> List[
+  Tuple[int, str]]:
+  range_count = AppConfig.PDF_PARSE_WORKERS * RANGES_PER_WORKER
+  range_size = max(1, math.ceil(page_count / range_count))
 
-      if text:
-        meta = DocumentMetadata(page=page.number + 1)
-        documents.append(Document(
-            page_content=text,
-            metadata=meta
-        ))
+  futures = [
+    get_pdf_pool().submit(extract_page_texts, pdf_path, start,
+                          min(start + range_size, page_count))
+    for start in range(0, page_count, range_size)
+  ]
+  return [page_text for future in futures for page_text in future.result()]
 
-  except Exception:
-    raise CommonException(ErrorCode.PDF_LOAD_FAILED)
 
-  return documents
+def get_pdf_pool() -> ProcessPoolExecutor:
+  """
+  워커 프로세스마다 한 번만 만드는 페이지 추출용 프로세스 풀.
+  요청 스레드가 도는 프로세스에서 fork 하지 않도록 spawn 으로 띄우고,
+  자식이 app 패키지를 import 하지 않도록 workers 모듈의 함수만 넘긴다.
+  """
+  global _pool, _pool_pid
+
+  with _pool_lock:
+    if _pool is None or _pool_pid != os.getpid():
+      _pool = ProcessPoolExecutor(
+          max_workers=AppConfig.PDF_PARSE_WORKERS,
+          mp_context=multiprocessing.get_context("spawn"))
+      _pool_pid = os.getpid()
+    return _pool
 
 
 def preprocess_pdf(document_request: DocumentRequest) -> Tuple[
   List[Document], fitz.Document]:
-  s3_stream = s3_get_object(document_request.url)
-  pdf_bytes_io = convert_to_bytes_io(s3_stream)
-  fitz_document = extract_fitz_document_from_pdf_io(pdf_bytes_io)
-  documents = parse_pdf_to_documents(fitz_document)
+  pdf_path = s3_download_to_file(document_request.url)
+  try:
+    fitz_document = open_pdf_document(pdf_path)
+    documents = parse_pdf_to_documents(fitz_document, pdf_path)
+  finally:
+    # 열린 문서는 파일 핸들을 쥐고 있으므로 파싱이 끝나면 경로는 지워도 된다
+    os.unlink(pdf_path)
 
   if not documents:
     raise CommonException(ErrorCode.NO_TEXTS_EXTRACTED)
@@ -1,40 +1,105 @@
+import asyncio
 import json
 import logging
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Tuple
 
 from openai import AsyncAzureOpenAI
 
 import re
 
+from app.common.constants import LLM_TIMEOUT
 from app.schemas.analysis_response import SearchResult
+from app.services.common.rate_limiter import RateLimiter
+from app.services.common.tokenizer import count_tokens_batch
 
+# correct_contract 프롬프트를 수정하면 올려서 판정 캐시를 무효화
+CORRECT_CONTRACT_PROMPT_VERSION = "1"
 
-def clean_incorrect_part(text: str) -> str:
-  particles = ['은', '는', '이', '가', '을', '를', '의', '에', '에서', '보다', '로', '과',
-               '와']
+# make_additional_data 프롬프트를 수정하면 올려서 표준 문서 재적재 시 payload 를 다시 만들게 함
+ADDITIONAL_DATA_PROMPT_VERSION = "1"
+
+# 배치 판정 시 조항 하나당 허용하는 응답 토큰 수 / 첫 조항 이후 조항 하나당 늘리는 타임아웃(초)
+BATCH_MAX_TOKENS_PER_CLAUSE = 700
+BATCH_TIMEOUT_PER_CLAUSE = 15.0
+# correct_contracts_batch 프롬프트를 수정하면 올려서 배치 판정 캐시를 무효화
+CORRECT_CONTRACTS_BATCH_PROMPT_VERSION = "1"
+
+CORRECT_CONTRACT_DEVELOPER_PROMPT = """
+                너는 한국에서 계약서 및 법률 문서를 검토하는 최고의 변호사야.
+                계약서에서 법률 위반 가능성이 있는 부분을 정확히 찾아내고,
+                그 부분을 교정할 때 법적인 근거를 설명해야 해.
+                특히 계약서 내 용어 사용이 오해를 일으킬 수 있는 경우, 
+                관련 법률 용어의 정의와 해석 차이를 기준으로 다시 설명해 줘야 해.
+              """
+
+CORRECT_CONTRACT_GUIDELINES = """[특히 고려해야 할 사항]
+            - 계약서 문장이 **법적 요건에 맞지 않거나**, **근로자에게 일방적으로 불리한 조건**을 담고 있다면 반드시 교정이 필요합니다.
+            - 계약서 문장에서 전문가와 비전문가 사이에 해석 차이를 유발할 수 있는 용어가 등장하는 경우, 그 의미 차이와 오해의 가능성을 `proofText`에 설명해 주세요.
+            - 해당 표현이 법률적 정의와 다르게 사용되어 문장이 잘못 해석될 수 있는 위험이 있다면, 그 위험성과 의미의 차이를 `proofText`에 해설해 주세요.
+            - 문법적 오류보다는 **내용의 법적 타당성**에 집중해 주세요.
+            - `proofText`에는 어떤 입력 변수명도 그대로 포함시키지 마세요.
+            - 계약서 문장의 위배 확률이 높아 보인다면 `violation_score`를 높게 반환해 주세요.
+            
+            - 일반적으로 소정근로시간은 매일 09시부터 18시까지로 한다(휴게시간 제외 총 8시간, 1주간 40시간 이내로 함)
+            - 초과되는 근무시간은 최대 주 12시간으로 하며, 연장근로 포함 총 근무시간은 주 52시간을 초과할 수 없습니다.
+            
+            - 2025년 시급은 10,030원 이상이여야만 합니다.
+            - 근무시간이 주15시간 이상인 경우에만, 주휴수당이 별도로 지급되어야 하고 근무시간이 주 15시간 이하라면 급여에 포함이 아닌 지급되지 않아
+            - 하자 담보 책임기간은 IT 업계에서 일반적으로 3개월~1년으로 합니다. 최소 1개월 이상이어야 합니다.
+            - 일반적인 지체배상금요율은 0.005% ~ 0.3% 입니다. 반드시 1천분의 3 이하가 되어야합니다.
+
+    
+            [입력 데이터 설명]
+            - clause_content: 계약서 문장
+            - proof_text: 법률 문서의 문장 목록
+            - incorrect_text: 법률 위반할 가능성이 있는 예시 문장 
+            - corrected_text: 법률 위반 가능성이 있는 예시 문장을 올바르게 수정한 문장 목록
+            - term_explanation: 핵심 용어의 전문적 의미와 비전문가가 오해할 수 있는 해석 차이를 설명한 해설
+
+            [violation_score 판단 기준 및 생성 형식]
+            - 반드시 "0.000"부터 "1.000" 사이의 **소수점 셋째 자리까지의 문자열(float 형식)**로 출력하세요.
+            - `0.750`, `0.500`과 같이 끝자리가 `0`인 고정된 패턴은 피하고 다양성 있는 float 값을 사용해 주세요.
+            - 소수점 셋째자리까지 0이 아닌 숫자를 넣어주세요
+            - 무작위가 아닌, 문장의 위반 가능성을 기반으로 신중하게 결정해 주세요."""
 
-  for particle in particles:
-    # 마침표, 느낌표, 물음표 다음엔 조사 결합을 시도하지 않도록 예외 처리
-    # 단어 + 공백 + 조사 이고, 그 앞에 구두점이 **없을 때만** 붙이기
-    pattern = rf'(?<![\.!?])([가-힣])\s+{particle}(?=[\s\.,\)\"\'\”\’\]]|$)'
-    replacement = rf'\1{particle}'
-    text = re.sub(pattern, replacement, text)
+CORRECT_CONTRACT_OUTPUT_FIELDS = """"correctedText": "계약서의 문장을 올바르게 교정한 문장",
+              "proofText": "입력 데이터를 참조해 잘못된 포인트와 그 이유",
+              "violation_score": "0.000 ~ 1.000 사이의 소수점 셋째 자리까지의 문자열"
+                                  
+              "incorrectPart": clause_content에서 문제가 되는 부분 길이는 최대 단어 5개까지 똑같이 반환해주세요.
+                                     
+                                     아래 규칙을 지켜주세요
+                                     조사를 지우지 말고 완전한 문장을 반환하세요
+                                     clause_content 문장과 일치하지 않고 부분 내용이여야 합니다.
+                                     띄어쓰기, 온점, 반점, 괄호 등은 clause_content와 정확히 일치해야 합니다."""
+
+
+# 한글 + 공백 + 조사 이고, 그 앞에 구두점이 **없을 때만** 붙이기 (마침표, 느낌표, 물음표 다음엔 조사 결합 안 함)
+# 긴 조사를 먼저 두고, 조사 뒤는 경계여야 하므로 조사 하나짜리와 겹치지 않는다
+_DETACHED_PARTICLE_PATTERN = re.compile(
+    r'(?<![\.!?][가-힣])(?<=[가-힣])\s+'
+    r'(에서|보다|은|는|이|가|을|를|의|에|로|과|와)'
+    r'(?=[\s\.,\)\"\'\”\’\]]|$)')
+_MULTI_SPACE_PATTERN = re.compile(r'\s{2,}')
+
+
+def clean_incorrect_part(text: str) -> str:
+  text = _DETACHED_PARTICLE_PATTERN.sub(r'\1', text)
 
   # 2칸 이상 공백은 1칸으로 줄이기
-  text = re.sub(r'\s{2,}', ' ', text)
+  return _MULTI_SPACE_PATTERN.sub(' ', text)
 
-  return text
 
+def strip_markdown_block(response_text: str) -> str:
+  if response_text.startswith("```json") and response_text.endswith("```"):
+    return response_text[7:-3].strip()
+  elif response_text.startswith("```") and response_text.endswith("```"):
+    return response_text[3:-3].strip()
+  return response_text
 
-def clean_markdown_block(response_text: str) -> dict | None:
-  response_text_cleaned = response_text
 
-  if response_text_cleaned.startswith(
-      "```json") and response_text_cleaned.endswith("```"):
-    response_text_cleaned = response_text_cleaned[7:-3].strip()
-  elif response_text_cleaned.startswith(
-      "```") and response_text_cleaned.endswith("```"):
-    response_text_cleaned = response_text_cleaned[3:-3].strip()
+def clean_markdown_block(response_text: str) -> dict | None:
+  response_text_cleaned = strip_markdown_block(response_text)
 
   try:
     parsed_response = json.loads(response_text_cleaned)
@@ -52,15 +117,79 @@ def clean_markdown_block(response_text: str) -> dict | None:
       f"[PromptService]: jsonDecodeError: {e} | raw response: {response_text_cleaned}")
     return None
 
+
+def parse_batch_verdicts(response_text: str) -> dict[str, dict[str, Any]]:
+  """배치 응답(JSON 배열)을 clauseId 별 판정으로 바꾼다. 형식이 맞지 않는 항목은 버린다."""
+  response_text_cleaned = strip_markdown_block(response_text)
+
+  try:
+    parsed_response = json.loads(response_text_cleaned)
+  except json.JSONDecodeError as e:
+    logging.error(
+      f"[PromptService]: 배치 응답 jsonDecodeError: {e} | raw response: {response_text_cleaned}")
+    return {}
+
+  if isinstance(parsed_response, dict):
+    parsed_response = next((value for value in parsed_response.values() if
+                            isinstance(value, list)), [])
+
+  verdicts = {}
+  for item in parsed_response:
+    if not isinstance(item, dict) or "clauseId" not in item:
+      continue
+    clause_id = str(item.pop("clauseId"))
+    if isinstance(item.get("incorrectPart"), str):
+      item["incorrectPart"] = clean_incorrect_part(item["incorrectPart"])
+    verdicts[clause_id] = item
+  return verdicts
+
+
+def build_contract_input(clause_content: str,
+    search_results: List[SearchResult]) -> dict[str, Any]:
+  clause_content = clause_content.replace("\n", " ")
+  clause_content = clause_content.replace("+", "")
+  clause_content = clause_content.replace("!!!", " ")
+
+  return {
+    "clause_content": clause_content,
+    "proof_text": [item.proof_text for item in search_results],
+    "incorrect_text": [item.incorrect_text for item in search_results],
+    "corrected_text": [item.corrected_text for item in search_results],
+    "term_explanation": [item.term_explanation for item in search_results]
+  }
+
+
 class PromptService:
-  def __init__(self, deployment_name):
+  def __init__(self, deployment_name,
+      rate_limiter: Optional[RateLimiter] = None):
     self.deployment_name = deployment_name
+    self.rate_limiter = rate_limiter
+
+
+  async def _create_completion(self, prompt_client: AsyncAzureOpenAI,
+      messages: List[dict], timeout: float = LLM_TIMEOUT, **kwargs):
+    # 쿼터 대기는 타임아웃에 포함하지 않음
+    if self.rate_limiter and self.rate_limiter.enabled:
+      prompt_tokens = sum(await asyncio.to_thread(
+          count_tokens_batch, [message["content"] for message in messages],
+          self.deployment_name))
+      await self.rate_limiter.acquire(
+          prompt_tokens + kwargs.get("max_tokens", 0))
+
+    return await asyncio.wait_for(
+        prompt_client.chat.completions.create(
+            model=self.deployment_name,
+            messages=messages,
+            **kwargs
+        ),
+        timeout=timeout
+    )
 
 
   async def make_additional_data(self, prompt_client: AsyncAzureOpenAI,
       clause_content: str) -> Any | None:
-    response = await prompt_client.chat.completions.create(
-        model=self.deployment_name,
+    response = await self._create_completion(
+        prompt_client,
         messages=[
           {
             "role": "system",
@@ -112,32 +241,14 @@ class PromptService:
   async def correct_contract(self, prompt_client: AsyncAzureOpenAI,
       clause_content: str, search_results: List[SearchResult]) -> Optional[
     dict[str, Any]]:
+    input_data = build_contract_input(clause_content, search_results)
 
-    clause_content = clause_content.replace("\n", " ")
-    clause_content = clause_content.replace("+", "")
-    clause_content = clause_content.replace("!!!", " ")
-
-    input_data = {
-      "clause_content": clause_content,
-      "proof_text": [item.proof_text for item in search_results],
-      "incorrect_text": [item.incorrect_text for item in search_results],
-      "corrected_text": [item.corrected_text for item in search_results],
-      "term_explanation": [item.term_explanation for item in search_results]
-    }
-
-    response = await prompt_client.chat.completions.create(
-        model=self.deployment_name,
+    response = await self._create_completion(
+        prompt_client,
         messages=[
           {
             "role": "developer",
-            "content":
-              f"""
-                너는 한국에서 계약서 및 법률 문서를 검토하는 최고의 변호사야.
-                계약서에서 법률 위반 가능성이 있는 부분을 정확히 찾아내고,
-                그 부분을 교정할 때 법적인 근거를 설명해야 해.
-                특히 계약서 내 용어 사용이 오해를 일으킬 수 있는 경우, 
-                관련 법률 용어의 정의와 해석 차이를 기준으로 다시 설명해 줘야 해.
-              """
+            "content": CORRECT_CONTRACT_DEVELOPER_PROMPT
           },
           {
             "role": "user",
@@ -145,49 +256,12 @@ class PromptService:
               f"""
             입력 데이터를 참고해서 계약서 문장에서 부당한 문구가 있는지 찾아 수정해주세요.
 
-            [특히 고려해야 할 사항]
-            - 계약서 문장이 **법적 요건에 맞지 않거나**, **근로자에게 일방적으로 불리한 조건**을 담고 있다면 반드시 교정이 필요합니다.
-            - 계약서 문장에서 전문가와 비전문가 사이에 해석 차이를 유발할 수 있는 용어가 등장하는 경우, 그 의미 차이와 오해의 가능성을 `proofText`에 설명해 주세요.
-            - 해당 표현이 법률적 정의와 다르게 사용되어 문장이 잘못 해석될 수 있는 위험이 있다면, 그 위험성과 의미의 차이를 `proofText`에 해설해 주세요.
-            - 문법적 오류보다는 **내용의 법적 타당성**에 집중해 주세요.
-            - `proofText`에는 어떤 입력 변수명도 그대로 포함시키지 마세요.
-            - 계약서 문장의 위배 확률이 높아 보인다면 `violation_score`를 높게 반환해 주세요.
-            
-            - 일반적으로 소정근로시간은 매일 09시부터 18시까지로 한다(휴게시간 제외 총 8시간, 1주간 40시간 이내로 함)
-            - 초과되는 근무시간은 최대 주 12시간으로 하며, 연장근로 포함 총 근무시간은 주 52시간을 초과할 수 없습니다.
-            
-            - 2025년 시급은 10,030원 이상이여야만 합니다.
-            - 근무시간이 주15시간 이상인 경우에만, 주휴수당이 별도로 지급되어야 하고 근무시간이 주 15시간 이하라면 급여에 포함이 아닌 지급되지 않아
-            - 하자 담보 책임기간은 IT 업계에서 일반적으로 3개월~1년으로 합니다. 최소 1개월 이상이어야 합니다.
-            - 일반적인 지체배상금요율은 0.005% ~ 0.3% 입니다. 반드시 1천분의 3 이하가 되어야합니다.
-
-    
-            [입력 데이터 설명]
-            - clause_content: 계약서 문장
-            - proof_text: 법률 문서의 문장 목록
-            - incorrect_text: 법률 위반할 가능성이 있는 예시 문장 
-            - corrected_text: 법률 위반 가능성이 있는 예시 문장을 올바르게 수정한 문장 목록
-            - term_explanation: 핵심 용어의 전문적 의미와 비전문가가 오해할 수 있는 해석 차이를 설명한 해설
-
-            [violation_score 판단 기준 및 생성 형식]
-            - 반드시 "0.000"부터 "1.000" 사이의 **소수점 셋째 자리까지의 문자열(float 형식)**로 출력하세요.
-            - `0.750`, `0.500`과 같이 끝자리가 `0`인 고정된 패턴은 피하고 다양성 있는 float 값을 사용해 주세요.
-            - 소수점 셋째자리까지 0이 아닌 숫자를 넣어주세요
-            - 무작위가 아닌, 문장의 위반 가능성을 기반으로 신중하게 결정해 주세요.
+            {CORRECT_CONTRACT_GUIDELINES}
 
             [출력 형식]
             출력은 dict 형태이며, value 값은 반드시 문자열(string) 형태로 출력할 것:
             {{
-              "correctedText": "계약서의 문장을 올바르게 교정한 문장",
-              "proofText": "입력 데이터를 참조해 잘못된 포인트와 그 이유",
-              "violation_score": "0.000 ~ 1.000 사이의 소수점 셋째 자리까지의 문자열"
-                                  
-              "incorrectPart": clause_content에서 문제가 되는 부분 길이는 최대 단어 5개까지 똑같이 반환해주세요.
-                                     
-                                     아래 규칙을 지켜주세요
-                                     조사를 지우지 말고 완전한 문장을 반환하세요
-                                     clause_content 문장과 일치하지 않고 부분 내용이여야 합니다.
-                                     띄어쓰기, 온점, 반점, 괄호 등은 clause_content와 정확히 일치해야 합니다.
+              {CORRECT_CONTRACT_OUTPUT_FIELDS}
             }}
             
             [입력 데이터]
@@ -200,4 +274,59 @@ class PromptService:
     )
 
     response_text = response.choices[0].message.content
-    return clean_markdown_block(response_text)
\ No newline at end of file
+    return clean_markdown_block(response_text)
+
+
+  async def correct_contracts_batch(self, prompt_client: AsyncAzureOpenAI,
+      clauses: List[Tuple[str, List[SearchResult]]]) -> dict[
+    str, dict[str, Any]]:
+    """
+    여러 조항을 한 번의 요청으로 판정한다. 조항마다 자기 검색 결과를 함께 보내고
+    clause_id(입력 순서) 별 판정을 돌려준다.
+    """
+    input_data = [
+      {"clause_id": str(index),
+       **build_contract_input(clause_content, search_results)}
+      for index, (clause_content, search_results) in enumerate(clauses)
+    ]
+
+    response = await self._create_completion(
+        prompt_client,
+        messages=[
+          {
+            "role": "developer",
+            "content": CORRECT_CONTRACT_DEVELOPER_PROMPT
+          },
+          {
+            "role": "user",
+            "content":
+              f"""
+            입력 데이터의 각 항목마다 계약서 문장에서 부당한 문구가 있는지 찾아 수정해주세요.
+            각 항목은 같은 항목에 들어 있는 참고 자료만 사용해 서로 독립적으로 판단해 주세요.
+
+            {CORRECT_CONTRACT_GUIDELINES}
+
+            [배치 입력 설명]
+            - clause_id: 항목 식별자이며, 응답의 clauseId 에 그대로 넣어 주세요.
+
+            [출력 형식]
+            출력은 입력 항목마다 dict 하나씩을 담은 JSON 배열이며, value 값은 반드시 문자열(string) 형태로 출력할 것:
+            [
+              {{
+              "clauseId": "입력 항목의 clause_id",
+              {CORRECT_CONTRACT_OUTPUT_FIELDS}
+              }}
+            ]
+
+            [입력 데이터]
+            {json.dumps(input_data, ensure_ascii=False, indent=2)}
+          """
+          }
+        ],
+        temperature=0.1,
+        max_tokens=BATCH_MAX_TOKENS_PER_CLAUSE * len(clauses),
+        timeout=LLM_TIMEOUT + BATCH_TIMEOUT_PER_CLAUSE * (len(clauses) - 1),
+    )
+
+    response_text = response.choices[0].message.content
+    return parse_batch_verdicts(response_text)
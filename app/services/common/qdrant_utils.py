@@ -1,43 +1,74 @@
+from typing import Dict, List, Optional, Set
+
 from httpx import ConnectTimeout
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http.exceptions import ResponseHandlingException
 from qdrant_client.http.models import VectorParams, Distance
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from qdrant_client.models import Filter, FieldCondition, MatchValue, \
+  PointIdsList
 
 from app.blueprints.standard.standard_exception import StandardException
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
 
+VECTOR_SIZE = 1536
+SCROLL_PAGE_SIZE = 1000
+
+# 워커 내 컬렉션 메타데이터 캐시 (컬렉션 이름 -> 벡터 설정)
+_collection_cache: Dict[str, VectorParams] = {}
+
 
 async def ensure_qdrant_collection(qd_client: AsyncQdrantClient,
     collection_name: str) -> None:
+  if await get_collection_params(qd_client, collection_name) is None:
+    await create_qdrant_collection(qd_client, collection_name)
+
+
+async def get_collection_params(qd_client: AsyncQdrantClient,
+    collection_name: str) -> Optional[VectorParams]:
+  if collection_name in _collection_cache:
+    return _collection_cache[collection_name]
+
   try:
-    exists = await qd_client.collection_exists(collection_name=collection_name)
-    if not exists:
-      await create_qdrant_collection(qd_client, collection_name)
+    if not await qd_client.collection_exists(collection_name=collection_name):
+      return None
+    collection_info = await qd_client.get_collection(collection_name)
 
   except (ConnectTimeout, ResponseHandlingException):
     raise CommonException(ErrorCode.QDRANT_NOT_STARTED)
 
+  params = collection_info.config.params.vectors
+  _collection_cache[collection_name] = params
+  return params
+
+
+def forget_collection(collection_name: str) -> None:
+  _collection_cache.pop(collection_name, None)
+
 
 async def create_qdrant_collection(qd_client: AsyncQdrantClient,
     collection_name: str):
+  vectors_config = VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE)
   try:
-    return await qd_client.create_collection(
+    result = await qd_client.create_collection(
         collection_name=collection_name,
-        vectors_config=VectorParams(size=1536, distance=Distance.COSINE)
+        vectors_config=vectors_config
     )
   except (ConnectTimeout, ResponseHandlingException):
     raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
 
+  _collection_cache[collection_name] = vectors_config
+  return result
+
 
 async def upload_points_to_qdrant(qd_client: AsyncQdrantClient, collection_name,
-    points):
+    points, wait: bool = True):
   if not points:
     raise StandardException(ErrorCode.NO_POINTS_GENERATED)
 
   try:
-    await qd_client.upsert(collection_name=collection_name, points=points)
+    await qd_client.upsert(collection_name=collection_name, points=points,
+                           wait=wait)
   except (ConnectTimeout, ResponseHandlingException):
     raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
 
@@ -59,4 +90,44 @@ async def point_exists(qd_client: AsyncQdrantClient, collection_name: str,
   except (ConnectTimeout, ResponseHandlingException):
     raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
 
-  return bool(points)
\ No newline at end of file
+  return bool(points)
+
+
+async def scroll_point_ids(qd_client: AsyncQdrantClient, collection_name: str,
+    standard_id: int) -> Set[str]:
+  filter_condition = Filter(
+      must=[
+        FieldCondition(key="standard_id", match=MatchValue(value=standard_id))]
+  )
+
+  point_ids: Set[str] = set()
+  offset = None
+  try:
+    while True:
+      points, offset = await qd_client.scroll(
+          collection_name=collection_name,
+          scroll_filter=filter_condition,
+          limit=SCROLL_PAGE_SIZE,
+          offset=offset,
+          with_payload=False,
+          with_vectors=False
+      )
+      point_ids.update(str(point.id) for point in points)
+      if offset is None:
+        return point_ids
+  except (ConnectTimeout, ResponseHandlingException):
+    raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
+
+
+async def delete_points(qd_client: AsyncQdrantClient, collection_name: str,
+    point_ids: List[str]) -> None:
+  if not point_ids:
+    return
+
+  try:
+    await qd_client.delete(
+        collection_name=collection_name,
+        points_selector=PointIdsList(points=point_ids)
+    )
+  except (ConnectTimeout, ResponseHandlingException):
+    raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
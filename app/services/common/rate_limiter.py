@@ -0,0 +1,109 @@
+import asyncio
+import fcntl
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+# (남은 요청 수, 남은 토큰 수, 마지막 보충 시각)
+_STATE = struct.Struct("ddd")
+MIN_WAIT_SECONDS = 0.05
+
+
+class RateLimiter:
+  """
+  Azure OpenAI 배포의 분당 요청 수(RPM) / 분당 토큰 수(TPM) 쿼터를 지키기 위한 토큰 버킷.
+  버킷 상태는 로컬 파일에 두고 flock 으로 잠가서 같은 노드의 gunicorn 워커들이 함께 쓴다.
+  """
+
+  def __init__(self, name: str, requests_per_minute: int,
+      tokens_per_minute: int, state_dir: str):
+    self.name = name
+    self.requests_per_minute = requests_per_minute
+    self.tokens_per_minute = tokens_per_minute
+    self.path = os.path.join(state_dir, f"{name}.bucket")
+    self._fd = None
+    self._pid = None
+    self._lock = threading.Lock()
+
+  @property
+  def enabled(self) -> bool:
+    return self.requests_per_minute > 0 and self.tokens_per_minute > 0
+
+  async def acquire(self, tokens: int) -> None:
+    if not self.enabled:
+      return
+    # flock 대기가 공용 이벤트 루프를 막지 않도록 스레드에서 잡는다
+    while (wait := await asyncio.to_thread(self._try_acquire, tokens)) > 0:
+      await asyncio.sleep(wait)
+
+  def usage(self) -> dict:
+    if not self.enabled:
+      return {"enabled": False}
+
+    with self._locked_state() as state:
+      available_requests, available_tokens, _ = state
+    return {
+      "enabled": True,
+      "requests_per_minute": self.requests_per_minute,
+      "tokens_per_minute": self.tokens_per_minute,
+      "available_requests": int(available_requests),
+      "available_tokens": int(available_tokens),
+      "request_usage_ratio": round(
+          1 - available_requests / self.requests_per_minute, 4),
+      "token_usage_ratio": round(
+          1 - available_tokens / self.tokens_per_minute, 4)
+    }
+
+  def _try_acquire(self, tokens: int) -> float:
+    # 쿼터보다 큰 요청은 버킷이 가득 찼을 때 보내도록 상한을 둔다
+    tokens = min(tokens, self.tokens_per_minute)
+
+    with self._locked_state() as state:
+      available_requests, available_tokens, refilled_at = state
+      if available_requests >= 1 and available_tokens >= tokens:
+        state[0] = available_requests - 1
+        state[1] = available_tokens - tokens
+        return 0.0
+
+    request_wait = (1 - available_requests) * 60 / self.requests_per_minute
+    token_wait = (tokens - available_tokens) * 60 / self.tokens_per_minute
+    return max(request_wait, token_wait, MIN_WAIT_SECONDS)
+
+  @contextmanager
+  def _locked_state(self) -> Iterator[List[float]]:
+    with self._lock:
+      fd = self._open()
+      fcntl.flock(fd, fcntl.LOCK_EX)
+      try:
+        state = self._refill(os.pread(fd, _STATE.size, 0))
+        yield state
+        os.pwrite(fd, _STATE.pack(*state), 0)
+      finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+  def _refill(self, raw: bytes) -> List[float]:
+    now = time.time()
+    if len(raw) < _STATE.size:
+      return [float(self.requests_per_minute), float(self.tokens_per_minute),
+              now]
+
+    available_requests, available_tokens, refilled_at = _STATE.unpack(raw)
+    elapsed = max(now - refilled_at, 0.0)
+    return [
+      min(self.requests_per_minute,
+          available_requests + elapsed * self.requests_per_minute / 60),
+      min(self.tokens_per_minute,
+          available_tokens + elapsed * self.tokens_per_minute / 60),
+      now
+    ]
+
+  def _open(self) -> int:
+    pid = os.getpid()
+    if self._fd is None or self._pid != pid:
+      os.makedirs(os.path.dirname(self.path), exist_ok=True)
+      self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+      self._pid = pid
+    return self._fd
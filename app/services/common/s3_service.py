@@ -1,16 +1,30 @@
 import os
+import tempfile
+from typing import Callable, FrozenSet
 
 import boto3
 import requests
 from botocore.response import StreamingBody
 from dotenv import load_dotenv
 
+from app.clients.http_clients import get_download_session
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
+from config.app_config import AppConfig
 from config.s3_config import AWS_S3_BUCKET_REGION
 
 load_dotenv()
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# S3 업로드 시 Content-Type 을 지정하지 않으면 octet-stream 으로 내려온다
+OCTET_STREAM_TYPES = frozenset({"application/octet-stream",
+                                "binary/octet-stream"})
+PDF_CONTENT_TYPES = frozenset({"application/pdf"}) | OCTET_STREAM_TYPES
+IMAGE_CONTENT_TYPES = frozenset(
+    {"image/png", "image/jpeg", "image/jpg"}) | OCTET_STREAM_TYPES
+
+
 def s3_connection():
   try:
     return boto3.client(
@@ -25,15 +39,70 @@ def s3_connection():
 s3 = s3_connection()
 
 
-def s3_get_object(url: str) -> bytes:
+def s3_get_object(url: str,
+    content_types: FrozenSet[str] = IMAGE_CONTENT_TYPES,
+    max_bytes: int = AppConfig.IMAGE_DOWNLOAD_MAX_BYTES) -> bytes:
+  buffer = bytearray()
+  stream_s3_object(url, buffer.extend, content_types, max_bytes)
+  return bytes(buffer)
+
+
+def s3_download_to_file(url: str, suffix: str = ".pdf",
+    content_types: FrozenSet[str] = PDF_CONTENT_TYPES,
+    max_bytes: int = AppConfig.DOWNLOAD_MAX_BYTES) -> str:
+  """
+  객체를 메모리에 모으지 않고 임시 파일로 바로 내려받아 경로를 돌려준다.
+  파일 삭제는 호출한 쪽에서 한다.
+  """
+  os.makedirs(AppConfig.DOWNLOAD_TEMP_DIR, exist_ok=True)
+  fd, path = tempfile.mkstemp(suffix=suffix, dir=AppConfig.DOWNLOAD_TEMP_DIR)
+
   try:
-    response = requests.get(url, timeout=10)
+    with os.fdopen(fd, "wb") as f:
+      stream_s3_object(url, f.write, content_types, max_bytes)
+  except BaseException:
+    os.unlink(path)
+    raise
+  return path
+
+
+def stream_s3_object(url: str, write: Callable[[bytes], object],
+    content_types: FrozenSet[str], max_bytes: int) -> int:
+  try:
+    with get_download_session().get(
+        url, stream=True,
+        timeout=(AppConfig.DOWNLOAD_CONNECT_TIMEOUT,
+                 AppConfig.DOWNLOAD_READ_TIMEOUT)) as response:
+      if response.status_code != 200:
+        raise CommonException(ErrorCode.FILE_LOAD_FAILED)
+
+      content_type = response.headers.get("Content-Type", "")
+      if content_type.split(";")[0].strip().lower() not in content_types:
+        raise CommonException(ErrorCode.INVALID_CONTENT_TYPE)
+
+      # 압축 전송이면 Content-Length 가 풀린 크기와 달라 비교하지 않는다
+      content_length = response.headers.get("Content-Length")
+      expected_size = int(content_length) if content_length and not \
+        response.headers.get("Content-Encoding") else None
+      if expected_size is not None and expected_size > max_bytes:
+        raise CommonException(ErrorCode.FILE_TOO_LARGE)
 
-    if response.status_code != 200:
-      raise CommonException(ErrorCode.FILE_LOAD_FAILED)
+      received = 0
+      for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+        received += len(chunk)
+        if received > max_bytes:
+          raise CommonException(ErrorCode.FILE_TOO_LARGE)
+        write(chunk)
 
-    return response.content
+      if received == 0 or (
+          expected_size is not None and received != expected_size):
+        raise CommonException(ErrorCode.S3_STREAM_READ_FAILED)
+      return received
 
+  except CommonException:
+    raise
+  except requests.RequestException:
+    raise CommonException(ErrorCode.FILE_LOAD_FAILED)
   except Exception:
     raise CommonException(ErrorCode.S3_CLIENT_ERROR)
 
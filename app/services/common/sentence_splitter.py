@@ -0,0 +1,52 @@
+import re
+from typing import List
+
+# 한 번의 finditer 로 괄호 깊이와 문장 경계 후보를 함께 훑는다
+_SEGMENT_PATTERN = re.compile(
+    r"""
+    (?P<open>[(\[{【「『〔《〈])
+    | (?P<close>[)\]}】」』〕》〉])
+    # 한글 두 글자 이상 뒤의 마침표/물음표/느낌표 (다. / 한다. / 함. 등). "가." 같은 항목 기호는 제외된다
+    | (?P<end>(?<=[가-힣][가-힣])[.?!](?=\s|$))
+    # 빈 줄은 문단 경계
+    | (?P<paragraph>\n[ \t]*\n)
+    # 줄 첫머리의 조문/번호 항목: 제1조, 1., 1), (1), 가.
+    | (?P<item>^[ \t]*(?=제\s*\d+\s*조|\d{1,2}[.)]\s|\(\d{1,2}\)|[가-하][.)]\s))
+    # 항 번호 ①~⑳ (①항 같은 본문 속 인용은 제외)
+    | (?P<marker>[①-⑳](?!\s*항))
+    """,
+    re.MULTILINE | re.VERBOSE)
+
+
+def split_into_sentences(text: str) -> List[str]:
+  """
+  한국어 법령/계약서용 규칙 기반 문장 분리.
+  "~다." 같은 종결 뒤, 빈 줄, 조문·번호 항목과 ①항 번호 앞에서 끊고 괄호 안에서는 끊지 않는다.
+  """
+  sentences = []
+  start = 0
+  depth = 0
+
+  def cut(position: int) -> None:
+    nonlocal start
+    sentence = text[start:position].strip()
+    if sentence:
+      sentences.append(sentence)
+    start = position
+
+  for match in _SEGMENT_PATTERN.finditer(text):
+    kind = match.lastgroup
+    if kind == "open":
+      depth += 1
+    elif kind == "close":
+      depth = max(0, depth - 1)
+    elif kind == "end":
+      if depth == 0:
+        cut(match.end())
+    else:
+      # 항목 경계에서는 닫히지 않은 괄호(OCR/추출 오류)가 다음 문장으로 번지지 않도록 깊이를 초기화
+      depth = 0
+      cut(match.start())
+
+  cut(len(text))
+  return sentences
@@ -0,0 +1,196 @@
+import argparse
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.common.sqlite_store import SharedSqliteStore
+
+CUTOFF_REFRESH_INTERVAL = 60.0
+CUTOFF_MARGIN = 0.01
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdict_history (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  category TEXT NOT NULL,
+  top_score REAL NOT NULL,
+  is_violation INTEGER NOT NULL,
+  created_at REAL NOT NULL,
+  weight REAL NOT NULL DEFAULT 1.0
+);
+CREATE INDEX IF NOT EXISTS idx_verdict_history_category ON verdict_history(category);
+CREATE TABLE IF NOT EXISTS cutoffs (
+  category TEXT PRIMARY KEY,
+  cutoff REAL NOT NULL,
+  sample_count INTEGER NOT NULL,
+  recall REAL NOT NULL,
+  skip_rate REAL NOT NULL,
+  updated_at REAL NOT NULL
+);
+"""
+
+
+class SimilarityGate:
+  """
+  검색된 기준 조항과의 최고 유사도가 카테고리별 cutoff 보다 낮은 조항은 LLM 없이 위반 없음으로 처리한다.
+  cutoff 는 LLM 판정 이력(최고 유사도, 위반 여부)에서 위반 재현율(target_recall)을 지키는 가장 높은 값으로 정한다.
+  생략 대상 중 audit_rate 비율만 LLM 으로 보내므로 cutoff 아래 구간의 이력은 표본이다.
+  이 감사 표본은 1 / audit_rate 가중치로 저장해, 보정 시 생략된 조항까지 대표하도록 한다.
+  """
+
+  def __init__(self, path: str, target_recall: float, min_samples: int,
+      audit_rate: float):
+    self.store = SharedSqliteStore(path, _SCHEMA)
+    self.target_recall = target_recall
+    self.min_samples = min_samples
+    self.audit_rate = audit_rate
+    self.checked = 0
+    self.skipped = 0
+    self._cutoffs: Dict[str, Optional[float]] = {}
+    self._loaded_at = 0.0
+    self._lock = threading.Lock()
+
+  def sample_weight(self, category: str, top_score: float) -> Optional[float]:
+    """
+    LLM 을 생략할 조항이면 None, 아니면 그 판정을 이력에 남길 때의 가중치.
+    cutoff 아래인데 감사 표본으로 뽑힌 조항은 1 / audit_rate 를 돌려준다.
+    """
+    cutoff = self.cutoff(category)
+    below_cutoff = cutoff is not None and top_score < cutoff
+    skip = below_cutoff and random.random() >= self.audit_rate
+
+    with self._lock:
+      self.checked += 1
+      self.skipped += skip
+
+    if skip:
+      return None
+    return 1.0 / self.audit_rate if below_cutoff else 1.0
+
+  def cutoff(self, category: str) -> Optional[float]:
+    now = time.time()
+    with self._lock:
+      if now - self._loaded_at < CUTOFF_REFRESH_INTERVAL:
+        return self._cutoffs.get(category)
+
+    try:
+      rows = self.store.connection().execute(
+          "SELECT category, cutoff FROM cutoffs").fetchall()
+    except sqlite3.Error as e:
+      logging.warning(f"[SimilarityGate]: cutoff 조회 실패 {e}")
+      rows = []
+
+    with self._lock:
+      self._cutoffs = dict(rows)
+      self._loaded_at = now
+      return self._cutoffs.get(category)
+
+  def record(self, category: str, top_score: float,
+      is_violation: bool, weight: float = 1.0) -> None:
+    try:
+      self.store.connection().execute(
+          "INSERT INTO verdict_history "
+          "(category, top_score, is_violation, created_at, weight) "
+          "VALUES (?, ?, ?, ?, ?)",
+          (category, top_score, int(is_violation), time.time(), weight))
+    except sqlite3.Error as e:
+      logging.warning(f"[SimilarityGate]: 판정 이력 저장 실패 {e}")
+
+  def calibrate(self, category: str) -> Optional[dict]:
+    """판정 이력으로 cutoff 를 다시 계산해 저장한다. 이력이 부족하면 None."""
+    rows: List[Tuple[float, int, float]] = self.store.connection().execute(
+        "SELECT top_score, is_violation, weight FROM verdict_history "
+        "WHERE category = ?", (category,)).fetchall()
+
+    violations = sorted((score, weight) for score, is_violation, weight in rows
+                        if is_violation)
+    if len(rows) < self.min_samples or not violations:
+      logging.info(
+          f"[SimilarityGate]: {category} 이력 부족 "
+          f"(전체 {len(rows)}, 위반 {len(violations)})")
+      return None
+
+    # 감사 표본 가중치를 반영해, 놓쳐도 되는 위반 비중만큼 아래쪽을 버린 지점에서 여유를 둔다
+    violation_weight = sum(weight for _, weight in violations)
+    allowed_misses = violation_weight * (1 - self.target_recall)
+    cutoff = violations[-1][0] - CUTOFF_MARGIN
+    missed = 0.0
+    for score, weight in violations:
+      missed += weight
+      if missed > allowed_misses:
+        cutoff = score - CUTOFF_MARGIN
+        break
+
+    recall = sum(weight for score, weight in violations
+                 if score >= cutoff) / violation_weight
+    skip_rate = sum(weight for score, _, weight in rows if score < cutoff) / \
+                sum(weight for _, _, weight in rows)
+    calibration = {
+      "category": category,
+      "cutoff": round(cutoff, 4),
+      "sample_count": len(rows),
+      "recall": round(recall, 4),
+      "skip_rate": round(skip_rate, 4)
+    }
+
+    self.store.connection().execute(
+        "INSERT OR REPLACE INTO cutoffs "
+        "(category, cutoff, sample_count, recall, skip_rate, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (category, cutoff, len(rows), recall, skip_rate, time.time()))
+    with self._lock:
+      self._loaded_at = 0.0
+    return calibration
+
+  def categories(self) -> List[str]:
+    return [row[0] for row in self.store.connection().execute(
+        "SELECT DISTINCT category FROM verdict_history").fetchall()]
+
+  def reset(self, category: str) -> None:
+    self.store.connection().execute("DELETE FROM cutoffs WHERE category = ?",
+                               (category,))
+    with self._lock:
+      self._loaded_at = 0.0
+
+  def stats(self) -> dict:
+    with self._lock:
+      checked, skipped = self.checked, self.skipped
+    return {
+      "checked": checked,
+      "skipped": skipped,
+      "skip_rate": round(skipped / checked, 4) if checked else 0.0
+    }
+
+
+def main() -> None:
+  from config.app_config import AppConfig
+
+  parser = argparse.ArgumentParser(
+      description="LLM 판정 이력으로 카테고리별 유사도 cutoff 를 보정한다.")
+  parser.add_argument("categories", nargs="*",
+                      help="보정할 카테고리 (생략하면 이력이 있는 전체)")
+  parser.add_argument("--recall", type=float,
+                      default=AppConfig.SIMILARITY_GATE_TARGET_RECALL)
+  parser.add_argument("--min-samples", type=int,
+                      default=AppConfig.SIMILARITY_GATE_MIN_SAMPLES)
+  parser.add_argument("--reset", action="store_true",
+                      help="cutoff 를 지워 게이트를 끈다")
+  args = parser.parse_args()
+
+  gate = SimilarityGate(AppConfig.SIMILARITY_GATE_PATH, args.recall,
+                        args.min_samples, AppConfig.SIMILARITY_GATE_AUDIT_RATE)
+  for category in args.categories or gate.categories():
+    if args.reset:
+      gate.reset(category)
+      print(json.dumps({"category": category, "cutoff": None}))
+    else:
+      print(json.dumps(gate.calibrate(category) or {"category": category,
+                                                    "cutoff": None},
+                       ensure_ascii=False))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+
+FALLBACK_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+  try:
+    return tiktoken.encoding_for_model(model)
+  except KeyError:
+    # tiktoken 이 모르는 최신 배포 이름은 기본 인코딩으로 추정
+    return tiktoken.get_encoding(FALLBACK_ENCODING)
+
+
+def count_tokens(text: str, model: str) -> int:
+  return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
+def count_tokens_batch(texts: List[str], model: str) -> List[int]:
+  if not texts:
+    return []
+  encoded = get_encoding(model).encode_batch(texts, disallowed_special=())
+  return [len(tokens) for tokens in encoded]
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import logging
+import sqlite3
+from typing import List, Optional
+
+from app.common.sqlite_store import SqliteCache
+from app.schemas.analysis_response import SearchResult
+from app.services.common.embedding_cache import normalize_text
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+  key TEXT PRIMARY KEY,
+  category TEXT NOT NULL,
+  verdict TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_verdicts_last_access ON verdicts(last_access);
+CREATE INDEX IF NOT EXISTS idx_verdicts_category ON verdicts(category);
+"""
+
+
+class VerdictCache(SqliteCache):
+  """
+  correct_contract 의 파싱된 판정 결과 캐시.
+  키는 (정규화된 조항, 검색된 기준 포인트 ID/내용, 프롬프트 버전, 모델 이름) 이고
+  카테고리(컬렉션) 단위로 무효화한다.
+  """
+
+  table = "verdicts"
+  value_columns = ("category", "verdict")
+
+  def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+    super().__init__(path, _SCHEMA, max_entries, ttl_seconds)
+
+  @staticmethod
+  def make_key(clause_content: str, search_results: List[SearchResult],
+      prompt_version: str, model_name: str) -> str:
+    references = [
+      [result.point_id, result.proof_text, result.incorrect_text,
+       result.corrected_text, result.term_explanation]
+      for result in search_results
+    ]
+    raw = json.dumps(
+        [normalize_text(clause_content), references, prompt_version,
+         model_name], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+  def get(self, key: str) -> Optional[dict]:
+    row = self._lookup([key])[0]
+    return json.loads(row[1]) if row else None
+
+  def put(self, key: str, category: str, verdict: dict) -> None:
+    self._store(
+        [(key, category, json.dumps(verdict, ensure_ascii=False))])
+
+  def invalidate_category(self, category: str) -> None:
+    try:
+      deleted = self.store.connection().execute(
+          "DELETE FROM verdicts WHERE category = ?", (category,)).rowcount
+      logging.info(f"[VerdictCache]: {category} 판정 캐시 {deleted}건 무효화")
+    except sqlite3.Error as e:
+      logging.warning(f"[VerdictCache]: 캐시 무효화 실패 {e}")
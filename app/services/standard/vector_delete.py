@@ -7,15 +7,15 @@ from app.blueprints.standard.standard_exception import StandardException
 from app.clients.qdrant_client import get_qdrant_client
 from app.common.exception.custom_exception import CommonException
 from app.common.exception.error_code import ErrorCode
+from app.containers.service_container import verdict_cache
 from app.schemas.success_code import SuccessCode
-from app.services.common.qdrant_utils import point_exists
+from app.services.common.qdrant_utils import point_exists, \
+  get_collection_params, forget_collection
 
 
 async def delete_by_standard_id(standard_id: int, collection_name: str) -> SuccessCode:
   qd_client = get_qdrant_client()
-  try:
-    await qd_client.get_collection(collection_name)
-  except UnexpectedResponse:
+  if await get_collection_params(qd_client, collection_name) is None:
     raise StandardException(ErrorCode.COLLECTION_NOT_FOUND)
 
   if not await point_exists(qd_client, collection_name, standard_id):
@@ -32,9 +32,12 @@ async def delete_by_standard_id(standard_id: int, collection_name: str) -> Succe
       points_selector=filter_condition
     )
   except UnexpectedResponse:
+    forget_collection(collection_name)
     raise StandardException(ErrorCode.DELETE_FAIL)
 
   except (ConnectTimeout, ResponseHandlingException):
     raise CommonException(ErrorCode.QDRANT_CONNECTION_TIMEOUT)
 
+  if verdict_cache:
+    verdict_cache.invalidate_category(collection_name)
   return SuccessCode.DELETE_SUCCESS
\ No newline at end of file
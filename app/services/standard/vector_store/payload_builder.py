@@ -1,23 +1,45 @@
+import hashlib
+import uuid
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from app.containers.service_container import prompt_service
+from app.containers.service_container import prompt_service, \
+  embedding_service
 from app.models.vector import VectorPayload
+from app.schemas.chunk_schema import ClauseChunk
+from app.services.common.embedding_cache import normalize_text
 from app.services.common.llm_retry import retry_llm_call
+from app.services.common.prompt_service import ADDITIONAL_DATA_PROMPT_VERSION
 
 STANDARD_LLM_REQUIRED_KEYS = {"incorrect_text", "corrected_text",
                               "term_explanation"}
 
-async def make_clause_payload(prompt_client, article, pdf_request,
-    semaphore) -> VectorPayload | None:
-  async with semaphore:
-    result = await retry_llm_call(
-        prompt_service.make_additional_data,
-        prompt_client, article,
-        required_keys=STANDARD_LLM_REQUIRED_KEYS
-    )
-    if not result:
-      return None
+# 포인트 ID 는 (기준 문서 ID, 조항 내용 해시, 같은 내용 중 순번)으로 정해지므로 같은 조항은 재적재해도 같은 ID 가 된다
+POINT_ID_NAMESPACE = uuid.UUID("5b6f1c7e-2d4a-4e3b-9a1f-8c0d2e7b6a45")
+
+
+def clause_content_hash(chunk: ClauseChunk) -> str:
+  # 프롬프트나 임베딩 배포가 바뀌면 해시가 달라져 기존 포인트를 모두 다시 만든다
+  raw = (f"{ADDITIONAL_DATA_PROMPT_VERSION}:{embedding_service.deployment_name}:"
+         f"{normalize_text(chunk.clause_content)}")
+  return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def clause_point_id(standard_id: int, content_hash: str,
+    occurrence: int = 0) -> str:
+  return str(uuid.uuid5(POINT_ID_NAMESPACE,
+                        f"{standard_id}:{content_hash}:{occurrence}"))
+
+
+async def make_clause_payload(prompt_client, article,
+    pdf_request, content_hash: str = "") -> VectorPayload | None:
+  result = await retry_llm_call(
+      prompt_service.make_additional_data,
+      prompt_client, article,
+      required_keys=STANDARD_LLM_REQUIRED_KEYS
+  )
+  if not result:
+    return None
 
   korea_time = datetime.now(ZoneInfo("Asia/Seoul"))
   return VectorPayload(
@@ -26,5 +48,6 @@ async def make_clause_payload(prompt_client, article, pdf_request,
       proof_text=article.clause_content,
       corrected_text=result.get("corrected_text") or "",
       term_explanation=result.get("term_explanation") or "",
-      created_at=korea_time.strftime("%Y-%m-%d %H:%M:%S")
+      created_at=korea_time.strftime("%Y-%m-%d %H:%M:%S"),
+      content_hash=content_hash
   )
\ No newline at end of file
@@ -1,59 +1,293 @@
 import asyncio
-import uuid
-from typing import List
+import logging
+from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import PointStruct
 
+from app.blueprints.standard.standard_exception import StandardException
 from app.clients.openai_clients import get_prompt_async_client, \
   get_embedding_async_client
 from app.clients.qdrant_client import get_qdrant_client
 from app.common.decorators import async_measure_time
-from app.containers.service_container import embedding_service
+from app.common.exception.custom_exception import CommonException
+from app.common.exception.error_code import ErrorCode
+from app.containers.service_container import embedding_service, \
+  verdict_cache
+from app.models.vector import VectorPayload
 from app.schemas.chunk_schema import ClauseChunk
 from app.schemas.document_request import DocumentRequest
+from app.services.common.job_manager import JobProgress, track_progress
 from app.services.common.qdrant_utils import ensure_qdrant_collection, \
-  upload_points_to_qdrant, point_exists
-from app.services.standard.vector_delete import delete_by_standard_id
+  upload_points_to_qdrant, scroll_point_ids, delete_points
 from app.services.standard.vector_store.payload_builder import \
-  make_clause_payload
+  make_clause_payload, clause_content_hash, clause_point_id
+from config.app_config import AppConfig
+
+
+UPSERT_RETRIES = 3
+UPSERT_RETRY_DELAY = 1.0
+# 임베딩 배치를 채우려고 다음 payload 를 기다리는 최대 시간(초)
+EMBED_BATCH_LINGER = 0.2
+
+_DONE = object()
 
 
 @async_measure_time
 async def vectorize_and_save(chunks: List[ClauseChunk],
-    pdf_request: DocumentRequest) -> None:
+    pdf_request: DocumentRequest,
+    progress: Optional[JobProgress] = None) -> None:
+  """
+  payload 생성(LLM) -> 임베딩 -> Qdrant upsert 를 크기가 정해진 대기열로 잇는다.
+  앞 단계 결과가 나오는 대로 다음 단계가 처리하므로 전체 임베딩/포인트를 한꺼번에 들고 있지 않는다.
+  포인트 ID 가 조항 내용 해시로 정해지므로 재적재 시 이미 저장된 조항은 건너뛰고,
+  새 조항만 처리한 뒤 문서에서 사라진 조항의 포인트만 지운다.
+  """
   qd_client = get_qdrant_client()
-  await ensure_qdrant_collection(qd_client, pdf_request.categoryName)
+  collection_name = pdf_request.categoryName
+  await ensure_qdrant_collection(qd_client, collection_name)
+
+  desired = fingerprint_chunks(chunks, pdf_request.id)
+  existing_ids = await scroll_point_ids(qd_client, collection_name,
+                                        pdf_request.id)
+  new_chunks = [(point_id, content_hash, chunk) for
+                point_id, (content_hash, chunk) in desired.items() if
+                point_id not in existing_ids]
+  stale_ids = list(existing_ids - desired.keys())
+  logging.info(
+      f"[vectorize_and_save]: {collection_name}/{pdf_request.id} 조항 {len(desired)}개 "
+      f"중 신규 {len(new_chunks)}개, 재사용 {len(desired) - len(new_chunks)}개, "
+      f"삭제 {len(stale_ids)}개")
+
+  if progress:
+    progress.set_total(len(new_chunks))
+  saved_count = await run_pipeline(qd_client, collection_name, new_chunks,
+                                   pdf_request, progress)
+
+  if new_chunks and not saved_count:
+    raise StandardException(ErrorCode.NO_POINTS_GENERATED)
+
+  # 새 포인트가 모두 저장된 뒤에만 지워야 중간에 실패해도 기존 조항이 남는다.
+  # payload/임베딩 생성에 실패해 일부만 저장됐다면 이전 조항을 남겨 두고 다음 재적재에서 마저 처리한다
+  if saved_count < len(new_chunks):
+    logging.warning(
+        f"[vectorize_and_save]: {collection_name}/{pdf_request.id} 신규 조항 "
+        f"{len(new_chunks) - saved_count}개 저장 실패, 이전 포인트 {len(stale_ids)}개 유지")
+    stale_ids = []
+  await delete_points(qd_client, collection_name, stale_ids)
+
+  if verdict_cache and (saved_count or stale_ids):
+    verdict_cache.invalidate_category(collection_name)
+
+
+def fingerprint_chunks(chunks: List[ClauseChunk], standard_id: int) -> Dict[
+  str, Tuple[str, ClauseChunk]]:
+  """
+  포인트 ID -> (내용 해시, 조항). 내용이 같은 조항이 여러 번 나오면 순번을 붙여 각각 포인트로 둔다.
+  """
+  desired: Dict[str, Tuple[str, ClauseChunk]] = {}
+  occurrences: Dict[str, int] = {}
+  for chunk in chunks:
+    content_hash = clause_content_hash(chunk)
+    occurrence = occurrences.get(content_hash, 0)
+    occurrences[content_hash] = occurrence + 1
+    desired[clause_point_id(standard_id, content_hash, occurrence)] = (
+      content_hash, chunk)
+  return desired
+
+
+async def run_pipeline(qd_client: AsyncQdrantClient, collection_name: str,
+    new_chunks: List[Tuple[str, str, ClauseChunk]],
+    pdf_request: DocumentRequest, progress: Optional[JobProgress]) -> int:
+  if not new_chunks:
+    return 0
+
+  embed_workers = max(1, AppConfig.EMBEDDING_MAX_CONCURRENCY)
+  payload_queue: asyncio.Queue = asyncio.Queue(
+      maxsize=AppConfig.INGEST_EMBED_BATCH_SIZE * AppConfig.INGEST_QUEUE_SIZE)
+  point_queue: asyncio.Queue = asyncio.Queue(
+      maxsize=AppConfig.INGEST_QUEUE_SIZE)
+
+  async def embed_stage() -> None:
+    await asyncio.gather(*[embed_payloads(payload_queue, point_queue) for _ in
+                           range(embed_workers)])
+    await point_queue.put(_DONE)
+
+  stages = [
+    asyncio.ensure_future(
+        produce_payloads(new_chunks, pdf_request, payload_queue, embed_workers,
+                         progress)),
+    asyncio.ensure_future(embed_stage()),
+    asyncio.ensure_future(upsert_points(qd_client, collection_name,
+                                        point_queue))
+  ]
+  try:
+    _, _, saved_count = await asyncio.gather(*stages)
+  finally:
+    for stage in stages:
+      stage.cancel()
+  return saved_count
+
+
+async def produce_payloads(chunks: List[Tuple[str, str, ClauseChunk]],
+    pdf_request: DocumentRequest, payload_queue: asyncio.Queue,
+    consumer_count: int, progress: Optional[JobProgress]) -> None:
+  """
+  조항별 payload 를 동시에 만들되 실행 중인 작업은 대기열 크기(payload_queue.maxsize)까지만 둔다.
+  임베딩 단계가 밀려 대기열이 차면 새 LLM 호출도 시작하지 않는다.
+  """
+  prompt_client = get_prompt_async_client()
+  window = payload_queue.maxsize or len(chunks) or 1
+  remaining = iter(chunks)
+  running: Set[asyncio.Future] = set()
+
+  def start_next() -> None:
+    chunk = next(remaining, None)
+    if chunk is not None:
+      point_id, content_hash, article = chunk
+      running.add(asyncio.ensure_future(track_progress(
+          make_payload(prompt_client, point_id, content_hash, article,
+                       pdf_request), progress)))
+
+  try:
+    for _ in range(window):
+      start_next()
+    while running:
+      done, _ = await asyncio.wait(running,
+                                   return_when=asyncio.FIRST_COMPLETED)
+      for future in done:
+        running.discard(future)
+        item = future.result()
+        if item:
+          await payload_queue.put(item)
+        start_next()
+  finally:
+    for task in running:
+      task.cancel()
+
+  for _ in range(consumer_count):
+    await payload_queue.put(_DONE)
+
+
+async def make_payload(prompt_client, point_id: str, content_hash: str,
+    article: ClauseChunk, pdf_request: DocumentRequest) -> Optional[
+  Tuple[str, VectorPayload]]:
+  payload = await make_clause_payload(prompt_client, article, pdf_request,
+                                      content_hash)
+  return (point_id, payload) if payload else None
+
+
+async def embed_payloads(payload_queue: asyncio.Queue,
+    point_queue: asyncio.Queue) -> None:
+  embedding_client = get_embedding_async_client()
+
+  finished = False
+  while not finished:
+    batch, finished = await collect_batch(payload_queue,
+                                          AppConfig.INGEST_EMBED_BATCH_SIZE)
+    if not batch:
+      continue
+
+    embeddings = await embedding_service.batch_embed_texts(
+        embedding_client, [payload.embedding_input() for _, payload in batch])
+
+    # payload 와 임베딩을 같은 순서로 묶어 두므로 건너뛴 항목 때문에 어긋나지 않는다
+    points = [build_point(point_id, payload, vector) for
+              (point_id, payload), vector in zip(batch, embeddings) if
+              is_valid_vector(vector)]
+    if points:
+      await point_queue.put(points)
+
+
+async def collect_batch(queue: asyncio.Queue, size: int) -> Tuple[
+  list, bool]:
+  """첫 항목은 올 때까지, 나머지는 EMBED_BATCH_LINGER 동안만 기다려 모은다. (배치, 종료 여부)"""
+  item = await queue.get()
+  if item is _DONE:
+    return [], True
+
+  batch = [item]
+  loop = asyncio.get_running_loop()
+  deadline = loop.time() + EMBED_BATCH_LINGER
+  while len(batch) < size:
+    timeout = deadline - loop.time()
+    if timeout <= 0:
+      break
+    try:
+      item = await asyncio.wait_for(queue.get(), timeout)
+    except asyncio.TimeoutError:
+      break
+    if item is _DONE:
+      return batch, True
+    batch.append(item)
+  return batch, False
+
+
+async def upsert_points(qd_client: AsyncQdrantClient, collection_name: str,
+    point_queue: asyncio.Queue) -> int:
+  """
+  포인트를 INGEST_UPSERT_BATCH_SIZE 단위로 wait=False upsert 한다.
+  실패한 배치는 건너뛰고 나머지를 계속 저장한 뒤 마지막에 한 번 더 시도한다.
+  """
+  batch_size = AppConfig.INGEST_UPSERT_BATCH_SIZE
+  buffer: List[PointStruct] = []
+  failed_batches: List[List[PointStruct]] = []
+  saved_count = 0
+
+  async def flush(points: List[PointStruct]) -> None:
+    nonlocal saved_count
+    if await upsert_batch(qd_client, collection_name, points):
+      saved_count += len(points)
+    else:
+      failed_batches.append(points)
+
+  while True:
+    points = await point_queue.get()
+    if points is _DONE:
+      break
+    buffer.extend(points)
+    while len(buffer) >= batch_size:
+      await flush(buffer[:batch_size])
+      buffer = buffer[batch_size:]
+
+  if buffer:
+    await flush(buffer)
 
-  semaphore = asyncio.Semaphore(5)
-  async with get_prompt_async_client() as prompt_client:
-    results = await asyncio.gather(*[
-      make_clause_payload(prompt_client, article, pdf_request, semaphore)
-      for article in chunks
-    ])
+  for points in failed_batches:
+    if await upsert_batch(qd_client, collection_name, points):
+      saved_count += len(points)
+    else:
+      logging.error(
+          f"[upsert_points]: {collection_name} 포인트 {len(points)}개 저장 최종 실패")
+      raise CommonException(ErrorCode.QDRANT_UPSERT_FAILED)
 
-  embedding_inputs = [point.embedding_input() for point in results if point]
+  return saved_count
 
-  async with get_embedding_async_client() as embedding_client:
-    embeddings = await embedding_service.batch_embed_texts(embedding_client,
-                                                           embedding_inputs)
 
-  final_points = []
-  for payload, vector in zip(results, embeddings):
-    if vector and isinstance(vector, list) and not any(
-        np.isnan(x) for x in vector):
-      final_points.append(build_point(payload, vector))
+async def upsert_batch(qd_client: AsyncQdrantClient, collection_name: str,
+    points: List[PointStruct]) -> bool:
+  for attempt in range(1, UPSERT_RETRIES + 1):
+    try:
+      await upload_points_to_qdrant(qd_client, collection_name, points,
+                                    wait=False)
+      return True
+    except Exception as e:
+      logging.warning(
+          f"[upsert_batch]: 재요청 발생 {attempt}/{UPSERT_RETRIES} {e}")
+      if attempt < UPSERT_RETRIES:
+        await asyncio.sleep(UPSERT_RETRY_DELAY * attempt)
+  return False
 
-  if await point_exists(qd_client, pdf_request.categoryName, pdf_request.id):
-    await delete_by_standard_id(pdf_request.id, pdf_request.categoryName)
 
-  await upload_points_to_qdrant(qd_client, pdf_request.categoryName,
-                                final_points)
+def is_valid_vector(vector: Optional[List[float]]) -> bool:
+  return bool(vector) and bool(np.isfinite(vector).all())
 
 
-def build_point(payload, embedding: List[float]) -> PointStruct:
+def build_point(point_id: str, payload: VectorPayload,
+    embedding: List[float]) -> PointStruct:
   return PointStruct(
-      id=str(uuid.uuid4()),
+      id=point_id,
       vector=embedding,
       payload=payload.to_dict()
   )
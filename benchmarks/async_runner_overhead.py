@@ -0,0 +1,39 @@
+"""
+요청마다 asyncio.run 으로 루프를 만들 때와 워커 공용 루프(run_async)에 넘길 때의 호출당 오버헤드 비교.
+
+  python -m benchmarks.async_runner_overhead --calls 2000
+"""
+import argparse
+import asyncio
+import time
+
+from app.common.async_runner import run_async
+
+
+async def noop() -> None:
+  await asyncio.sleep(0)
+
+
+def measure(label: str, call, calls: int) -> None:
+  started = time.perf_counter()
+  for _ in range(calls):
+    call()
+  elapsed = time.perf_counter() - started
+  print(f"{label:<12} {elapsed / calls * 1e6:8.1f} us/call ({calls} calls)")
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(
+      description="asyncio.run 과 run_async 의 호출당 오버헤드를 비교한다.")
+  parser.add_argument("--calls", type=int, default=2000)
+  args = parser.parse_args()
+
+  # 첫 호출에서 루프 스레드를 띄우는 비용은 제외
+  run_async(noop())
+
+  measure("asyncio.run", lambda: asyncio.run(noop()), args.calls)
+  measure("run_async", lambda: run_async(noop()), args.calls)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,59 @@
+"""
+조문 인용/닫히지 않은 괄호/긴 줄이 섞인 합성 계약서로 re.findall 과 SectionScanner 시간 비교.
+
+  python -m benchmarks.clause_scanning --pages 150
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from app.common.constants import ARTICLE_CHUNK_PATTERN, NUMBER_HEADER_PATTERN
+from app.services.common.clause_parser import ARTICLE_SCANNER, NUMBER_SCANNER
+
+
+def generate_contract(page_count: int, seed: int = 0) -> List[str]:
+  """본문 속 조문 인용, 닫히지 않은 괄호, 긴 줄이 섞인 병적인 계약서 페이지를 만든다."""
+  rng = random.Random(seed)
+  pages = []
+  article = 1
+  for _ in range(page_count):
+    lines = []
+    for _ in range(rng.randint(8, 14)):
+      title = rng.choice(["【목적】", "(정의)", "[계약기간]", "(손해배상", "】해지"])
+      clauses = " ".join(
+          f"{marker} 을은 제{rng.randint(1, 99)}조 및 {rng.randint(1, 30)}. 항에 따라 "
+          + "갑의 서면 동의 없이 권리를 양도할 수 없다. " * rng.randint(1, 40)
+          for marker in "①②③"[:rng.randint(1, 3)])
+      lines.append(f"제{article}조{title}\n{clauses}")
+      article += 1
+    pages.append("\n".join(lines))
+  return pages
+
+
+def benchmark(page_count: int) -> None:
+  pages = generate_contract(page_count)
+  total_chars = sum(len(page) for page in pages)
+
+  for name, pattern, scanner in [
+    ("조문", ARTICLE_CHUNK_PATTERN, ARTICLE_SCANNER),
+    ("번호", NUMBER_HEADER_PATTERN, NUMBER_SCANNER)]:
+    started = time.perf_counter()
+    legacy = [re.findall(pattern, page, flags=re.DOTALL) for page in pages]
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = [scanner.findall(page) for page in pages]
+    scanned_time = time.perf_counter() - started
+
+    assert legacy == scanned
+    print(f"[{name}] {page_count}쪽 {total_chars}자 | re.findall "
+          f"{legacy_time:.3f}s | 스캐너 {scanned_time:.3f}s "
+          f"(x{legacy_time / scanned_time:.1f})")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="조문 머리 스캐너 벤치마크")
+  parser.add_argument("--pages", type=int, default=150)
+  benchmark(parser.parse_args().pages)
@@ -0,0 +1,81 @@
+"""
+이미지 크기 구간별로 기존/새 OCR 전처리의 평균 시간과 업로드 크기 비교.
+
+  python -m benchmarks.image_preprocessing page1.jpg page2.png --repeat 3
+"""
+import argparse
+import os
+import time
+from collections import defaultdict
+from typing import List
+
+import cv2
+import numpy as np
+
+from app.services.agreement.image_preprocessor import preprocess_image
+
+
+def legacy_preprocess_image(image_data: bytes) -> bytes:
+  """비교용 기존 전처리: 컬러 디코딩 -> 같은 크기로 리사이즈 -> 그레이스케일 -> 이진화 -> JPEG"""
+  image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+  height, width = image.shape[:2]
+  resized_image = cv2.resize(image, (width, height),
+                             interpolation=cv2.INTER_LINEAR)
+  gray = cv2.cvtColor(resized_image, cv2.COLOR_BGR2GRAY)
+  _, binarized_img = cv2.threshold(gray, 0, 255,
+                                   cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+  return cv2.imencode(".jpg", binarized_img)[1].tobytes()
+
+
+def size_class(image_data: bytes) -> str:
+  image = cv2.imdecode(np.frombuffer(image_data, np.uint8),
+                       cv2.IMREAD_REDUCED_GRAYSCALE_8)
+  megapixels = image.shape[0] * image.shape[1] * 64 / 1_000_000
+  if megapixels < 2:
+    return "<2MP"
+  if megapixels < 8:
+    return "2-8MP"
+  return ">=8MP"
+
+
+def benchmark(image_paths: List[str], repeat: int) -> None:
+  stats = defaultdict(lambda: defaultdict(float))
+
+  for image_path in image_paths:
+    with open(image_path, "rb") as f:
+      image_data = f.read()
+    stat = stats[size_class(image_data)]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+      legacy = legacy_preprocess_image(image_data)
+    stat["legacy_time"] += (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+      processed = preprocess_image(image_data)
+    stat["time"] += (time.perf_counter() - started) / repeat
+
+    stat["count"] += 1
+    stat["source_bytes"] += len(image_data)
+    stat["legacy_bytes"] += len(legacy)
+    stat["bytes"] += len(processed.data)
+    print(f"{os.path.basename(image_path)}: {len(legacy) / 1024:.0f}KB -> "
+          f"{len(processed.data) / 1024:.0f}KB ({processed.format}, "
+          f"{processed.width}x{processed.height})")
+
+  for name, stat in sorted(stats.items()):
+    count = stat["count"]
+    print(f"[{name}] {int(count)}장 | 원본 {stat['source_bytes'] / count / 1024:.0f}KB | "
+          f"기존 {stat['legacy_time'] / count * 1000:.1f}ms "
+          f"{stat['legacy_bytes'] / count / 1024:.0f}KB | "
+          f"개선 {stat['time'] / count * 1000:.1f}ms "
+          f"{stat['bytes'] / count / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="OCR 이미지 전처리 벤치마크")
+  parser.add_argument("image_paths", nargs="+")
+  parser.add_argument("--repeat", type=int, default=3)
+  args = parser.parse_args()
+  benchmark(args.image_paths, args.repeat)
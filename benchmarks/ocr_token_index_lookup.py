@@ -0,0 +1,50 @@
+"""
+휴대폰 사진 수준의 토큰 수로 OcrTokenIndex 색인 생성/조회 시간 측정.
+
+  python -m benchmarks.ocr_token_index_lookup --tokens 5000 --lookups 200
+"""
+import argparse
+import random
+import time
+
+from app.services.agreement.ocr_token_index import OcrTokenIndex
+
+
+def benchmark(token_count: int, lookup_count: int) -> None:
+  tokens = []
+  tokens_per_line = 12
+  for i in range(token_count):
+    line, column = divmod(i, tokens_per_line)
+    x = column / tokens_per_line
+    y = (line % 200) / 200
+    vertices = [{'x': x, 'y': y}, {'x': x + 0.05, 'y': y},
+                {'x': x + 0.05, 'y': y + 0.004}, {'x': x, 'y': y + 0.004}]
+    tokens.append((f"토큰{i}", line // 200 + 1, vertices))
+
+  started = time.perf_counter()
+  index = OcrTokenIndex.from_tokens(tokens)
+  build_time = time.perf_counter() - started
+
+  samples = []
+  for _ in range(lookup_count):
+    first = random.randrange(token_count - 60)
+    samples.append(" ".join(text for text, _, _ in
+                            tokens[first:first + random.randint(5, 60)]))
+
+  started = time.perf_counter()
+  box_count = 0
+  for text in samples:
+    box_count += len(index.line_boxes(*index.locate(text)))
+  lookup_time = time.perf_counter() - started
+
+  print(f"토큰 {token_count}개 | 색인 생성 {build_time * 1000:.1f}ms | "
+        f"조회 {lookup_count}건 {lookup_time * 1000:.1f}ms "
+        f"(건당 {lookup_time / lookup_count * 1000:.3f}ms, 박스 {box_count}개)")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="OCR 토큰 색인 벤치마크")
+  parser.add_argument("--tokens", type=int, default=5000)
+  parser.add_argument("--lookups", type=int, default=200)
+  args = parser.parse_args()
+  benchmark(args.tokens, args.lookups)
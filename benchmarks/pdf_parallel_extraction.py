@@ -0,0 +1,42 @@
+"""
+PDF 페이지 텍스트 순차 추출과 프로세스 풀 병렬 추출 시간 비교 (풀 기동 시간은 제외).
+
+  python -m benchmarks.pdf_parallel_extraction standard.pdf [...]
+"""
+import argparse
+import os
+import time
+from typing import List
+
+from app.services.common.pdf_service import extract_page_texts_parallel, \
+  get_pdf_pool, open_pdf_document
+from config.app_config import AppConfig
+from workers.pdf_text_extractor import extract_page_texts
+
+
+def benchmark(pdf_paths: List[str]) -> None:
+  get_pdf_pool().submit(time.sleep, 0).result()
+
+  for pdf_path in pdf_paths:
+    with open_pdf_document(pdf_path) as doc:
+      page_count = doc.page_count
+
+    started = time.perf_counter()
+    sequential = extract_page_texts(pdf_path, 0, page_count)
+    sequential_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parallel = extract_page_texts_parallel(pdf_path, page_count)
+    parallel_time = time.perf_counter() - started
+
+    assert sequential == parallel
+    print(f"{os.path.basename(pdf_path)}: {page_count}쪽 "
+          f"순차 {sequential_time:.3f}s / 병렬 {parallel_time:.3f}s "
+          f"(x{sequential_time / parallel_time:.2f}, "
+          f"워커 {AppConfig.PDF_PARSE_WORKERS})")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="PDF 페이지 텍스트 병렬 추출 벤치마크")
+  parser.add_argument("pdf_paths", nargs="+")
+  benchmark(parser.parse_args().pdf_paths)
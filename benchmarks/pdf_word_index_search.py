@@ -0,0 +1,50 @@
+"""
+page.search_for 반복 호출과 PdfWordIndex 검색 시간 비교.
+
+  python -m benchmarks.pdf_word_index_search contract.pdf --samples-per-page 5
+"""
+import argparse
+import random
+import time
+
+import fitz
+
+from app.services.agreement.pdf_word_index import PdfWordIndex
+
+
+def benchmark(pdf_path: str, sample_count: int) -> None:
+  with fitz.open(pdf_path, filetype="pdf") as doc:
+    started = time.perf_counter()
+    index = PdfWordIndex.from_document(doc)
+    build_time = time.perf_counter() - started
+
+    samples = []
+    for page in doc:
+      words = [word[4] for word in page.get_text("words")]
+      for _ in range(sample_count if len(words) > 8 else 0):
+        start = random.randrange(len(words) - 8)
+        samples.append((page.number + 1,
+                        " ".join(words[start:start + random.randint(2, 8)])))
+
+    started = time.perf_counter()
+    search_for_hits = sum(
+        len(doc.load_page(page_num - 1).search_for(text)) for page_num, text in
+        samples)
+    search_for_time = time.perf_counter() - started
+
+  started = time.perf_counter()
+  index_hits = sum(len(index.search(page_num, text)) for page_num, text in
+                   samples)
+  index_time = time.perf_counter() - started
+
+  print(f"{len(samples)}건 검색 | search_for {search_for_time:.3f}s "
+        f"({search_for_hits}건) | 색인 생성 {build_time:.3f}s + 검색 {index_time:.3f}s "
+        f"({index_hits}건)")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="PDF 단어 색인 검색 벤치마크")
+  parser.add_argument("pdf_path")
+  parser.add_argument("--samples-per-page", type=int, default=5)
+  args = parser.parse_args()
+  benchmark(args.pdf_path, args.samples_per_page)
@@ -0,0 +1,65 @@
+"""
+긴 법령 텍스트로 시맨틱 청킹 경계 계산 시간 비교 (임베딩은 호출하지 않고 무작위 벡터를 쓴다).
+기존 방식은 문장 쌍마다 코사인을 따로 구하고, 지금까지의 청크 전체를 다시 이어 붙여 토큰을 센다.
+
+  python -m benchmarks.semantic_chunking law.txt --max-tokens 250
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.common.chunking_service import BoundaryMode, \
+  MIN_CLAUSE_BODY_LENGTH, adjacent_similarities, count_tokens, \
+  detect_boundaries, group_sentences
+from app.services.common.sentence_splitter import split_into_sentences
+
+
+def benchmark(text_path: str, max_tokens: int, dimensions: int) -> None:
+  with open(text_path, encoding="utf-8") as f:
+    sentences = [sentence for sentence in split_into_sentences(f.read())
+                 if len(sentence.strip()) > MIN_CLAUSE_BODY_LENGTH]
+  embeddings = np.random.default_rng(0).standard_normal(
+      (len(sentences), dimensions)).tolist()
+
+  started = time.perf_counter()
+  for prev_embedding, embedding in zip(embeddings, embeddings[1:]):
+    a, b = np.array(prev_embedding), np.array(embedding)
+    np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+  pairwise_time = time.perf_counter() - started
+
+  started = time.perf_counter()
+  boundaries = detect_boundaries(adjacent_similarities(embeddings), 0.0,
+                                 BoundaryMode.PERCENTILE)
+  vectorized_time = time.perf_counter() - started
+
+  started = time.perf_counter()
+  legacy_chunk_count = 0
+  current_chunk = [sentences[0]]
+  for sentence in sentences[1:]:
+    tentative_chunk = current_chunk + [sentence]
+    if count_tokens(" ".join(tentative_chunk)) > max_tokens:
+      legacy_chunk_count += 1
+      current_chunk = current_chunk[-1:] + [sentence]
+    else:
+      current_chunk.append(sentence)
+  legacy_time = time.perf_counter() - started
+
+  started = time.perf_counter()
+  chunks = group_sentences(sentences, np.zeros_like(boundaries), max_tokens,
+                           1)
+  grouped_time = time.perf_counter() - started
+
+  print(f"문장 {len(sentences)}개 | 유사도: 쌍별 {pairwise_time:.3f}s / "
+        f"행렬 {vectorized_time:.3f}s | 토큰: 기존 {legacy_time:.3f}s "
+        f"(청크 {legacy_chunk_count + 1}개) / 누적합 {grouped_time:.3f}s "
+        f"(청크 {len(chunks)}개)")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="시맨틱 청킹 경계 계산 벤치마크")
+  parser.add_argument("text_path")
+  parser.add_argument("--max-tokens", type=int, default=250)
+  parser.add_argument("--dimensions", type=int, default=1536)
+  args = parser.parse_args()
+  benchmark(args.text_path, args.max_tokens, args.dimensions)
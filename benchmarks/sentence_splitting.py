@@ -0,0 +1,48 @@
+"""
+표준 문서 텍스트로 nltk punkt 와 규칙 기반 문장 분리의 문장 수/임베딩 입력 수/시간 비교.
+nltk 는 benchmarks/requirements.txt 로 따로 설치한다.
+
+  python -m benchmarks.sentence_splitting standard.txt --min-length 10
+"""
+import argparse
+import time
+from typing import List
+
+import nltk
+
+from app.services.common.sentence_splitter import split_into_sentences
+
+
+def benchmark(text_paths: List[str], min_length: int) -> None:
+  try:
+    nltk.data.find("tokenizers/punkt")
+  except LookupError:
+    nltk.download("punkt")
+    nltk.download("punkt_tab")
+
+  for text_path in text_paths:
+    with open(text_path, encoding="utf-8") as f:
+      text = f.read()
+
+    started = time.perf_counter()
+    punkt_sentences = nltk.sent_tokenize(text)
+    punkt_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sentences = split_into_sentences(text)
+    splitter_time = time.perf_counter() - started
+
+    # semantic_chunk_with_overlap 와 같은 기준으로 임베딩 입력 수를 센다
+    punkt_inputs = sum(len(s.strip()) > min_length for s in punkt_sentences)
+    inputs = sum(len(s.strip()) > min_length for s in sentences)
+    print(f"{text_path}: punkt {len(punkt_sentences)}문장/임베딩 {punkt_inputs}건 "
+          f"{punkt_time * 1000:.1f}ms | 규칙 {len(sentences)}문장/임베딩 {inputs}건 "
+          f"{splitter_time * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="한국어 문장 분리 벤치마크 (punkt 비교)")
+  parser.add_argument("text_paths", nargs="+")
+  parser.add_argument("--min-length", type=int, default=10)
+  args = parser.parse_args()
+  benchmark(args.text_paths, args.min_length)
@@ -9,3 +9,104 @@ class AppConfig:
   APP_ENV = os.getenv("APP_ENV", "dev")
   QDRANT_HOST = "qdrant" if APP_ENV == "prod" else "localhost"
   QDRANT_PORT = 6333
+
+  # 워커 간 공유 임베딩 캐시 (빈 값이면 비활성화)
+  EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH",
+                                   "/tmp/contract-ai/embedding_cache.db")
+  EMBEDDING_CACHE_MAX_ENTRIES = int(
+      os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+  # float16 으로 저장하면 캐시 적중 시 벡터가 반올림되어 미적중 때와 달라지므로 명시적으로 켤 때만 쓴다
+  EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+
+  # 임베딩 요청 1회당 최대 토큰 수 / 동시 요청 수
+  EMBEDDING_MAX_BATCH_TOKENS = int(
+      os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "16000"))
+  EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+
+  # 표준 문서 적재 파이프라인: 임베딩 요청 1회에 모으는 조항 수 / Qdrant upsert 1회 포인트 수 / 단계 사이 대기열 크기(배치 단위)
+  INGEST_EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+  INGEST_UPSERT_BATCH_SIZE = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "256"))
+  INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+
+  # S3 문서 다운로드: 커넥션 풀 크기 / 타임아웃(초) / 최대 크기 / 임시 파일 위치
+  DOWNLOAD_POOL_SIZE = int(os.getenv("DOWNLOAD_POOL_SIZE", "10"))
+  DOWNLOAD_CONNECT_TIMEOUT = float(os.getenv("DOWNLOAD_CONNECT_TIMEOUT", "10"))
+  DOWNLOAD_READ_TIMEOUT = float(os.getenv("DOWNLOAD_READ_TIMEOUT", "60"))
+  DOWNLOAD_MAX_BYTES = int(
+      os.getenv("DOWNLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+  IMAGE_DOWNLOAD_MAX_BYTES = int(
+      os.getenv("IMAGE_DOWNLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+  DOWNLOAD_TEMP_DIR = os.getenv("DOWNLOAD_TEMP_DIR",
+                                "/tmp/contract-ai/downloads")
+
+  # PDF 페이지 텍스트 병렬 추출: 프로세스 수 / 병렬로 돌리는 최소 페이지 수
+  PDF_PARSE_WORKERS = int(
+      os.getenv("PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+  PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "64"))
+
+  # 표준 문서 시맨틱 청킹 경계: fixed(고정 임계값) / window(이동 평균 후 임계값) / percentile(문서 내 하위 백분위)
+  CHUNK_BOUNDARY_MODE = os.getenv("CHUNK_BOUNDARY_MODE", "fixed")
+  CHUNK_BOUNDARY_WINDOW = int(os.getenv("CHUNK_BOUNDARY_WINDOW", "3"))
+  CHUNK_BOUNDARY_PERCENTILE = float(
+      os.getenv("CHUNK_BOUNDARY_PERCENTILE", "10"))
+
+  # 네이버 CLOVA OCR: 동시 요청 수(이미지 단위) / 요청 타임아웃(초)
+  OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "4"))
+  OCR_TIMEOUT = float(os.getenv("OCR_TIMEOUT", "60"))
+
+  QDRANT_MAX_CONNECTIONS = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))
+
+  # 워커 하나에서 동시에 진행되는 LLM 호출 수 / Azure OpenAI 커넥션 풀 크기
+  LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+  OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "16"))
+
+  # Azure OpenAI 배포별 쿼터, 워커 간 공유 버킷 파일 위치
+  # 배포마다 실제 쿼터가 다르므로 기본값은 0(제한 없음)이며, 값을 지정한 경우에만 제한한다
+  RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", "/tmp/contract-ai/rate_limits")
+  AZURE_PROMPT_RPM = int(os.getenv("AZURE_PROMPT_RPM", "0"))
+  AZURE_PROMPT_TPM = int(os.getenv("AZURE_PROMPT_TPM", "0"))
+  AZURE_EMBEDDING_RPM = int(os.getenv("AZURE_EMBEDDING_RPM", "0"))
+  AZURE_EMBEDDING_TPM = int(os.getenv("AZURE_EMBEDDING_TPM", "0"))
+
+  # correct_contract 판정 캐시 (빈 값이면 비활성화)
+  VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH",
+                                 "/tmp/contract-ai/verdict_cache.db")
+  VERDICT_CACHE_MAX_ENTRIES = int(
+      os.getenv("VERDICT_CACHE_MAX_ENTRIES", "100000"))
+  VERDICT_CACHE_TTL_SECONDS = int(
+      os.getenv("VERDICT_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+
+  # CLOVA OCR 응답 캐시 (빈 값이면 비활성화)
+  OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "/tmp/contract-ai/ocr_cache.db")
+  OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "10000"))
+  OCR_CACHE_TTL_SECONDS = int(
+      os.getenv("OCR_CACHE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+
+  # LLM 생략 게이트: 판정 이력/카테고리별 cutoff 저장 위치 (빈 값이면 비활성화)
+  SIMILARITY_GATE_PATH = os.getenv("SIMILARITY_GATE_PATH",
+                                   "/tmp/contract-ai/similarity_gate.db")
+  SIMILARITY_GATE_TARGET_RECALL = float(
+      os.getenv("SIMILARITY_GATE_TARGET_RECALL", "0.99"))
+  SIMILARITY_GATE_MIN_SAMPLES = int(
+      os.getenv("SIMILARITY_GATE_MIN_SAMPLES", "200"))
+  SIMILARITY_GATE_AUDIT_RATE = float(
+      os.getenv("SIMILARITY_GATE_AUDIT_RATE", "0.05"))
+
+  # correct_contract 배치 판정: 한 요청에 묶는 최대 조항 수(1이면 비활성화) / 입력 토큰 예산 / 모으는 시간(초)
+  CORRECT_CONTRACT_BATCH_SIZE = int(
+      os.getenv("CORRECT_CONTRACT_BATCH_SIZE", "1"))
+  CORRECT_CONTRACT_BATCH_TOKENS = int(
+      os.getenv("CORRECT_CONTRACT_BATCH_TOKENS", "8000"))
+  CORRECT_CONTRACT_BATCH_DELAY = float(
+      os.getenv("CORRECT_CONTRACT_BATCH_DELAY", "0.05"))
+
+  # 계약서 조항 검색 시 query_batch_points 한 번에 보내는 조항 수
+  QDRANT_SEARCH_BATCH_SIZE = int(os.getenv("QDRANT_SEARCH_BATCH_SIZE", "64"))
+
+  # 비동기 분석 작업 (JOB_STORE: file | memory)
+  JOB_STORE = os.getenv("JOB_STORE", "file")
+  JOB_STORE_DIR = os.getenv("JOB_STORE_DIR", "/tmp/contract-ai/jobs")
+  JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "2"))
+  JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "16"))
+  JOB_RESULT_TTL_SECONDS = int(
+      os.getenv("JOB_RESULT_TTL_SECONDS", str(24 * 60 * 60)))
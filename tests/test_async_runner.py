@@ -0,0 +1,40 @@
+import time
+
+from app.common.async_runner import iterate_async
+
+ITEM_COUNT = 40
+BUFFER_SIZE = 4
+
+
+def test_iterate_async_holds_producer_back_for_slow_consumer():
+  produced = []
+
+  async def numbers():
+    for i in range(ITEM_COUNT):
+      produced.append(i)
+      yield i
+
+  consumed = []
+  for item in iterate_async(numbers(), buffer_size=BUFFER_SIZE):
+    time.sleep(0.02)
+    consumed.append(item)
+    # 대기열에 buffer_size, 생산자가 넣으려고 기다리는 1개를 넘어 앞서가지 않는다
+    assert len(produced) - len(consumed) <= BUFFER_SIZE + 1
+
+  assert consumed == list(range(ITEM_COUNT))
+
+
+def test_iterate_async_raises_producer_error():
+  async def failing():
+    yield 1
+    raise ValueError("boom")
+
+  consumed = []
+  try:
+    for item in iterate_async(failing(), buffer_size=BUFFER_SIZE):
+      consumed.append(item)
+  except ValueError as e:
+    assert str(e) == "boom"
+  else:
+    raise AssertionError("ValueError 가 전달되지 않음")
+  assert consumed == [1]
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.blueprints.agreement.agreement_exception import AgreementException
+from app.clients.naver_clients import close_naver_ocr_http_client
+from app.common.constants import MAX_RETRIES
+from app.services.agreement import ocr_service
+from app.services.agreement.image_preprocessor import PreprocessedImage
+from config.app_config import AppConfig
+
+OCR_RESULT = {"images": [{"inferResult": "SUCCESS", "fields": []}]}
+IMAGE = PreprocessedImage(data=b"image", format="png", height=10, width=10)
+TIMEOUT = 0.5
+
+
+class OcrStubServer:
+  """
+  요청마다 responses 에서 (상태 코드, 지연 초) 를 하나씩 꺼내 응답하는 로컬 OCR 서버.
+  다 쓰면 마지막 응답을 반복한다.
+  """
+
+  def __init__(self, responses):
+    self.responses = list(responses)
+    self.requests = []
+    stub = self
+
+    class Handler(BaseHTTPRequestHandler):
+      def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        stub.requests.append((dict(self.headers), body))
+        index = min(len(stub.requests), len(stub.responses)) - 1
+        status, delay = stub.responses[index]
+        time.sleep(delay)
+
+        data = json.dumps(OCR_RESULT).encode()
+        try:
+          self.send_response(status)
+          self.send_header("Content-Type", "application/json")
+          self.send_header("Content-Length", str(len(data)))
+          self.end_headers()
+          self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+          # 클라이언트가 타임아웃으로 먼저 끊은 경우
+          pass
+
+      def log_message(self, *args):
+        pass
+
+    self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    self.server.daemon_threads = True
+    self.url = f"http://127.0.0.1:{self.server.server_address[1]}/ocr"
+
+  def __enter__(self):
+    threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    return self
+
+  def __exit__(self, *exc):
+    self.server.shutdown()
+    self.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def ocr_settings(monkeypatch):
+  monkeypatch.setenv("NAVER_CLOVA_API_KEY", "secret")
+  monkeypatch.setattr(AppConfig, "OCR_TIMEOUT", TIMEOUT)
+  monkeypatch.setattr(ocr_service, "OCR_RETRY_BACKOFF", 0.0)
+
+
+def request_ocr(server: OcrStubServer, monkeypatch) -> dict:
+  monkeypatch.setenv("NAVER_CLOVA_API_URL", server.url)
+
+  async def run():
+    try:
+      return await ocr_service.request_ocr(IMAGE)
+    finally:
+      await close_naver_ocr_http_client()
+
+  return asyncio.run(run())
+
+
+def test_request_ocr_returns_result(monkeypatch):
+  with OcrStubServer([(200, 0)]) as server:
+    assert request_ocr(server, monkeypatch) == OCR_RESULT
+
+  assert len(server.requests) == 1
+  headers, body = server.requests[0]
+  assert headers["X-OCR-SECRET"] == "secret"
+  assert b"photo1_binary_low.png" in body
+
+
+def test_request_ocr_retries_server_error(monkeypatch):
+  with OcrStubServer([(503, 0), (500, 0), (200, 0)]) as server:
+    assert request_ocr(server, monkeypatch) == OCR_RESULT
+  assert len(server.requests) == 3
+
+
+def test_request_ocr_retries_timeout(monkeypatch):
+  with OcrStubServer([(200, TIMEOUT * 3), (200, 0)]) as server:
+    assert request_ocr(server, monkeypatch) == OCR_RESULT
+  assert len(server.requests) == 2
+
+
+def test_request_ocr_gives_up_after_last_retry(monkeypatch):
+  with OcrStubServer([(502, 0)]) as server:
+    with pytest.raises(AgreementException):
+      request_ocr(server, monkeypatch)
+  assert len(server.requests) == MAX_RETRIES
+
+
+def test_request_ocr_does_not_retry_client_error(monkeypatch):
+  with OcrStubServer([(400, 0)]) as server:
+    with pytest.raises(AgreementException):
+      request_ocr(server, monkeypatch)
+  assert len(server.requests) == 1
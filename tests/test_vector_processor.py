@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.standard.vector_store import vector_processor
+
+CHUNK_COUNT = 30
+QUEUE_SIZE = 4
+
+
+def test_produce_payloads_bounds_running_tasks_to_queue_size(monkeypatch):
+  running = 0
+  max_running = 0
+
+  async def make_payload(prompt_client, point_id, content_hash, article,
+      pdf_request):
+    nonlocal running, max_running
+    running += 1
+    max_running = max(max_running, running)
+    await asyncio.sleep(0.001)
+    running -= 1
+    return point_id, article
+
+  monkeypatch.setattr(vector_processor, "make_payload", make_payload)
+  monkeypatch.setattr(vector_processor, "get_prompt_async_client",
+                      lambda: None)
+  chunks = [(f"id-{i}", f"hash-{i}", f"article-{i}") for i in
+            range(CHUNK_COUNT)]
+
+  async def run():
+    payload_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    producer = asyncio.create_task(vector_processor.produce_payloads(
+        chunks, None, payload_queue, 1, None))
+
+    received = []
+    while (item := await payload_queue.get()) is not vector_processor._DONE:
+      # 느린 임베딩 단계 흉내
+      await asyncio.sleep(0.005)
+      received.append(item)
+    await producer
+    return received
+
+  received = asyncio.run(run())
+
+  assert sorted(point_id for point_id, _ in received) == sorted(
+      point_id for point_id, _, _ in chunks)
+  assert 1 < max_running <= QUEUE_SIZE
@@ -0,0 +1,15 @@
+"""
+PDF 페이지 텍스트 추출 프로세스 풀에서 실행하는 함수.
+spawn 된 자식 프로세스는 이 모듈만 import 하므로 app 패키지(블루프린트, service_container,
+boto3 클라이언트, sqlite 캐시)를 불러오지 않도록 fitz 외 의존성을 두지 않는다.
+"""
+from typing import List, Tuple
+
+import fitz
+
+
+def extract_page_texts(pdf_path: str, start: int, end: int) -> List[
+  Tuple[int, str]]:
+  with fitz.open(pdf_path, filetype="pdf") as doc:
+    return [(number + 1, doc.load_page(number).get_text("text").strip())
+            for number in range(start, end)]